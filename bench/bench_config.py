@@ -0,0 +1,155 @@
+# bench/bench_config.py
+"""Бенчмарки ConfigManager и каталога твиков на синтетических cfg.
+
+    python bench/bench_config.py                   # все размеры, сравнить с bench/baselines.json
+    python bench/bench_config.py --quick           # до 10k строк
+    python bench/bench_config.py --save-baseline   # записать текущие числа как базовые
+    python bench/bench_config.py --only parse      # только замеры, в имени которых есть "parse"
+
+Время — лучшее из нескольких повторов, в микросекундах на одну операцию.
+Базовые числа привязаны к машине: сохраняйте их там же, где сравниваете."""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from bench import synth  # noqa: E402
+from core.config_manager import ConfigManager  # noqa: E402
+from core.tweaks import compile_tweaks, load_catalog  # noqa: E402
+
+BASELINE_PATH = os.path.join(ROOT, "bench", "baselines.json")
+SIZES = (326, 1_000, 10_000, 100_000)
+QUICK_SIZES = (326, 1_000, 10_000)
+BULK_KEYS = 300
+
+
+def measure(fn, repeat: int = 5, min_time: float = 0.02) -> float:
+    """Лучшее время одного вызова fn() в микросекундах."""
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best * 1e6
+
+
+def bench_size(lines: int, workdir: str, results: dict):
+    folder = synth.write_folder(os.path.join(workdir, f"cfg_{lines}"), lines, binds=max(50, lines // 10))
+    keys = synth.client_keys(lines)
+    middle = keys[len(keys) // 2]
+    bulk = {k: "1" for k in keys[::max(1, len(keys) // BULK_KEYS)][:BULK_KEYS]}
+
+    results[f"parse_cold[{lines}]"] = measure(lambda: ConfigManager(folder, use_cache=False), repeat=3)
+    ConfigManager(folder)  # прогреть кэш разбора
+    results[f"parse_cached[{lines}]"] = measure(lambda: ConfigManager(folder), repeat=3)
+
+    manager = ConfigManager(folder, use_cache=False)
+    values = iter(("0", "1") * (1 << 22))
+    results[f"set_single[{lines}]"] = measure(lambda: manager.set_value(middle, next(values)))
+    results[f"set_bulk_{len(bulk)}[{lines}]"] = measure(lambda: manager.set_values(bulk))
+
+    def save_dirty():
+        manager.set_values({middle: next(values)})
+        manager.save()
+
+    results[f"save_dirty[{lines}]"] = measure(save_dirty, repeat=3)
+    manager.save()
+    results[f"save_clean[{lines}]"] = measure(manager.save)
+
+
+def bench_catalog(results: dict):
+    json_path = os.path.join(ROOT, "core", "tweaks.json")
+    with open(json_path, "rb") as f:
+        raw = f.read()
+    results["catalog_json_compile"] = measure(lambda: compile_tweaks(json.loads(raw.decode("utf-8"))))
+    results["catalog_load"] = measure(lambda: load_catalog(
+        json_path, os.path.join(ROOT, "core", "tweaks.catalog")))
+
+
+def run(sizes, only=None) -> dict:
+    results = {}
+    workdir = tempfile.mkdtemp(prefix="pyrust-bench-")
+    old_cache = os.environ.get("PYRUSTSETTINGS_CACHE_DIR")
+    os.environ["PYRUSTSETTINGS_CACHE_DIR"] = os.path.join(workdir, "cache")
+    try:
+        for lines in sizes:
+            bench_size(lines, workdir, results)
+        bench_catalog(results)
+    finally:
+        if old_cache is None:
+            os.environ.pop("PYRUSTSETTINGS_CACHE_DIR", None)
+        else:
+            os.environ["PYRUSTSETTINGS_CACHE_DIR"] = old_cache
+        shutil.rmtree(workdir, ignore_errors=True)
+    if only:
+        results = {k: v for k, v in results.items() if only in k}
+    return results
+
+
+def report(results: dict, baseline: dict, threshold: float) -> int:
+    regressions = 0
+    for name, value in results.items():
+        base = baseline.get(name)
+        line = f"{name:<28} {value:>14.1f} us"
+        if base:
+            ratio = value / base
+            line += f"   baseline {base:>12.1f} us  x{ratio:5.2f}"
+            if ratio > 1 + threshold:
+                line += "  REGRESSION"
+                regressions += 1
+        print(line)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="без файла на 100k строк")
+    parser.add_argument("--only", help="оставить замеры, в имени которых есть эта подстрока")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="допустимое замедление относительно базового (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run(QUICK_SIZES if args.quick else SIZES, args.only)
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+    regressions = report(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        merged = dict(baseline)
+        merged.update(results)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": {k: round(v, 2) for k, v in merged.items()},
+            }, f, indent=2)
+            f.write("\n")
+        print(f"Базовые значения записаны в {os.path.relpath(BASELINE_PATH, ROOT)}")
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+# bench/startup.py
+"""Замер холодного старта GUI: из исходников и (если есть) собранного PyInstaller exe.
+
+    python bench/startup.py --runs 5
+    python bench/startup.py --runs 5 --exe output/main/main.exe
+    python bench/startup.py --runs 5 --exe /путь/к/dist/main/main   # сборка под Linux
+
+wall_ms — от запуска процесса до выхода (включая интерпретатор/распаковку exe),
+startup_ms — от первой строки main.py до первого свободного цикла событий.
+Записанные замеры — bench/startup_results.txt."""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(cmd, runs):
+    wall, inner = [], []
+    for _ in range(runs):
+        fd, out_path = tempfile.mkstemp(suffix=".txt")
+        os.close(fd)
+        try:
+            t0 = time.perf_counter()
+            subprocess.run(cmd + [f"--measure-startup={out_path}"], cwd=ROOT, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            wall.append((time.perf_counter() - t0) * 1000)
+            with open(out_path, encoding="utf-8") as f:
+                inner.append(float(f.read().split()[1]))
+        finally:
+            os.remove(out_path)
+    return wall, inner
+
+
+def report(name, wall, inner):
+    print(f"{name:8} wall_ms median {statistics.median(wall):8.1f}  min {min(wall):8.1f}   "
+          f"startup_ms median {statistics.median(inner):8.1f}  min {min(inner):8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--exe", default=os.path.join("output", "main", "main.exe"),
+                        help="собранный PyInstaller exe (пропускается, если его нет)")
+    args = parser.parse_args()
+
+    report("source", *measure([sys.executable, os.path.join(ROOT, "main.py")], args.runs))
+
+    exe = os.path.join(ROOT, args.exe)
+    # output/main/main.exe — сборка под Windows; под Linux можно передать свою (--exe .../main)
+    if os.path.isfile(exe) and os.access(exe, os.X_OK) and (sys.platform == "win32" or not exe.endswith(".exe")):
+        report("frozen", *measure([exe], args.runs))
+    else:
+        print(f"frozen   пропущено: {args.exe} не запускается на этой платформе")
+
+
+if __name__ == "__main__":
+    main()
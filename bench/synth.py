@@ -0,0 +1,72 @@
+# bench/synth.py
+"""Синтетические cfg для бенчмарков: client.cfg, растянутый из demo/client.cfg
+до нужного числа строк, и keys.cfg с множеством биндов на несколько команд."""
+import os
+import random
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEMO_CLIENT = os.path.join(ROOT, "demo", "client.cfg")
+
+_KEYS = ["mouse0", "mouse1", "mouse2", "mouse3", "mouse4", "space", "leftshift", "leftcontrol",
+         "tab", "escape", "return", "backspace", "f1", "f2", "f3", "f4", "f5", "f6", "f7", "f8",
+         "keypad0", "keypad1", "keypad2", "keypad3", "keypad4", "keypad5", "uparrow", "downarrow"]
+_KEYS += [chr(c) for c in range(ord("a"), ord("z") + 1)] + [str(d) for d in range(10)]
+_COMMANDS = ["+attack", "+attack2", "+forward", "+backward", "+left", "+right", "+jump", "+duck",
+             "+sprint", "+use", "+reload", "+map", "+focusmap", "+voice", "+compass", "+ping",
+             "inventory.toggle", "chat.open", "consoletoggle", "lighttoggle", "swaptoslot 1",
+             "swaptoslot 2", "craft.add 1545779598 1", "kill", "graphics.fov 90", "echo hi"]
+
+
+def demo_client_lines() -> List[str]:
+    with open(DEMO_CLIENT, "r", encoding="utf-8") as f:
+        return f.readlines()
+
+
+def client_cfg(lines: int) -> str:
+    """client.cfg на lines строк: исходные 326 строк demo, дальше — копии
+    с суффиксом у имени convar (audio.game -> audio.game_2), чтобы ключи не повторялись."""
+    demo = demo_client_lines()
+    out = []
+    copy = 0
+    while len(out) < lines:
+        for line in demo:
+            if len(out) >= lines:
+                break
+            if copy:
+                key, _, rest = line.partition(" ")
+                line = f"{key}_{copy} {rest}"
+            out.append(line)
+        copy += 1
+    return "".join(out)
+
+
+def client_keys(lines: int) -> List[str]:
+    # ключи, которые точно есть в client_cfg(lines), равномерно по файлу
+    demo = [line.split(" ", 1)[0] for line in demo_client_lines()]
+    keys = []
+    for i in range(lines):
+        copy, pos = divmod(i, len(demo))
+        keys.append(demo[pos] if not copy else f"{demo[pos]}_{copy}")
+    return keys
+
+
+def keys_cfg(binds: int, commands_per_bind: int = 3, seed: int = 1) -> str:
+    """keys.cfg: binds строк вида bind key "cmd1; cmd2; ..." с комментариями через одну."""
+    rnd = random.Random(seed)
+    out = []
+    for i in range(binds):
+        key = _KEYS[i % len(_KEYS)] if i < len(_KEYS) else f"{_KEYS[i % len(_KEYS)]}_{i}"
+        cmds = "; ".join(rnd.sample(_COMMANDS, commands_per_bind))
+        comment = f" // bind {i}" if i % 2 else ""
+        out.append(f'bind {key} "{cmds}"{comment}\n')
+    return "".join(out)
+
+
+def write_folder(folder: str, client_lines: int, binds: int) -> str:
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, "client.cfg"), "w", encoding="utf-8", newline="\n") as f:
+        f.write(client_cfg(client_lines))
+    with open(os.path.join(folder, "keys.cfg"), "w", encoding="utf-8", newline="\n") as f:
+        f.write(keys_cfg(binds))
+    return folder
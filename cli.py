@@ -0,0 +1,274 @@
+# cli.py
+"""PyRustSettings без GUI: применить твики/пресеты сразу ко многим папкам cfg.
+
+    python cli.py list-tweaks
+    python cli.py apply D:/Rust D:/Rust2/cfg --all-best --dry-run
+    python cli.py apply folders/* --tweak "Мгновенный крафт" --preset core/graphics.txt --json
+    python cli.py list-backups D:/Rust
+    python cli.py restore D:/Rust 18c2f1a3b --file client.cfg
+    python cli.py clean-backups
+
+Папка — либо папка Rust (в ней ищется cfg), либо сама папка cfg.
+Перед записью apply сохраняет снимок файлов (core/backups.py), если не указан --no-backup.
+Qt здесь не импортируется."""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from core.backups import BackupError, BackupStore
+from core.config_diff import ADDED, preset_diff
+from core.config_manager import ConfigManager
+from core.diagnostics import setup_logging
+from core.presets import Preset, load_preset, stack_presets
+from core.tweaks import CATALOG_PATH, JSON_PATH, CatalogError, TweakCatalog, load_catalog
+from core.utils import resource_path
+from core.values import ValueTypes
+
+# (file_type, ключ, значение)
+Change = Tuple[str, str, str]
+
+
+def resolve_cfg_folder(folder: str) -> str:
+    cfg = os.path.join(folder, "cfg")
+    return cfg if os.path.isdir(cfg) else folder
+
+
+def cli_catalog() -> TweakCatalog:
+    # load_catalog() без tweaks.json молча отдаёт пустой каталог — для GUI это
+    # допустимо, а пакетный прогон по многим папкам должен остановиться
+    json_path = resource_path(JSON_PATH)
+    if not os.path.isfile(json_path):
+        raise CatalogError(f"{json_path}: файл каталога не найден")
+    return load_catalog(json_path, resource_path(CATALOG_PATH))
+
+
+def collect_changes(args) -> List[Change]:
+    catalog = cli_catalog()
+    changes: Dict[Tuple[str, str], str] = {}
+
+    by_name_or_key = {}
+    for tweak in catalog:
+        by_name_or_key[tweak.name] = tweak
+        by_name_or_key.setdefault(tweak.key, tweak)
+
+    if args.all_best:
+        for tweak in catalog.of_type("bool"):
+            changes[(tweak.file, tweak.key)] = tweak.enable_value
+    for name in args.tweak:
+        tweak = by_name_or_key.get(name)
+        if tweak is None:
+            raise SystemExit(f"Неизвестный твик: {name} (см. python cli.py list-tweaks)")
+        changes[(tweak.file, tweak.key)] = tweak.enable_value
+    for name in args.disable:
+        tweak = by_name_or_key.get(name)
+        if tweak is None:
+            raise SystemExit(f"Неизвестный твик: {name} (см. python cli.py list-tweaks)")
+        changes[(tweak.file, tweak.key)] = tweak.disable_value
+    # пресеты применяются после твиков и перекрывают их; более поздний --preset — сильнее
+    if args.preset:
+        try:
+            presets = [load_preset(path) for path in args.preset]
+        except OSError as e:
+            raise SystemExit(f"Пресет не прочитан: {e}")
+        changes.update(stack_presets(presets).values)
+
+    return [(ftype, key, value) for (ftype, key), value in changes.items()]
+
+
+def apply_to_folder(folder: str, changes: List[Change], dry_run: bool, backup: bool = True) -> dict:
+    """Выполняется в отдельном процессе: одна папка — одна запись итогов."""
+    cfg_folder = resolve_cfg_folder(folder)
+    result = {"folder": folder, "cfg_folder": cfg_folder, "status": "ok", "changes": [], "saved": False}
+    if not os.path.isfile(os.path.join(cfg_folder, "client.cfg")) and \
+            not os.path.isfile(os.path.join(cfg_folder, "keys.cfg")):
+        result["status"] = "error"
+        result["error"] = "нет client.cfg/keys.cfg"
+        return result
+
+    try:
+        manager = ConfigManager(cfg_folder, value_types=ValueTypes.from_catalog(cli_catalog()),
+                                backups=BackupStore() if backup and not dry_run else None)
+        # пробный прогон и настоящий показывают одно и то же — разницу по ключам
+        entries = preset_diff(manager, Preset("cli", {(ftype, key): value for ftype, key, value in changes}))
+        with manager.transaction() as tx:
+            for entry in entries:
+                tx.set(entry.key, entry.new, entry.file_type)
+        diff = [{"file": e.file_type, "key": e.key, "old": e.old, "new": e.new,
+                 "action": "append" if e.change == ADDED else "update"} for e in entries]
+        result["changes"] = diff
+
+        if diff and not dry_run:
+            if not manager.save():
+                result["status"] = "error"
+                result["error"] = "не удалось записать файлы"
+            else:
+                result["saved"] = True
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+    return result
+
+
+def run_apply(args) -> int:
+    try:
+        changes = collect_changes(args)
+    except CatalogError as e:
+        print(f"Ошибка в каталоге твиков: {e}", file=sys.stderr)
+        return 1
+    if not changes:
+        print("Нечего применять: укажите --tweak, --disable, --all-best или --preset", file=sys.stderr)
+        return 2
+
+    folders = args.folders
+    jobs = max(1, min(args.jobs or os.cpu_count() or 1, len(folders)))
+    if jobs == 1:
+        results = [apply_to_folder(f, changes, args.dry_run, not args.no_backup) for f in folders]
+    else:
+        # пул процессов тянет multiprocessing — импортируем только когда он нужен
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(apply_to_folder, folders, [changes] * len(folders),
+                                    [args.dry_run] * len(folders), [not args.no_backup] * len(folders)))
+
+    summary = {
+        "dry_run": args.dry_run,
+        "folders": results,
+        "changed_folders": sum(1 for r in results if r["changes"]),
+        "changed_keys": sum(len(r["changes"]) for r in results),
+        "errors": sum(1 for r in results if r["status"] != "ok"),
+    }
+    if args.json:
+        json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print_report(summary)
+    return 1 if summary["errors"] else 0
+
+
+def print_report(summary: dict):
+    for r in summary["folders"]:
+        if r["status"] != "ok":
+            print(f"[ошибка] {r['folder']}: {r['error']}")
+            continue
+        mark = "без изменений" if not r["changes"] else ("записано" if r["saved"] else "пробный прогон")
+        print(f"{r['cfg_folder']}: {len(r['changes'])} изм., {mark}")
+        for c in r["changes"]:
+            old = "—" if c["old"] is None else c["old"]
+            sign = "+" if c["action"] == "append" else "~"
+            print(f"  {sign} {c['file']}.cfg  {c['key']}: {old} -> {c['new']}")
+    print(f"Итого: {summary['changed_keys']} изменений в {summary['changed_folders']} папках, "
+          f"ошибок: {summary['errors']}")
+
+
+def run_list_tweaks(args) -> int:
+    try:
+        catalog = cli_catalog()
+    except CatalogError as e:
+        print(f"Ошибка в каталоге твиков: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        json.dump([{"name": t.name, "file": t.file, "key": t.key, "type": t.type,
+                    "enable": t.enable_value, "disable": t.disable_value} for t in catalog],
+                  sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    for t in catalog:
+        print(f"{t.file}.cfg  {t.key:<55} {t.name}")
+    return 0
+
+
+def run_list_backups(args) -> int:
+    cfg_folder = resolve_cfg_folder(args.folder)
+    snapshots = BackupStore().snapshots(cfg_folder)
+    if args.json:
+        json.dump([{"id": s.id, "time": s.time, "label": s.label,
+                    "files": {name: f["size"] for name, f in s.files.items()}} for s in snapshots],
+                  sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    if not snapshots:
+        print(f"{cfg_folder}: снимков нет")
+        return 0
+    for s in snapshots:
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(s.time))
+        files = ", ".join(f"{name} ({f['size']} Б)" for name, f in sorted(s.files.items()))
+        print(f"{s.id}  {stamp}  {s.label:<22} {files}")
+    return 0
+
+
+def run_restore(args) -> int:
+    cfg_folder = resolve_cfg_folder(args.folder)
+    try:
+        restored = BackupStore().restore(cfg_folder, args.snapshot, args.file or None)
+    except (BackupError, OSError) as e:
+        print(f"Не удалось восстановить: {e}", file=sys.stderr)
+        return 1
+    for path in restored:
+        print(f"восстановлен {path}")
+    return 0
+
+
+def run_clean_backups(args) -> int:
+    store = BackupStore()
+    try:
+        removed = store.collect_garbage()
+    except OSError as e:
+        print(f"Не удалось почистить {store.root}: {e}", file=sys.stderr)
+        return 1
+    print(f"{store.root}: удалено неиспользуемых кусков: {removed}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python cli.py", description=__doc__.splitlines()[0])
+    parser.add_argument("--log-level", default=None, metavar="LEVEL",
+                        help="уровень логов: DEBUG, INFO, WARNING (по умолчанию), ERROR")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_apply = sub.add_parser("apply", help="применить твики и пресеты к папкам")
+    p_apply.add_argument("folders", nargs="+", help="папки Rust или cfg")
+    p_apply.add_argument("--tweak", action="append", default=[], metavar="NAME",
+                         help="включить твик (название или ключ cfg); можно несколько раз")
+    p_apply.add_argument("--disable", action="append", default=[], metavar="NAME",
+                         help="выключить твик; можно несколько раз")
+    p_apply.add_argument("--all-best", action="store_true", help="включить все твики")
+    p_apply.add_argument("--preset", action="append", default=[], metavar="FILE",
+                         help="файл пресета (\"convar значение\" и \"bind клавиша команда\")")
+    p_apply.add_argument("--dry-run", action="store_true", help="только показать изменения")
+    p_apply.add_argument("--jobs", type=int, default=0, help="число процессов (по умолчанию — по числу ядер)")
+    p_apply.add_argument("--json", action="store_true", help="итоги в JSON")
+    p_apply.add_argument("--no-backup", action="store_true", help="не сохранять снимок файлов перед записью")
+    p_apply.set_defaults(func=run_apply)
+
+    p_list = sub.add_parser("list-tweaks", help="показать каталог твиков")
+    p_list.add_argument("--json", action="store_true")
+    p_list.set_defaults(func=run_list_tweaks)
+
+    p_backups = sub.add_parser("list-backups", help="снимки cfg папки, новые — первыми")
+    p_backups.add_argument("folder", help="папка Rust или cfg")
+    p_backups.add_argument("--json", action="store_true")
+    p_backups.set_defaults(func=run_list_backups)
+
+    p_restore = sub.add_parser("restore", help="вернуть файлы cfg к снимку")
+    p_restore.add_argument("folder", help="папка Rust или cfg")
+    p_restore.add_argument("snapshot", help="id снимка (или его начало) из list-backups")
+    p_restore.add_argument("--file", action="append", default=[], metavar="NAME",
+                           help="только этот файл (client.cfg, keys.cfg); можно несколько раз")
+    p_restore.set_defaults(func=run_restore)
+
+    p_clean = sub.add_parser("clean-backups", help="удалить куски, на которые не ссылается ни один снимок")
+    p_clean.set_defaults(func=run_clean_backups)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    setup_logging(args.log_level)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+# core/asset_pack.py
+"""Пакет превью: все файлы assets/graphics в одном индексированном файле.
+
+Формат (little-endian):
+    заголовок  "PRSPACK1", u32 число записей, u32 размер индекса
+    индекс     на каждую запись: u16 длина имени, имя (utf-8), u64 смещение, u64 длина
+    данные     содержимое файлов подряд, смещения — от начала пакета
+
+Сборка:
+    python -m core.asset_pack build [--src assets/graphics] [--out assets/graphics.pack] [--lowres 480]
+    python -m core.asset_pack list [assets/graphics.pack]
+"""
+import argparse
+import mmap
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+MAGIC = b"PRSPACK1"
+_HEADER = struct.Struct("<8sII")
+_NAME_LEN = struct.Struct("<H")
+_SPAN = struct.Struct("<QQ")
+
+DEFAULT_SRC = os.path.join("assets", "graphics")
+DEFAULT_PACK = os.path.join("assets", "graphics.pack")
+MEDIA_EXTENSIONS = ('.gif', '.apng', '.mp4', '.webm', '.avi', '.mov')
+
+
+class AssetPackError(ValueError):
+    pass
+
+
+class AssetPack:
+    """Открытый через mmap пакет. get() отдаёт memoryview без копирования."""
+
+    def __init__(self, path: str):
+        self.path = path
+        # mmap держит свой дескриптор, сам файл можно сразу закрыть
+        with open(path, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                # пустой файл mmap не открывает
+                raise AssetPackError(f"{path}: {e}")
+        self._view = memoryview(self._mmap)
+        try:
+            self._index = self._read_index()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_index(self) -> Dict[str, Tuple[int, int]]:
+        if len(self._view) < _HEADER.size:
+            raise AssetPackError(f"{self.path}: файл слишком короткий")
+        magic, count, index_size = _HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC:
+            raise AssetPackError(f"{self.path}: не пакет превью")
+        index = {}
+        pos = _HEADER.size
+        end = pos + index_size
+        if end > len(self._view):
+            raise AssetPackError(f"{self.path}: индекс обрезан")
+        # каждое чтение проверяется по границе индекса: обрезанный или испорченный
+        # пакет даёт AssetPackError, а не struct.error
+        for n in range(count):
+            if pos + _NAME_LEN.size > end:
+                raise AssetPackError(f"{self.path}: индекс обрезан на записи {n}")
+            (name_len,) = _NAME_LEN.unpack_from(self._view, pos)
+            pos += _NAME_LEN.size
+            if pos + name_len + _SPAN.size > end:
+                raise AssetPackError(f"{self.path}: индекс обрезан на записи {n}")
+            try:
+                name = bytes(self._view[pos:pos + name_len]).decode("utf-8")
+            except UnicodeDecodeError:
+                raise AssetPackError(f"{self.path}: испорченное имя в записи {n}")
+            pos += name_len
+            offset, length = _SPAN.unpack_from(self._view, pos)
+            pos += _SPAN.size
+            if offset < end or offset + length > len(self._view):
+                raise AssetPackError(f"{self.path}: запись {name} выходит за пределы файла")
+            index[name] = (offset, length)
+        return index
+
+    def names(self) -> List[str]:
+        return list(self._index)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, name: str) -> Optional[memoryview]:
+        span = self._index.get(name)
+        if span is None:
+            return None
+        offset, length = span
+        return self._view[offset:offset + length]
+
+    def close(self):
+        try:
+            self._view.release()
+            self._mmap.close()
+        except BufferError:
+            # отданные наружу срезы ещё живы — mmap освободится вместе с ними
+            pass
+
+
+def write_pack(out_path: str, files: Dict[str, str]):
+    """files: имя в пакете -> путь к файлу на диске."""
+    names = sorted(files)
+    encoded = [name.encode("utf-8") for name in names]
+    index_size = sum(_NAME_LEN.size + len(n) + _SPAN.size for n in encoded)
+    offset = _HEADER.size + index_size
+    spans = []
+    for name in names:
+        length = os.path.getsize(files[name])
+        spans.append((offset, length))
+        offset += length
+
+    folder = os.path.dirname(os.path.abspath(out_path))
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(_HEADER.pack(MAGIC, len(names), index_size))
+            for name, (start, length) in zip(encoded, spans):
+                out.write(_NAME_LEN.pack(len(name)))
+                out.write(name)
+                out.write(_SPAN.pack(start, length))
+            for name in names:
+                with open(files[name], "rb") as src:
+                    shutil.copyfileobj(src, out)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def make_lowres(src: str, dst: str, width: int) -> bool:
+    """Уменьшенная копия превью через ffmpeg. False — ffmpeg нет или он не справился."""
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        return False
+    if src.lower().endswith(".gif"):
+        args = ["-vf", f"scale={width}:-1:flags=lanczos"]
+    else:
+        args = ["-vf", f"scale={width}:-2", "-an", "-c:v", "libx264", "-crf", "30", "-preset", "slow"]
+    result = subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-i", src, *args, dst],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        print(f"ffmpeg не смог уменьшить {src}: {result.stderr.decode(errors='ignore').strip()}")
+        return False
+    return True
+
+
+def build(src_dir: str = DEFAULT_SRC, out_path: str = DEFAULT_PACK, lowres_width: int = 0) -> int:
+    files = {}
+    for name in sorted(os.listdir(src_dir)):
+        path = os.path.join(src_dir, name)
+        if os.path.isfile(path) and os.path.splitext(name)[1].lower() in MEDIA_EXTENSIONS:
+            files[name] = path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if lowres_width:
+            if not shutil.which("ffmpeg"):
+                print("ffmpeg не найден — уменьшенные превью не созданы, берутся оригиналы")
+            else:
+                for name, path in list(files.items()):
+                    small = os.path.join(tmp, name)
+                    # оставляем уменьшенную версию, только если она действительно меньше
+                    if make_lowres(path, small, lowres_width) and \
+                            os.path.getsize(small) < os.path.getsize(path):
+                        files[name] = small
+        write_pack(out_path, files)
+
+    total = sum(os.path.getsize(p) for p in files.values())
+    print(f"{out_path}: {len(files)} файлов, {total / 1024 / 1024:.1f} МБ")
+    return len(files)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.asset_pack", description="Пакет превью")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="собрать пакет из папки с превью")
+    p_build.add_argument("--src", default=DEFAULT_SRC)
+    p_build.add_argument("--out", default=DEFAULT_PACK)
+    p_build.add_argument("--lowres", type=int, default=0, metavar="WIDTH",
+                         help="перекодировать превью в ширину WIDTH (нужен ffmpeg)")
+    p_list = sub.add_parser("list", help="показать содержимое пакета")
+    p_list.add_argument("pack", nargs="?", default=DEFAULT_PACK)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        build(args.src, args.out, args.lowres)
+        return 0
+    pack = AssetPack(args.pack)
+    try:
+        for name in pack.names():
+            print(f"{len(pack.get(name)):>10}  {name}")
+    finally:
+        pack.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+# core/backups.py
+"""Резервные копии cfg перед сохранением: хранилище с дедупликацией по содержимому.
+
+Файл режется на куски по границам строк: кусок заканчивается на строке, у которой
+crc32 попадает в маску (в среднем раз в 128 строк), поэтому правка одной строки
+меняет один кусок, а вставка не сдвигает остальные. Кусок хранится один раз
+(сжатый zlib) под своим sha256 — для всех папок и всех снимков сразу:
+
+    backups/chunks/ab/abcdef....z            — куски
+    backups/manifests/<папка>/<id>.json      — снимок: какие куски у каких файлов
+    backups/pruned                           — сколько снимков удалено с последней чистки
+
+Снимок, совпадающий с предыдущим, не записывается; неизменённый с прошлого
+снимка файл (те же mtime и размер) даже не перечитывается. Так снимок стоит
+примерно столько, сколько в файлах действительно поменялось."""
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from core.config_writer import write_atomic
+
+log = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+CFG_FILES = ("client.cfg", "keys.cfg")
+
+# граница куска — строка с crc32 & CHUNK_MASK == 0; кусок не больше MAX_CHUNK байт
+CHUNK_MASK = 0x7F
+MAX_CHUNK = 64 * 1024
+# сколько снимков хранить на папку
+DEFAULT_KEEP = 100
+# куски моложе этого не удаляются при чистке: их может дописывать параллельный снимок
+GC_GRACE_SECONDS = 3600
+# чистка кусков читает снимки всех папок и обходит все куски, поэтому запускается
+# не на каждом prune(), а раз в столько удалённых снимков (или явно: cli.py clean-backups)
+GC_EVERY = 50
+# файл, изменённый раньше чем столько наносекунд назад, можно не перечитывать при том же mtime/размере
+RACY_NS = 2_000_000_000
+
+
+def backup_dir() -> str:
+    """Папка резервных копий: локальная (не роуминговая) папка пользователя."""
+    override = os.environ.get("PYRUSTSETTINGS_BACKUP_DIR")
+    if override:
+        return override
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "PyRustSettings", "backups")
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "pyrustsettings", "backups")
+
+
+def split_chunks(raw: bytes) -> List[bytes]:
+    """Куски файла по границам строк; склеенные, дают исходные байты."""
+    chunks = []
+    start = pos = 0
+    crc32 = zlib.crc32
+    for line in raw.splitlines(keepends=True):
+        pos += len(line)
+        if crc32(line) & CHUNK_MASK == 0 or pos - start >= MAX_CHUNK:
+            chunks.append(raw[start:pos])
+            start = pos
+    if start < len(raw):
+        chunks.append(raw[start:])
+    return chunks
+
+
+class BackupError(Exception):
+    pass
+
+
+class Snapshot:
+    """Снимок папки cfg. files: имя файла -> {"size", "sha256", "chunks"}."""
+
+    __slots__ = ("id", "folder", "time", "label", "files")
+
+    def __init__(self, id: str, folder: str, time: float, label: str, files: Dict[str, dict]):
+        self.id = id
+        self.folder = folder
+        self.time = time
+        self.label = label
+        self.files = files
+
+    def same_content(self, other: "Snapshot") -> bool:
+        return {name: f["sha256"] for name, f in self.files.items()} == \
+            {name: f["sha256"] for name, f in other.files.items()}
+
+    def to_record(self) -> dict:
+        return {"version": FORMAT_VERSION, "id": self.id, "folder": self.folder,
+                "time": self.time, "label": self.label, "files": self.files}
+
+    @classmethod
+    def from_record(cls, record: dict) -> "Snapshot":
+        return cls(record["id"], record["folder"], record["time"], record.get("label", ""), record["files"])
+
+    def __repr__(self):
+        return f"Snapshot({self.id!r}, {self.label!r}, {sorted(self.files)})"
+
+
+class BackupStore:
+    def __init__(self, root: Optional[str] = None, keep: int = DEFAULT_KEEP):
+        self.root = root or backup_dir()
+        self.keep = keep
+        # уже записанные куски — чтобы не проверять диск повторно
+        self._chunks_seen = set()
+        # путь -> ((mtime_ns, size), запись файла в снимке) для неизменённых файлов
+        self._files_seen: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+
+    # ---------------- PATHS ----------------
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self.root, "chunks", digest[:2], digest + ".z")
+
+    def _manifest_dir(self, folder: str) -> str:
+        name = hashlib.sha1(os.path.normcase(os.path.abspath(folder)).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.root, "manifests", name)
+
+    # ---------------- SNAPSHOT ----------------
+    def _put_chunk(self, chunk: bytes) -> str:
+        digest = hashlib.sha256(chunk).hexdigest()
+        if digest in self._chunks_seen:
+            return digest
+        path = self._chunk_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_atomic(path, zlib.compress(chunk))
+        self._chunks_seen.add(digest)
+        return digest
+
+    def _file_entry(self, path: str) -> Optional[dict]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        fingerprint = (st.st_mtime_ns, st.st_size)
+        seen = self._files_seen.get(path)
+        # только что изменённому файлу по mtime не верим: на грубых ФС две записи
+        # подряд одинакового размера дают тот же отпечаток
+        if seen is not None and seen[0] == fingerprint and time.time_ns() - st.st_mtime_ns > RACY_NS:
+            return seen[1]
+        with open(path, "rb") as f:
+            raw = f.read()
+        entry = {"size": len(raw), "sha256": hashlib.sha256(raw).hexdigest(),
+                 "chunks": [self._put_chunk(chunk) for chunk in split_chunks(raw)]}
+        self._files_seen[path] = (fingerprint, entry)
+        return entry
+
+    def snapshot(self, folder: str, label: str = "", names=CFG_FILES) -> Optional[Snapshot]:
+        """Снимок файлов папки. None — файлов нет или всё как в последнем снимке."""
+        folder = os.path.abspath(folder)
+        files = {}
+        for name in names:
+            entry = self._file_entry(os.path.join(folder, name))
+            if entry is not None:
+                files[name] = entry
+        if not files:
+            return None
+        snapshot = Snapshot(f"{time.time_ns() // 1000:x}-{os.getpid()}", folder, time.time(), label, files)
+        previous = self.latest(folder)
+        if previous is not None and previous.same_content(snapshot):
+            return None
+
+        manifest_dir = self._manifest_dir(folder)
+        os.makedirs(manifest_dir, exist_ok=True)
+        write_atomic(os.path.join(manifest_dir, snapshot.id + ".json"),
+                     json.dumps(snapshot.to_record(), ensure_ascii=False).encode("utf-8"))
+        log.debug("Снимок %s (%s): %s", snapshot.id, label, folder)
+        self.prune(folder)
+        return snapshot
+
+    # ---------------- LIST/READ ----------------
+    def _manifest_names(self, folder: str) -> List[str]:
+        try:
+            names = [n for n in os.listdir(self._manifest_dir(folder)) if n.endswith(".json")]
+        except OSError:
+            return []
+        # id начинается с времени в hex одинаковой длины — сортировка по имени хронологическая
+        return sorted(names)
+
+    def _load_manifest(self, folder: str, name: str) -> Optional[Snapshot]:
+        try:
+            with open(os.path.join(self._manifest_dir(folder), name), "rb") as f:
+                return Snapshot.from_record(json.loads(f.read()))
+        except (OSError, ValueError, KeyError) as e:
+            log.warning("Повреждённый снимок %s: %s", name, e)
+            return None
+
+    def snapshots(self, folder: str) -> List[Snapshot]:
+        """Снимки папки, новые — первыми."""
+        folder = os.path.abspath(folder)
+        result = []
+        for name in reversed(self._manifest_names(folder)):
+            snapshot = self._load_manifest(folder, name)
+            if snapshot is not None:
+                result.append(snapshot)
+        return result
+
+    def latest(self, folder: str) -> Optional[Snapshot]:
+        for name in reversed(self._manifest_names(folder)):
+            snapshot = self._load_manifest(folder, name)
+            if snapshot is not None:
+                return snapshot
+        return None
+
+    def get(self, folder: str, snapshot_id: str) -> Snapshot:
+        # можно указать начало id, если оно однозначно
+        matches = [s for s in self.snapshots(folder) if s.id.startswith(snapshot_id)]
+        if len(matches) != 1:
+            raise BackupError(f"Снимок {snapshot_id!r} не найден" if not matches
+                              else f"Снимок {snapshot_id!r} неоднозначен")
+        return matches[0]
+
+    def read(self, snapshot: Snapshot, name: str) -> bytes:
+        entry = snapshot.files.get(name)
+        if entry is None:
+            raise BackupError(f"В снимке {snapshot.id} нет {name}")
+        parts = []
+        for digest in entry["chunks"]:
+            try:
+                with open(self._chunk_path(digest), "rb") as f:
+                    parts.append(zlib.decompress(f.read()))
+            except (OSError, zlib.error) as e:
+                raise BackupError(f"Кусок {digest[:12]} снимка {snapshot.id} повреждён: {e}")
+        raw = b"".join(parts)
+        if hashlib.sha256(raw).hexdigest() != entry["sha256"]:
+            raise BackupError(f"{name} в снимке {snapshot.id} не совпадает с контрольной суммой")
+        return raw
+
+    # ---------------- RESTORE ----------------
+    def restore(self, folder: str, snapshot_id: str, names=None) -> List[str]:
+        """Возвращает файлы папки к состоянию снимка. Текущее состояние сначала
+        сохраняется снимком — восстановление тоже можно откатить."""
+        snapshot = self.get(folder, snapshot_id)
+        names = list(names or snapshot.files)
+        # читаем и проверяем всё до того, как трогать файлы
+        contents = {name: self.read(snapshot, name) for name in names}
+        self.snapshot(folder, "перед восстановлением")
+        restored = []
+        for name, raw in contents.items():
+            path = os.path.join(os.path.abspath(folder), name)
+            write_atomic(path, raw)
+            restored.append(path)
+        return restored
+
+    # ---------------- CLEANUP ----------------
+    def prune(self, folder: str, keep: Optional[int] = None):
+        """Оставляет keep последних снимков папки; куски, на которые больше
+        никто не ссылается, удаляются."""
+        keep = self.keep if keep is None else keep
+        names = self._manifest_names(folder)
+        if len(names) <= keep:
+            return
+        removed = 0
+        for name in names[:len(names) - keep]:
+            try:
+                os.remove(os.path.join(self._manifest_dir(folder), name))
+                removed += 1
+            except OSError:
+                pass
+        if self._add_pruned(removed) >= GC_EVERY:
+            self.collect_garbage()
+
+    def _pruned_path(self) -> str:
+        return os.path.join(self.root, "pruned")
+
+    def _add_pruned(self, count: int) -> int:
+        # счётчик на диске — общий для всех процессов (GUI, запуски CLI);
+        # гонка между ними сдвигает чистку на несколько снимков, это не страшно
+        path = self._pruned_path()
+        try:
+            with open(path, "rb") as f:
+                total = int(f.read() or 0)
+        except (OSError, ValueError):
+            total = 0
+        total += count
+        if count:
+            try:
+                write_atomic(path, str(total).encode("ascii"))
+            except OSError as e:
+                log.warning("Счётчик удалённых снимков не записан: %s", e)
+        return total
+
+    def collect_garbage(self) -> int:
+        """Удаляет куски, на которые не ссылается ни один снимок. Возвращает их число."""
+        used = set()
+        manifests = os.path.join(self.root, "manifests")
+        for dirpath, _, filenames in os.walk(manifests):
+            for name in filenames:
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(dirpath, name), "rb") as f:
+                        record = json.loads(f.read())
+                except (OSError, ValueError):
+                    continue
+                for entry in record.get("files", {}).values():
+                    used.update(entry.get("chunks", ()))
+        removed = 0
+        now = time.time()
+        self._files_seen.clear()
+        for dirpath, _, filenames in os.walk(os.path.join(self.root, "chunks")):
+            for name in filenames:
+                digest = name[:-2]
+                path = os.path.join(dirpath, name)
+                if digest in used:
+                    continue
+                try:
+                    if now - os.path.getmtime(path) < GC_GRACE_SECONDS:
+                        continue
+                    os.remove(path)
+                except OSError:
+                    continue
+                self._chunks_seen.discard(digest)
+                removed += 1
+        try:
+            os.remove(self._pruned_path())
+        except OSError:
+            pass
+        return removed
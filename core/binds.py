@@ -0,0 +1,213 @@
+# core/binds.py
+"""Бинды keys.cfg как списки команд.
+
+    bind g "+map; +focusmap"   ->  g: ["+map", "+focusmap"]
+
+BindMap строится по индексу ConfigManager (ключ -> номера строк) и держит
+два индекса: клавиша -> бинд и команда -> клавиши. Повторы одной клавиши
+находятся там же, за один проход: одинаковые команды — дубликат, разные —
+конфликт (действует последняя строка). Правки пишутся через
+ConfigManager.set_value(..., "keys"), комментарии в строках сохраняются."""
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.config_reader import bind_entry, bind_key, iter_cfg_lines, tokenize_line
+from core.utils import resource_path
+
+PRESETS_PATH = os.path.join("core", "binds.txt")
+
+
+def split_commands(value: str) -> List[str]:
+    # "+map; +focusmap" -> ["+map", "+focusmap"]; пустые куски отбрасываются
+    return [cmd.strip() for cmd in (value or "").split(";") if cmd.strip()]
+
+
+def join_commands(commands: Iterable[str]) -> str:
+    return "; ".join(commands)
+
+
+def _command_key(command: str) -> str:
+    # команды в Rust регистронезависимы, лишние пробелы между аргументами не важны
+    return " ".join(command.lower().split())
+
+
+def parse_bind_line(line: str) -> Optional[Tuple[str, List[str]]]:
+    """(клавиша, команды) для строки bind/input.bind; None — строка не бинд."""
+    tokens, _ = tokenize_line(line)
+    key = bind_key(tokens)
+    if key is None:
+        return None
+    entry = bind_entry(tokens)
+    return key, split_commands(entry[1]) if entry else []
+
+
+def load_bind_presets(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """Рекомендуемые бинды из core/binds.txt: {клавиша: команды}."""
+    path = path or resource_path(PRESETS_PATH)
+    presets = {}
+    if not os.path.exists(path):
+        return presets
+    for _, tokens, _ in iter_cfg_lines(path):
+        key = bind_key(tokens)
+        entry = bind_entry(tokens)
+        if key is not None and entry:
+            presets[key] = split_commands(entry[1])
+    return presets
+
+
+class Bind:
+    __slots__ = ("key", "commands", "line", "variants")
+
+    def __init__(self, key: str, commands: List[str], line: int, variants: Optional[List[str]] = None):
+        self.key = key            # как записано в действующей строке
+        self.commands = commands
+        self.line = line          # номер действующей строки
+        # все написания клавиши в cfg (g и G) — правка пишется во все, иначе
+        # оставшаяся строка с другим регистром станет конфликтом
+        self.variants = variants or [key]
+
+    def __repr__(self):
+        return f"Bind({self.key!r}, {self.commands!r})"
+
+
+class BindMap:
+    def __init__(self, config):
+        self.config = config
+        self.by_key: Dict[str, Bind] = {}             # клавиша (в нижнем регистре) -> бинд
+        self.by_command: Dict[str, List[str]] = {}    # команда -> клавиши (в нижнем регистре)
+        # клавиша -> номера строк: одни и те же команды несколько раз
+        self.duplicates: Dict[str, List[int]] = {}
+        # клавиша -> [(номер строки, команды)]: разные команды, действует последняя
+        self.conflicts: Dict[str, List[Tuple[int, List[str]]]] = {}
+        self.rebuild()
+
+    # ---------------- BUILD ----------------
+    def rebuild(self):
+        self.by_key.clear()
+        self.by_command.clear()
+        self.duplicates.clear()
+        self.conflicts.clear()
+        groups: Dict[str, List[str]] = {}
+        for key in self.config.keys("keys"):
+            groups.setdefault(key.lower(), []).append(key)
+        for name, variants in groups.items():
+            self._index_key(name, variants)
+
+    def update_keys(self, keys: Iterable[str]):
+        """Переиндексирует только указанные клавиши (для слушателя ConfigManager)."""
+        names = {key.lower() for key in keys}
+        if not names:
+            return
+        variants: Dict[str, List[str]] = {name: [] for name in names}
+        for key in self.config.keys("keys"):
+            name = key.lower()
+            if name in variants:
+                variants[name].append(key)
+        for name in names:
+            self._unindex_key(name)
+            self._index_key(name, variants[name])
+
+    def on_config_changed(self, file_type: str, keys: List[str]):
+        if file_type == "keys":
+            self.update_keys(keys)
+
+    def _index_key(self, name: str, variants: List[str]):
+        # все вхождения клавиши (с учётом написания в другом регистре) по порядку строк
+        occurrences = []
+        for key in variants:
+            for pos, line in self.config.occurrences(key, "keys"):
+                parsed = parse_bind_line(line)
+                if parsed is not None:
+                    occurrences.append((pos, key, parsed[1]))
+        if not occurrences:
+            return
+        occurrences.sort()
+        pos, key, commands = occurrences[-1]
+        spellings = []
+        for _, variant, _ in occurrences:
+            if variant not in spellings:
+                spellings.append(variant)
+        self.by_key[name] = Bind(key, commands, pos, spellings)
+        for command in commands:
+            keys = self.by_command.setdefault(_command_key(command), [])
+            if name not in keys:
+                keys.append(name)
+
+        if len(occurrences) > 1:
+            if all(c == commands for _, _, c in occurrences):
+                self.duplicates[name] = [p for p, _, _ in occurrences]
+            else:
+                self.conflicts[name] = [(p, c) for p, _, c in occurrences]
+
+    def _unindex_key(self, name: str):
+        bind = self.by_key.pop(name, None)
+        self.duplicates.pop(name, None)
+        self.conflicts.pop(name, None)
+        if bind is None:
+            return
+        for command in bind.commands:
+            command = _command_key(command)
+            keys = self.by_command.get(command)
+            if keys and name in keys:
+                keys.remove(name)
+                if not keys:
+                    del self.by_command[command]
+
+    # ---------------- QUERY ----------------
+    def get(self, key: str) -> Optional[Bind]:
+        return self.by_key.get(key.lower())
+
+    def commands_for(self, key: str) -> List[str]:
+        bind = self.get(key)
+        return list(bind.commands) if bind else []
+
+    def keys_for(self, command: str) -> List[str]:
+        """Какие клавиши запускают команду — по индексу, без перебора биндов."""
+        return list(self.by_command.get(_command_key(command), []))
+
+    def shared_commands(self) -> Dict[str, List[str]]:
+        # команды, висящие сразу на нескольких клавишах
+        return {cmd: list(keys) for cmd, keys in self.by_command.items() if len(keys) > 1}
+
+    def __contains__(self, key: str) -> bool:
+        return key.lower() in self.by_key
+
+    def __len__(self) -> int:
+        return len(self.by_key)
+
+    def __iter__(self):
+        return iter(self.by_key.values())
+
+    # ---------------- EDIT ----------------
+    def _targets(self, key: str) -> List[str]:
+        bind = self.get(key)
+        return list(bind.variants) if bind else [key]
+
+    def set_commands(self, key: str, commands: Iterable[str]):
+        value = join_commands(c.strip() for c in commands if c.strip())
+        targets = self._targets(key)
+        # все написания клавиши — одной транзакцией (и одной записью в истории правок)
+        self.config.set_values({target: value for target in targets}, "keys")
+        # если слушатель не подписан, индексы всё равно должны быть свежими
+        self.update_keys(targets)
+
+    def add_command(self, key: str, command: str):
+        commands = self.commands_for(key)
+        if _command_key(command) not in {_command_key(c) for c in commands}:
+            self.set_commands(key, commands + [command])
+
+    def remove_command(self, key: str, command: str):
+        commands = self.commands_for(key)
+        remaining = [c for c in commands if _command_key(c) != _command_key(command)]
+        if len(remaining) != len(commands):
+            self.set_commands(key, remaining)
+
+    def apply_presets(self, presets: Dict[str, List[str]]):
+        # одна транзакция на все бинды пресета
+        values = {}
+        for key, commands in presets.items():
+            value = join_commands(commands)
+            for target in self._targets(key):
+                values[target] = value
+        self.config.set_values(values, "keys")
+        self.update_keys(values)
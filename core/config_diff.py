@@ -0,0 +1,163 @@
+# core/config_diff.py
+"""Разница между конфигами по ключам, а не по номерам строк.
+
+Обе стороны — словари {ключ: значение} одного файла (client или keys), поэтому
+сравнение — один проход по каждому словарю: O(n) от числа ключей, переставленные
+строки и комментарии изменениями не считаются. Источники:
+
+    disk_diff(manager)           — что запишет save(): память против файлов на диске
+    folder_diff(manager, folder) — загруженный конфиг против другой папки cfg (профиля)
+    preset_diff(manager, preset) — что изменит пресет (только его ключи, без удалений)
+
+Тем же diff_values пользуются перечитывание файлов (ConfigManager.reload_if_changed)
+и пробный прогон CLI."""
+import os
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from core.config_reader import bind_entry, bind_key, client_entry, iter_cfg_lines
+
+ADDED = "added"
+CHANGED = "changed"
+REMOVED = "removed"
+
+FILE_TYPES = ("client", "keys")
+
+_SIGNS = {ADDED: "+", CHANGED: "~", REMOVED: "-"}
+
+
+class DiffEntry(NamedTuple):
+    file_type: str
+    key: str
+    change: str              # ADDED / CHANGED / REMOVED
+    old: Optional[str]       # None — ключа не было
+    new: Optional[str]       # None — ключ удалён
+
+
+def parse_values(source, file_type: str = "client") -> Dict[str, str]:
+    """{ключ: значение} из bytes, пути или потока — как при загрузке в ConfigManager:
+    при повторах побеждает последняя строка."""
+    values: Dict[str, str] = {}
+    for _, tokens, _ in iter_cfg_lines(source):
+        if file_type == "client":
+            entry = client_entry(tokens)
+        else:
+            entry = bind_entry(tokens) if bind_key(tokens) is not None else None
+        if entry:
+            values[entry[0]] = entry[1]
+    return values
+
+
+def read_values(path: str, file_type: str = "client") -> Dict[str, str]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "rb") as f:
+        return parse_values(f.read(), file_type)
+
+
+def diff_values(old: Dict[str, str], new: Dict[str, str], file_type: str = "client",
+                value_types=None, partial: bool = False) -> List[DiffEntry]:
+    """Изменения от old к new. value_types (core.values.ValueTypes) — сравнивать
+    с учётом типа ("0.10" == "0.1"); None — строки как есть. partial — new содержит
+    только часть ключей (пресет), отсутствие ключа в new удалением не считается."""
+    entries = []
+    if not partial:
+        for key, value in old.items():
+            if key not in new:
+                entries.append(DiffEntry(file_type, key, REMOVED, value, None))
+    for key, value in new.items():
+        before = old.get(key)
+        if before is None:
+            entries.append(DiffEntry(file_type, key, ADDED, None, value))
+        elif before != value and (value_types is None or not value_types.same(file_type, key, before, value)):
+            entries.append(DiffEntry(file_type, key, CHANGED, before, value))
+    return entries
+
+
+class ConfigDiff:
+    """Набор изменений по обоим файлам."""
+
+    __slots__ = ("entries",)
+
+    def __init__(self, entries: Optional[List[DiffEntry]] = None):
+        self.entries: List[DiffEntry] = entries or []
+
+    def _of(self, change: str) -> List[DiffEntry]:
+        return [e for e in self.entries if e.change == change]
+
+    @property
+    def added(self) -> List[DiffEntry]:
+        return self._of(ADDED)
+
+    @property
+    def changed(self) -> List[DiffEntry]:
+        return self._of(CHANGED)
+
+    @property
+    def removed(self) -> List[DiffEntry]:
+        return self._of(REMOVED)
+
+    def keys(self, file_type: str) -> List[str]:
+        return [e.key for e in self.entries if e.file_type == file_type]
+
+    def summary(self) -> str:
+        counts = {ADDED: 0, CHANGED: 0, REMOVED: 0}
+        for e in self.entries:
+            counts[e.change] += 1
+        return f"изменено: {counts[CHANGED]}, добавлено: {counts[ADDED]}, удалено: {counts[REMOVED]}"
+
+    def format_lines(self) -> List[str]:
+        # "~ client.cfg  fps.limit: 60 -> 144"
+        return [f"{_SIGNS[e.change]} {e.file_type}.cfg  {e.key}: "
+                f"{'—' if e.old is None else e.old} -> {'—' if e.new is None else e.new}"
+                for e in self.entries]
+
+    def __iter__(self) -> Iterator[DiffEntry]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __bool__(self) -> bool:
+        return bool(self.entries)
+
+    def __repr__(self):
+        return f"ConfigDiff({self.summary()})"
+
+
+def _memory_values(manager, file_type: str) -> Dict[str, str]:
+    # копия под блокировкой: правки из GUI-потока не меняют словарь посреди сравнения
+    with manager._lock:
+        return dict(manager.client_data if file_type == "client" else manager.keys_data)
+
+
+def disk_diff(manager, file_types=FILE_TYPES) -> ConfigDiff:
+    """Что изменит save(): файлы на диске против памяти. Берутся только файлы
+    с несохранёнными правками — остальные save() не пишет."""
+    entries = []
+    for ftype in file_types:
+        if not manager.is_dirty(ftype):
+            continue
+        path = manager.client_path if ftype == "client" else manager.keys_path
+        entries += diff_values(read_values(path, ftype), _memory_values(manager, ftype), ftype)
+    return ConfigDiff(entries)
+
+
+def folder_diff(manager, folder: str, file_types=FILE_TYPES) -> ConfigDiff:
+    """Загруженный конфиг против другой папки cfg: что поменяется, если перейти на неё."""
+    entries = []
+    for ftype in file_types:
+        other = read_values(os.path.join(folder, ftype + ".cfg"), ftype)
+        entries += diff_values(_memory_values(manager, ftype), other, ftype, manager.value_types)
+    return ConfigDiff(entries)
+
+
+def preset_diff(manager, preset) -> ConfigDiff:
+    """Что изменит пресет (core/presets.Preset) в загруженном конфиге."""
+    by_file: Dict[str, Dict[str, str]] = {}
+    for (ftype, key), value in preset.values.items():
+        by_file.setdefault(ftype, {})[key] = value
+    entries = []
+    for ftype, values in by_file.items():
+        entries += diff_values(_memory_values(manager, ftype), values, ftype,
+                               manager.value_types, partial=True)
+    return ConfigDiff(entries)
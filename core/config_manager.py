@@ -1,68 +1,382 @@
 # core/config_manager.py
+import logging
 import os
-from typing import Dict, List
+import threading
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core import parse_cache
+from core.backups import BackupStore
+from core.config_diff import diff_values
+from core.config_reader import (
+    bind_entry, bind_key, client_entry, detect_newline, iter_cfg_lines, tokenize_line
+)
+from core.config_writer import write_atomic
+from core.line_store import LineStore
+from core.diagnostics import timed
+from core.journal import FileDelta, Journal
+from core.values import DEFAULT_TYPES, ValueTypes, is_number
+
+log = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# сколько строк разбирать между вызовами progress (он же проверяет отмену)
+PROGRESS_EVERY = 4096
+
+
+class OperationCancelled(Exception):
+    """Бросается из progress-колбэка, чтобы прервать загрузку или сохранение."""
+
+
+def _file_type(file_type: str) -> str:
+    return "client" if (file_type or "client").lower() == "client" else "keys"
+
+
+def _fingerprint(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class ConfigTransaction:
+    """Пакет изменений: применяется целиком или откатывается целиком.
+    Внутри with блокировка менеджера держится до commit/rollback: перечитывание
+    файлов из фонового потока не вклинится между двумя set()."""
+
+    def __init__(self, manager: "ConfigManager"):
+        self._manager = manager
+        self.updated: List[Tuple[str, str]] = []   # (file_type, key) — заменены существующие строки
+        self.appended: List[Tuple[str, str]] = []  # (file_type, key) — дописаны новые строки
+        # file_type -> (исходное число строк, {номер: старая строка}, {ключ: старое значение},
+        #               dirty, копия несохранённых правок)
+        self._saved: Dict[str, tuple] = {}
+        self._closed = False
+        self._locked = False
+
+    def set(self, key: str, value: str, file_type: str = "client"):
+        if self._closed:
+            raise RuntimeError("Транзакция уже завершена")
+        with self._manager._lock:
+            self._set(key, value, file_type)
+
+    def _set(self, key: str, value: str, file_type: str):
+        ftype = _file_type(file_type)
+        value = "" if value is None else str(value)
+        manager = self._manager
+
+        lines, index, data, formatter = manager._file_state(ftype)
+        if manager.value_types.same(ftype, key, data.get(key), value):
+            # то же значение с точностью до записи ("0.10" и "0.1") — строку не трогаем
+            return
+        _, old_lines, old_values, _, _ = self._saved.setdefault(
+            ftype, (len(lines), {}, {}, manager._dirty[ftype], dict(manager._pending[ftype]))
+        )
+        if key not in old_values:
+            old_values[key] = data.get(key, _MISSING)
+
+        data[key] = value
+        manager._dirty[ftype] = True
+        manager._versions[ftype] += 1
+        manager._pending[ftype][key] = value
+        entry = (ftype, key)
+        appended = self._manager._set_value_in_lines(lines, index, key, value, formatter, old_lines)
+        if appended:
+            self.appended.append(entry)
+        elif entry not in self.appended and entry not in self.updated:
+            self.updated.append(entry)
+
+    def commit(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._saved:
+                with self._manager._lock:
+                    self._manager._record({ftype: (count, old_lines, old_values)
+                                           for ftype, (count, old_lines, old_values, _, _) in self._saved.items()})
+        finally:
+            self._unlock()
+        # слушатели — уже без блокировки
+        for ftype, saved in self._saved.items():
+            self._manager._notify(ftype, list(saved[2]))
+
+    def rollback(self):
+        try:
+            with self._manager._lock:
+                self._rollback()
+        finally:
+            self._unlock()
+
+    def _unlock(self):
+        if self._locked:
+            self._locked = False
+            self._manager._lock.release()
+
+    def _rollback(self):
+        for ftype, (count, old_lines, old_values, dirty, pending) in self._saved.items():
+            self._manager._dirty[ftype] = dirty
+            self._manager._versions[ftype] += 1
+            self._manager._pending[ftype] = pending
+            lines, index, data, _ = self._manager._file_state(ftype)
+            for pos, line in old_lines.items():
+                if pos < count:
+                    lines[pos] = line
+            del lines[count:]
+            for key, old in old_values.items():
+                if old is _MISSING:
+                    data.pop(key, None)
+                else:
+                    data[key] = old
+        for ftype, key in self.appended:
+            self._manager._file_state(ftype)[1].pop(key, None)
+        self.updated.clear()
+        self.appended.clear()
+        self._saved.clear()
+        self._closed = True
+
+    def __enter__(self):
+        self._manager._lock.acquire()
+        self._locked = True
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
 
 class ConfigManager:
-    def __init__(self, cfg_folder: str):
+    def __init__(self, cfg_folder: str, use_cache: bool = True, progress=None,
+                 value_types: Optional[ValueTypes] = None, backups: Optional[BackupStore] = None):
+        """progress(доля 0..1, текст) — необязательный колбэк загрузки; может
+        бросить OperationCancelled, чтобы прервать её (например, из фонового потока).
+        value_types — типы значений ключей (ValueTypes.from_catalog); по ним
+        запись того же значения в другом виде не считается изменением.
+        backups — хранилище снимков (core/backups.py): save() снимает файлы
+        до и после записи."""
         self.cfg_folder = cfg_folder
+        self.use_cache = use_cache
+        self.value_types = value_types or DEFAULT_TYPES
+        self.backups = backups
         self.client_path = os.path.join(cfg_folder, "client.cfg")
         self.keys_path = os.path.join(cfg_folder, "keys.cfg")
 
-        self.client_lines: List[str] = []
-        self.keys_lines: List[str] = []
+        # строки файлов поверх исходных байтов (см. core/line_store.py)
+        self.client_lines = LineStore()
+        self.keys_lines = LineStore()
 
         self.client_data: Dict[str, str] = {}
         self.keys_data: Dict[str, str] = {}
 
-        self._load_configs()
+        # ключ -> номера строк, где он встречается (обычно одна)
+        self._client_index: Dict[str, List[int]] = {}
+        self._keys_index: Dict[str, List[int]] = {}
+
+        # есть ли несохранённые изменения и каким переводом строки записан файл
+        self._dirty = {"client": False, "keys": False}
+        self._newlines = {"client": os.linesep, "keys": os.linesep}
+        # несохранённые правки (ключ -> значение): накатываются поверх файла,
+        # если игра перезапишет его, пока правки не сохранены
+        self._pending: Dict[str, Dict[str, str]] = {"client": {}, "keys": {}}
+        # (mtime_ns, size) файлов на момент последнего чтения/записи
+        self._fingerprints: Dict[str, Optional[Tuple[int, int]]] = {"client": None, "keys": None}
+        self._listeners: List[Callable[[str, List[str]], None]] = []
+        # как доставлять уведомления слушателям (см. set_notifier); None — сразу, в этом же потоке
+        self._notifier: Optional[Callable[[str, List[str]], None]] = None
+        # счётчик правок по файлам: save() из фонового потока по нему понимает,
+        # не поменялось ли что-то, пока файл писался
+        self._versions = {"client": 0, "keys": 0}
+        # загрузка, перечитывание и сохранение могут идти в фоновом потоке
+        self._lock = threading.RLock()
+        self._progress = progress
+        # правки для отмены/повтора (core/journal.py); None — не записывать
+        self.journal: Optional[Journal] = Journal()
+
+        with self._lock:
+            self._load_configs()
+        self._progress = None
 
     # ---------------- LOAD ----------------
     def _load_configs(self):
+        self._fingerprints["client"] = _fingerprint(self.client_path)
+        self._fingerprints["keys"] = _fingerprint(self.keys_path)
+        self._report(0.0, "client.cfg")
         self.client_data = self._parse_client_file(self.client_path)
+        self._report(0.5, "keys.cfg")
         self.keys_data = self._parse_keys_file(self.keys_path)
+        self._report(1.0, "")
+
+    def _report(self, fraction: float, text: str):
+        if self._progress is not None:
+            self._progress(fraction, text)
+
+    @timed("config.reload")
+    def reload_if_changed(self) -> Dict[str, List[str]]:
+        """Перечитывает файлы, которые изменились на диске (например, их переписала игра).
+        Разбираются заново только отличающиеся строки; несохранённые правки
+        накатываются поверх. Возвращает {file_type: [изменившиеся ключи]}."""
+        with self._lock:
+            return self._reload_if_changed()
+
+    def _reload_if_changed(self) -> Dict[str, List[str]]:
+        result = {}
+        for ftype, path in (("client", self.client_path), ("keys", self.keys_path)):
+            fp = _fingerprint(path)
+            if fp is None or fp == self._fingerprints[ftype]:
+                continue
+            self._fingerprints[ftype] = fp
+            try:
+                with open(path, "rb") as f:
+                    raw = f.read()
+                new_lines = LineStore(raw)
+                self._remember_newline(ftype, detect_newline(raw))
+            except Exception as e:
+                log.error("Ошибка при чтении %s: %s", path, e)
+                continue
+
+            before = self._reparse_changed(ftype, new_lines)
+            if self.journal is not None and (self.journal.can_undo() or self.journal.can_redo()):
+                # номера строк в журнале относятся к старому содержимому файла
+                log.info("%s изменён на диске — история правок очищена", path)
+                self.journal.clear()
+            lines, index, data, formatter = self._file_state(ftype)
+            for key, value in self._pending[ftype].items():
+                before.setdefault(key, data.get(key, _MISSING))
+                data[key] = value
+                self._set_value_in_lines(lines, index, key, value, formatter)
+
+            # до и после — только по затронутым ключам, строки сравниваются как есть
+            entries = diff_values({k: v for k, v in before.items() if v is not _MISSING},
+                                  {k: data[k] for k in before if k in data}, ftype)
+            changed = [e.key for e in entries]
+            if changed:
+                log.debug("%s перечитан: %d ключей изменилось", path, len(changed))
+                result[ftype] = changed
+                self._notify(ftype, changed)
+        return result
+
+    def _reparse_changed(self, ftype: str, new_lines: LineStore) -> Dict[str, object]:
+        # Отрезаем общие начало и конец, разбираем только то, что между ними.
+        # Возвращает {затронутый ключ: значение до перечитывания}.
+        lines, index, data, _ = self._file_state(ftype)
+        n_old, n_new = len(lines), len(new_lines)
+        start = 0
+        limit = min(n_old, n_new)
+        while start < limit and lines.same_line(start, new_lines, start):
+            start += 1
+        end_old, end_new = n_old, n_new
+        while end_old > start and end_new > start and lines.same_line(end_old - 1, new_lines, end_new - 1):
+            end_old -= 1
+            end_new -= 1
+
+        shift = (end_new - start) - (end_old - start)
+        if shift == 0:
+            # Число строк то же — сравниваем попарно и трогаем только отличающиеся
+            old_positions = new_positions = [i for i in range(start, end_old)
+                                             if not lines.same_line(i, new_lines, i)]
+        else:
+            old_positions = range(start, end_old)
+            new_positions = range(start, end_new)
+
+        touched: Dict[str, object] = {}
+        for i in old_positions:
+            key, _ = self._line_entry(ftype, lines[i])
+            if key is not None:
+                touched.setdefault(key, data.get(key, _MISSING))
+                index[key].remove(i)
+        if shift:
+            for positions in index.values():
+                for j, pos in enumerate(positions):
+                    if pos >= end_old:
+                        positions[j] = pos + shift
+        for i in new_positions:
+            key, _ = self._line_entry(ftype, new_lines[i])
+            if key is not None:
+                touched.setdefault(key, data.get(key, _MISSING))
+                index.setdefault(key, []).append(i)
+
+        lines.replace_with(new_lines)
+        for key in touched:
+            positions = index.get(key)
+            value = None
+            if positions:
+                positions.sort()
+                for pos in reversed(positions):
+                    value = self._line_entry(ftype, lines[pos])[1]
+                    if value is not None:
+                        break
+            else:
+                index.pop(key, None)
+            if value is None:
+                data.pop(key, None)
+            else:
+                data[key] = value
+        return touched
 
     def _parse_client_file(self, path: str) -> Dict[str, str]:
-        data = {}
-        self.client_lines = []
-        if not os.path.exists(path):
-            return data
-        try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                self.client_lines = f.readlines()
-            for line in self.client_lines:
-                s = line.strip()
-                if not s or s.startswith("//"):
-                    continue
-                parts = s.split(maxsplit=1)
-                if len(parts) >= 2:
-                    key = parts[0]
-                    val = parts[1].split("//")[0].strip()  # отрезаем коммент
-                    val = val.strip('"')                  # убираем кавычки
-                    data[key] = val
-        except Exception as e:
-            print(f"Ошибка при чтении {path}: {e}")
-        return data
+        return self._parse_file("client", path)
 
     def _parse_keys_file(self, path: str) -> Dict[str, str]:
-        data = {}
-        self.keys_lines = []
+        return self._parse_file("keys", path)
+
+    @timed("config.parse")
+    def _parse_file(self, ftype: str, path: str) -> Dict[str, str]:
+        lines = LineStore()
+        index: Dict[str, List[int]] = {}
+        data: Dict[str, str] = {}
+        self._set_file_state(ftype, lines, index)
         if not os.path.exists(path):
             return data
         try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                self.keys_lines = f.readlines()
-            for line in self.keys_lines:
-                s = line.strip()
-                if not s or s.startswith("//"):
+            with open(path, "rb") as f:
+                raw = f.read()
+            fingerprint = self._fingerprints[ftype] or _fingerprint(path)
+
+            # Файл не менялся с прошлого запуска — берём готовый разбор из кэша
+            digest = parse_cache.content_hash(raw) if self.use_cache else None
+            cached = parse_cache.load(path, fingerprint, digest) if self.use_cache else None
+            if cached is not None:
+                newline, offsets, data, index = cached
+                lines = LineStore(raw, array("q", offsets))
+                self._remember_newline(ftype, newline)
+                self._set_file_state(ftype, lines, index)
+                log.debug("%s: разбор из кэша, %d строк", path, len(lines))
+                return data
+
+            lines = LineStore(raw)
+            self._set_file_state(ftype, lines, index)
+            base = 0.0 if ftype == "client" else 0.5
+            total = raw.count(b"\n") + 1
+            for i, (_, tokens, _) in enumerate(iter_cfg_lines(raw)):
+                if self._progress is not None and i % PROGRESS_EVERY == 0 and i:
+                    self._progress(base + 0.5 * i / total, os.path.basename(path))
+                if ftype == "client":
+                    entry = client_entry(tokens)
+                    if entry:
+                        data[entry[0]] = entry[1]
+                        index.setdefault(entry[0], []).append(i)
                     continue
-                if s.lower().startswith("bind "):
-                    parts = s.split(maxsplit=2)
-                    if len(parts) >= 3:
-                        key = parts[1]
-                        val = parts[2].split("//")[0].strip().strip('"')
-                        data[key] = val
+                key = bind_key(tokens)
+                if key is None:
+                    continue
+                index.setdefault(key, []).append(i)
+                entry = bind_entry(tokens)
+                if entry:
+                    data[key] = entry[1]
+            newline = detect_newline(raw)
+            self._remember_newline(ftype, newline)
+
+            if self.use_cache:
+                parse_cache.store(path, fingerprint, digest, newline, lines.offsets.tobytes(), data, index)
+        except OperationCancelled:
+            raise
         except Exception as e:
-            print(f"Ошибка при чтении {path}: {e}")
+            log.error("Ошибка при чтении %s: %s", path, e)
         return data
 
     # ---------------- GET/SET ----------------
@@ -71,68 +385,219 @@ class ConfigManager:
             return self.client_data.get(key, "")
         return self.keys_data.get(key, "")
 
+    def has_value(self, key: str, file_type: str = "client") -> bool:
+        return key in self._file_state(_file_type(file_type))[2]
+
+    def has_same_value(self, key: str, value: str, file_type: str = "client") -> bool:
+        """Ключ уже задан этим значением (с учётом типа: "True" == "1", "0.10" == "0.1")."""
+        ftype = _file_type(file_type)
+        return self.value_types.same(ftype, key, self._file_state(ftype)[2].get(key), value)
+
+    def keys(self, file_type: str = "client") -> List[str]:
+        """Все ключи, встречающиеся в файле (включая бинды без команды)."""
+        return list(self._file_state(_file_type(file_type))[1])
+
+    def occurrences(self, key: str, file_type: str = "client") -> List[Tuple[int, str]]:
+        """(номер строки, строка) для каждого вхождения ключа — по индексу, без перебора файла."""
+        lines, index, _, _ = self._file_state(_file_type(file_type))
+        return [(pos, lines[pos]) for pos in sorted(index.get(key, ()))]
+
+    @timed("config.set")
     def set_value(self, key: str, value: str, file_type: str = "client"):
-        ftype = (file_type or "client").lower()
+        ftype = _file_type(file_type)
         value = "" if value is None else str(value)
 
-        print(f"[DEBUG] set_value: key={key}, value={value}, file_type={ftype}")
+        with self._lock:
+            lines, index, data, formatter = self._file_state(ftype)
+            if self.value_types.same(ftype, key, data.get(key), value):
+                log.debug("set_value %s: %s=%r — значение не изменилось", ftype, key, value)
+                return
+            count, backup, old = len(lines), {}, data.get(key, _MISSING)
+            self._dirty[ftype] = True
+            self._versions[ftype] += 1
+            self._pending[ftype][key] = value
+            data[key] = value
+            appended = self._set_value_in_lines(lines, index, key, value, formatter, backup)
+            if self.journal is not None:
+                # одиночная правка — разница известна на месте, без общего пути _record()
+                self.journal.record({ftype: FileDelta(
+                    count, {pos: (line, lines[pos]) for pos, line in backup.items() if pos < count},
+                    [lines[count]] if appended else [],
+                    {key: (None if old is _MISSING else old, value)})})
+            self._notify(ftype, [key])
+        log.debug("set_value %s: %s=%r (%s)", ftype, key, value, "дописана строка" if appended else "обновлено")
 
-        if ftype == "client":
-            self.client_data[key] = value
-            self.client_lines = self._set_value_in_lines(
-                self.client_lines, key, value, self._format_client_line
+    def transaction(self) -> ConfigTransaction:
+        return ConfigTransaction(self)
+
+    @timed("config.set_values")
+    def set_values(self, values: Dict[str, str], file_type: str = "client") -> ConfigTransaction:
+        """Применяет сразу много ключей одной транзакцией.
+        Возвращает транзакцию со списками updated/appended."""
+        with self.transaction() as tx:
+            for key, value in values.items():
+                tx.set(key, value, file_type)
+        return tx
+
+    # ---------------- UNDO/REDO ----------------
+    def _record(self, changes: Dict[str, tuple]):
+        # changes: file_type -> (число строк до правки, {номер: старая строка}, {ключ: старое значение})
+        if self.journal is None:
+            return
+        files = {}
+        for ftype, (count, old_lines, old_values) in changes.items():
+            lines, _, data, _ = self._file_state(ftype)
+            total = len(lines)
+            files[ftype] = FileDelta(
+                count,
+                {pos: (line, lines[pos]) for pos, line in old_lines.items() if pos < count},
+                [lines[i] for i in range(count, total)] if total > count else [],
+                {key: (None if old is _MISSING else old, data.get(key)) for key, old in old_values.items()},
             )
+        self.journal.record(files)
+
+    def undo(self) -> Optional[str]:
+        """Отменяет последнюю правку. Возвращает её описание или None, если отменять нечего."""
+        return self._replay(undo=True)
+
+    def redo(self) -> Optional[str]:
+        return self._replay(undo=False)
+
+    def _replay(self, undo: bool) -> Optional[str]:
+        if self.journal is None:
+            return None
+        with self._lock:
+            entry = self.journal.pop_undo() if undo else self.journal.pop_redo()
+            if entry is None:
+                return None
+            for ftype, delta in entry.files.items():
+                self._apply_delta(ftype, delta, undo)
+        for ftype, delta in entry.files.items():
+            self._notify(ftype, list(delta.values))
+        log.debug("%s: %s", "отменено" if undo else "повторено", entry.label)
+        return entry.label
+
+    def _apply_delta(self, ftype: str, delta: FileDelta, undo: bool):
+        lines, index, data, _ = self._file_state(ftype)
+        if undo:
+            for pos, (old, _) in delta.lines.items():
+                lines[pos] = old
+            del lines[delta.count_before:]
+            for key in delta.values:
+                positions = index.get(key)
+                if positions:
+                    positions[:] = [pos for pos in positions if pos < delta.count_before]
+                    if not positions:
+                        del index[key]
         else:
-            self.keys_data[key] = value
-            self.keys_lines = self._set_value_in_lines(
-                self.keys_lines, key, value, self._format_bind_line, is_bind=True
-            )
+            for pos, (_, new) in delta.lines.items():
+                lines[pos] = new
+            for line in delta.added:
+                key, _ = self._line_entry(ftype, line)
+                if key is not None:
+                    index.setdefault(key, []).append(len(lines))
+                lines.append(line)
+        pending = self._pending[ftype]
+        for key, (old, new) in delta.values.items():
+            value = old if undo else new
+            if value is None:
+                data.pop(key, None)
+                pending.pop(key, None)
+            else:
+                data[key] = value
+                pending[key] = value
+        self._dirty[ftype] = True
+        self._versions[ftype] += 1
+
+    def is_dirty(self, file_type: str = None) -> bool:
+        if file_type is None:
+            return any(self._dirty.values())
+        return self._dirty[_file_type(file_type)]
+
+    # ---------------- LISTENERS ----------------
+    def add_listener(self, callback: Callable[[str, List[str]], None]):
+        """callback(file_type, keys) вызывается после каждого изменения значений."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def set_notifier(self, notifier: Optional[Callable[[str, List[str]], None]]):
+        """notifier(file_type, keys) вместо прямого вызова слушателей — например,
+        сигнал Qt, чтобы изменения из фонового потока доходили до GUI в его потоке.
+        notifier должен в итоге вызвать notify_listeners()."""
+        self._notifier = notifier
+
+    def notify_listeners(self, ftype: str, keys: List[str]):
+        for callback in list(self._listeners):
+            callback(ftype, keys)
+
+    def _notify(self, ftype: str, keys: List[str]):
+        if self._notifier is not None:
+            self._notifier(ftype, list(keys))
+        else:
+            self.notify_listeners(ftype, keys)
 
     # ---------------- HELPERS ----------------
-    def _set_value_in_lines(self, lines: list, key: str, value: str, formatter, is_bind=False) -> list:
-        new_lines = []
-        found = False
-        for line in lines:
-            s = line.strip()
-            if not s or s.startswith("//"):
-                new_lines.append(line)
-                continue
+    def _remember_newline(self, ftype: str, newlines):
+        # f.newlines: None — переводов строк не было, кортеж — смешанные; тогда берём \n
+        if isinstance(newlines, str):
+            self._newlines[ftype] = newlines
+        elif newlines:
+            self._newlines[ftype] = "\n"
 
-            if is_bind:
-                if s.lower().startswith("bind "):
-                    parts = s.split(maxsplit=2)
-                    if len(parts) >= 2 and parts[1] == key:
-                        print(f"[DEBUG] Updating bind {key} → {value}")
-                        comment = ""
-                        if "//" in line:
-                            comment = " //" + line.split("//", 1)[1].rstrip()
-                        new_lines.append(formatter(key, value).rstrip("\n") + comment + "\n")
-                        found = True
-                    else:
-                        new_lines.append(line)
-                else:
-                    new_lines.append(line)
-            else:
-                parts = s.split(maxsplit=1)
-                if len(parts) >= 2 and parts[0] == key:
-                    print(f"[DEBUG] Updating var {key}: {parts[1]} → {value}")
-                    comment = ""
-                    if "//" in line:
-                        comment = " //" + line.split("//", 1)[1].rstrip()
-                    new_lines.append(formatter(key, value).rstrip("\n") + comment + "\n")
-                    found = True
-                else:
-                    new_lines.append(line)
+    def _serialize(self, ftype: str) -> bytes:
+        # неизменённые участки копируются из исходного буфера как есть, без декодирования
+        return self._file_state(ftype)[0].to_bytes(self._newlines[ftype])
 
-        if not found:
-            print(f"[DEBUG] Key {key} not found, adding new line")
-            new_lines.append(formatter(key, value))
-        return new_lines
+    def _line_entry(self, ftype: str, line: str) -> Tuple[Optional[str], Optional[str]]:
+        # (ключ для индекса, значение) одной строки; (None, None) — строка без ключа
+        tokens, _ = tokenize_line(line)
+        if ftype == "client":
+            entry = client_entry(tokens)
+            return entry if entry else (None, None)
+        entry = bind_entry(tokens)
+        return bind_key(tokens), entry[1] if entry else None
 
+    def _set_file_state(self, ftype: str, lines: LineStore, index: Dict[str, List[int]]):
+        if ftype == "client":
+            self.client_lines, self._client_index = lines, index
+        else:
+            self.keys_lines, self._keys_index = lines, index
+
+    def _file_state(self, ftype: str):
+        if ftype == "client":
+            return self.client_lines, self._client_index, self.client_data, self._format_client_line
+        return self.keys_lines, self._keys_index, self.keys_data, self._format_bind_line
+
+    def _set_value_in_lines(self, lines: LineStore, index: Dict[str, List[int]], key: str, value: str,
+                            formatter, backup: Dict[int, str] = None) -> bool:
+        # Правим строки на месте по индексу, без перебора всего файла.
+        # backup — куда сохранить старые версии строк (для отката). True — строка дописана.
+        positions = index.get(key)
+        if not positions:
+            if lines and not lines[-1].endswith("\n"):
+                if backup is not None:
+                    backup.setdefault(len(lines) - 1, lines[-1])
+                lines[-1] += "\n"
+            index[key] = [len(lines)]
+            lines.append(formatter(key, value))
+            return True
+
+        for pos in positions:
+            line = lines[pos]
+            if backup is not None:
+                backup.setdefault(pos, line)
+            _, comment = tokenize_line(line)
+            comment = "" if comment is None else " //" + comment.rstrip()
+            lines[pos] = formatter(key, value).rstrip("\n") + comment + "\n"
+        return False
 
     def _format_client_line(self, key: str, value: str) -> str:
         # Числа (целые и дробные) — без кавычекhb.ktyi
-        if self._is_number(value):
+        if is_number(value):
             return f"{key} {value}\n"
         # Всё остальное — в кавычках, включая "True", "False", "on", "off" и т.д.
         return f'{key} "{value}"\n'
@@ -140,23 +605,50 @@ class ConfigManager:
     def _format_bind_line(self, key: str, value: str) -> str:
         return f'bind {key} "{value}"\n'
 
-    def _is_number(self, s: str) -> bool:
-        try:
-            float(s)
-            return True
-        except ValueError:
-            return False
-
     # ---------------- SAVE ----------------
-    def save(self):
-        try:
-            with open(self.client_path, "w", encoding="utf-8") as f:
-                f.writelines(self.client_lines)
-        except Exception as e:
-            print(f"Ошибка при записи {self.client_path}: {e}")
+    @timed("config.save")
+    def save(self, progress=None) -> bool:
+        # Пишем только изменённые файлы; одинаковые байты на диск не попадают.
+        # False — хотя бы один файл записать не удалось.
+        # Под блокировкой только снимок содержимого — правки из GUI не ждут диска.
+        # progress(доля, текст) может бросить OperationCancelled: уже записанный
+        # файл остаётся записанным, следующий не трогается.
+        if not (self._dirty["client"] or self._dirty["keys"]):
+            return True
+        ok = True
+        # то, что сейчас на диске (в том числе правки игры), — до перезаписи
+        self._backup("перед сохранением")
+        with self._lock:
+            todo = [(ftype, path) for ftype, path in (("client", self.client_path), ("keys", self.keys_path))
+                    if self._dirty[ftype]]
+        for n, (ftype, path) in enumerate(todo):
+            if progress is not None:
+                progress(n / len(todo), os.path.basename(path))
+            with self._lock:
+                payload = self._serialize(ftype)
+                version = self._versions[ftype]
+            try:
+                write_atomic(path, payload)
+            except Exception as e:
+                log.error("Ошибка при записи %s: %s", path, e)
+                ok = False
+                continue
+            with self._lock:
+                self._fingerprints[ftype] = _fingerprint(path)
+                # пока файл писался, его могли снова поменять — тогда он остаётся dirty
+                if self._versions[ftype] == version:
+                    self._dirty[ftype] = False
+                    self._pending[ftype] = {}
+        self._backup("сохранение")
+        if progress is not None:
+            progress(1.0, "")
+        return ok
 
+    def _backup(self, label: str):
+        if self.backups is None:
+            return
         try:
-            with open(self.keys_path, "w", encoding="utf-8") as f:
-                f.writelines(self.keys_lines)
+            self.backups.snapshot(self.cfg_folder, label)
         except Exception as e:
-            print(f"Ошибка при записи {self.keys_path}: {e}")
+            # без резервной копии сохранение всё равно выполняется
+            log.warning("Не удалось сделать резервную копию %s: %s", self.cfg_folder, e)
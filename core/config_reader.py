@@ -0,0 +1,99 @@
+# core/config_reader.py
+import io
+import re
+from typing import IO, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+# Один проход по строке: кавычки (с экранированием \" и \\), комментарий //, голые токены.
+# "//" внутри кавычек комментарием не считается; незакрытая кавычка заканчивается
+# в конце строки, перевод строки в значение не попадает.
+_TOKEN_RE = re.compile(r'''
+    \s*
+    (?:
+        "(?P<quoted>(?:[^"\\\r\n]|\\[^\r\n]?)*)(?:"|(?=[\r\n])|$)
+      | //(?P<comment>.*)
+      | (?P<bare>(?:[^\s"/]|/(?!/))+)
+    )
+''', re.VERBOSE)
+
+_UNESCAPE_RE = re.compile(r'\\(["\\])')
+
+
+class CfgLine(NamedTuple):
+    line: str                # исходная строка (с \n, если он был)
+    tokens: List[str]        # токены без кавычек
+    comment: Optional[str]   # текст после //, None — комментария нет
+
+
+def tokenize_line(line: str) -> Tuple[List[str], Optional[str]]:
+    tokens = []
+    comment = None
+    for m in _TOKEN_RE.finditer(line):
+        bare = m.group("bare")
+        if bare is not None:
+            tokens.append(bare)
+            continue
+        quoted = m.group("quoted")
+        if quoted is not None:
+            if "\\" in quoted:
+                quoted = _UNESCAPE_RE.sub(r"\1", quoted)
+            tokens.append(quoted)
+            continue
+        comment = m.group("comment").rstrip("\r\n")
+        break
+    return tokens, comment
+
+
+def _decode_line(line: Union[str, bytes]) -> str:
+    if isinstance(line, bytes):
+        line = line.decode("utf-8", errors="ignore")
+    if line.endswith("\r\n"):
+        line = line[:-2] + "\n"
+    return line
+
+
+def iter_cfg_lines(source: Union[str, bytes, IO, Iterable]) -> Iterator[CfgLine]:
+    """Генератор по строкам cfg: принимает путь, bytes, текстовый/бинарный поток
+    или любую итерацию строк. Ничего не держит в памяти, кроме текущей строки."""
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    if isinstance(source, str):
+        with open(source, "r", encoding="utf-8", errors="ignore") as f:
+            yield from iter_cfg_lines(f)
+        return
+    for raw in source:
+        line = _decode_line(raw)
+        tokens, comment = tokenize_line(line)
+        yield CfgLine(line, tokens, comment)
+
+
+def client_entry(tokens: List[str]) -> Optional[Tuple[str, str]]:
+    # "convar значение" -> (convar, значение)
+    if len(tokens) >= 2:
+        return tokens[0], " ".join(tokens[1:])
+    return None
+
+
+# "bind клавиша ..." и консольная форма "input.bind клавиша ..."
+BIND_COMMANDS = ("bind", "input.bind")
+
+
+def bind_key(tokens: List[str]) -> Optional[str]:
+    if len(tokens) >= 2 and tokens[0].lower() in BIND_COMMANDS:
+        return tokens[1]
+    return None
+
+
+def bind_entry(tokens: List[str]) -> Optional[Tuple[str, str]]:
+    # "bind клавиша команда" -> (клавиша, команда)
+    if len(tokens) >= 3 and tokens[0].lower() in BIND_COMMANDS:
+        return tokens[1], " ".join(tokens[2:])
+    return None
+
+
+def detect_newline(raw: bytes) -> Optional[str]:
+    # Каким переводом строки записан файл; None — переводов строк нет
+    if b"\r\n" in raw:
+        return "\r\n"
+    if b"\n" in raw:
+        return "\n"
+    return None
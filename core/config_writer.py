@@ -0,0 +1,70 @@
+# core/config_writer.py
+import os
+import tempfile
+
+
+def same_content_on_disk(path: str, data: bytes) -> bool:
+    # Сначала сверяем размер — так большинство изменённых файлов даже не читаем
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+# umask читается один раз при импорте: os.umask() меняет его на время вызова,
+# а запись идёт и из фоновых потоков
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _target_mode(path: str) -> int:
+    # права существующего файла; для нового — как у open(): 0666 с учётом umask
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+def write_atomic(path: str, data: bytes) -> bool:
+    """Записывает файл целиком через временный файл + fsync + rename.
+    Если на диске уже лежат те же байты — ничего не пишет и возвращает False."""
+    if same_content_on_disk(path, data):
+        return False
+
+    folder = os.path.dirname(os.path.abspath(path))
+    mode = _target_mode(path)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=folder, prefix="." + os.path.basename(path) + ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp создаёт файл с правами 0600 — возвращаем права исходного файла
+        os.chmod(tmp_path, mode)
+        # os.replace атомарно подменяет файл: игра видит либо старую, либо новую версию
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if hasattr(os, "O_DIRECTORY"):
+        # На POSIX фиксируем и саму запись о переименовании
+        try:
+            dir_fd = os.open(folder, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return True
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+    return True
@@ -0,0 +1,134 @@
+# core/diagnostics.py
+"""Логирование и замеры времени горячих операций.
+
+Логи идут через стандартный logging (logging.getLogger(__name__) в модулях).
+setup_logging() настраивает вывод: в stderr, а в собранном оконном exe, где
+stderr нет, — в файл в папке пользователя. Уровень — аргумент или
+переменная окружения PYRUSTSETTINGS_LOG (DEBUG, INFO, ...).
+
+Замеры выключены по умолчанию: @timed и span() тогда лишь проверяют один флаг.
+Включаются enable_timing() или PYRUSTSETTINGS_TRACE=1."""
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from typing import Deque, Dict, List, Optional, Tuple
+
+LOG_ENV = "PYRUSTSETTINGS_LOG"
+TRACE_ENV = "PYRUSTSETTINGS_TRACE"
+RECENT_LIMIT = 500
+
+_timing_enabled = os.environ.get(TRACE_ENV, "") not in ("", "0")
+# имя -> [количество, сумма мс, максимум мс, последнее мс]
+_stats: Dict[str, List[float]] = {}
+# (время окончания, имя, мс)
+_recent: Deque[Tuple[float, str, float]] = deque(maxlen=RECENT_LIMIT)
+# превью читаются и из фонового потока
+_lock = threading.Lock()
+
+
+def log_dir() -> str:
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "PyRustSettings")
+    base = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(base, "pyrustsettings")
+
+
+def setup_logging(level: Optional[str] = None, log_file: Optional[str] = None):
+    level_name = (level or os.environ.get(LOG_ENV) or "WARNING").upper()
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, level_name, logging.WARNING))
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    if log_file is None and sys.stderr is None:
+        # оконная сборка PyInstaller: stdout/stderr нет — пишем в файл
+        log_file = os.path.join(log_dir(), "pyrustsettings.log")
+    if log_file:
+        os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+        handler = RotatingFileHandler(log_file, maxBytes=1024 * 1024, backupCount=2, encoding="utf-8")
+    else:
+        handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s %(name)s: %(message)s"))
+    root.addHandler(handler)
+
+
+# ---------------- TIMING ----------------
+def enable_timing(enabled: bool = True):
+    global _timing_enabled
+    _timing_enabled = enabled
+
+
+def timing_enabled() -> bool:
+    return _timing_enabled
+
+
+def record(name: str, ms: float):
+    with _lock:
+        entry = _stats.get(name)
+        if entry is None:
+            _stats[name] = [1, ms, ms, ms]
+        else:
+            entry[0] += 1
+            entry[1] += ms
+            if ms > entry[2]:
+                entry[2] = ms
+            entry[3] = ms
+        _recent.append((time.time(), name, ms))
+
+
+def timed(name: str):
+    """Декоратор: время каждого вызова попадает в счётчик name."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _timing_enabled:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, (time.perf_counter() - t0) * 1000)
+        return wrapper
+    return decorator
+
+
+class span:
+    """with span("preview.load"): ... — замер произвольного блока."""
+    __slots__ = ("name", "_t0")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._t0 = None
+
+    def __enter__(self):
+        if _timing_enabled:
+            self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._t0 is not None:
+            record(self.name, (time.perf_counter() - self._t0) * 1000)
+        return False
+
+
+def stats() -> Dict[str, Tuple[int, float, float, float]]:
+    """имя -> (количество, среднее мс, максимум мс, последнее мс)"""
+    with _lock:
+        return {name: (int(n), total / n, mx, last) for name, (n, total, mx, last) in _stats.items()}
+
+
+def recent(limit: int = 100) -> List[Tuple[float, str, float]]:
+    with _lock:
+        return list(_recent)[-limit:]
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+        _recent.clear()
@@ -0,0 +1,153 @@
+# core/journal.py
+"""Журнал правок ConfigManager для отмены и повтора (Ctrl+Z / Ctrl+Y).
+
+Каждая правка (set_value или транзакция) хранится как разница по файлам:
+номера изменённых строк со старой и новой версией, дописанные в конец строки
+и значения затронутых ключей до и после. Копий файла нет — память растёт
+с числом правок, а не с размером файла × глубина истории.
+
+Частые переключения одних и тех же ключей (клики по чекбоксу подряд) сливаются
+в одну запись; если в итоге всё вернулось как было, запись исчезает.
+Позиции строк действительны, пока файл меняется только через журналируемые
+правки, поэтому перечитывание файла с диска журнал очищает."""
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_DEPTH = 200
+# правки тех же ключей чаще, чем раз в столько секунд, сливаются в одну запись
+MERGE_WINDOW = 1.0
+
+
+class FileDelta:
+    """Правка одного файла. values: ключ -> (было, стало); None — ключа нет."""
+
+    __slots__ = ("count_before", "lines", "added", "values")
+
+    def __init__(self, count_before: int, lines: Dict[int, Tuple[str, str]], added: List[str],
+                 values: Dict[str, Tuple[Optional[str], Optional[str]]]):
+        self.count_before = count_before
+        self.lines = lines          # номер (< count_before) -> (старая строка, новая строка)
+        self.added = added          # строки, дописанные после count_before
+        self.values = values
+
+    @property
+    def count_after(self) -> int:
+        return self.count_before + len(self.added)
+
+    def merge(self, later: "FileDelta") -> bool:
+        # поглотить следующую правку того же файла; False — слить нельзя
+        if later.count_before != self.count_after or later.added:
+            return False
+        for pos, (old, new) in later.lines.items():
+            if pos < self.count_before:
+                self.lines[pos] = (self.lines.get(pos, (old,))[0], new)
+            else:
+                self.added[pos - self.count_before] = new
+        for key, (old, new) in later.values.items():
+            self.values[key] = (self.values.get(key, (old,))[0], new)
+        return True
+
+    def is_noop(self) -> bool:
+        # циклы, а не all(генератор): вызывается на каждой слитой правке
+        if self.added:
+            return False
+        for old, new in self.lines.values():
+            if old != new:
+                return False
+        for old, new in self.values.values():
+            if old != new:
+                return False
+        return True
+
+
+class JournalEntry:
+    __slots__ = ("files", "time")
+
+    def __init__(self, files: Dict[str, FileDelta], when: float):
+        self.files = files
+        self.time = when
+
+    def keys(self) -> List[Tuple[str, str]]:
+        return [(ftype, key) for ftype, delta in self.files.items() for key in delta.values]
+
+    @property
+    def label(self) -> str:
+        keys = self.keys()
+        return keys[0][1] if len(keys) == 1 else f"{len(keys)} настроек"
+
+
+class Journal:
+    """Ограниченные стеки отмены и повтора."""
+
+    def __init__(self, depth: int = DEFAULT_DEPTH, merge_window: float = MERGE_WINDOW):
+        self.merge_window = merge_window
+        self._undo: deque = deque(maxlen=depth)
+        self._redo: List[JournalEntry] = []
+
+    def record(self, files: Dict[str, FileDelta], when: Optional[float] = None):
+        when = time.monotonic() if when is None else when
+        self._redo.clear()
+        last = self._undo[-1] if self._undo else None
+        if last is not None and when - last.time <= self.merge_window and self._mergeable(last, files):
+            for ftype, delta in files.items():
+                last.files[ftype].merge(delta)
+            last.time = when
+            for delta in last.files.values():
+                if not delta.is_noop():
+                    return
+            self._undo.pop()
+            return
+        for delta in files.values():
+            if not delta.is_noop():
+                break
+        else:
+            # транзакция вернула ключи к прежним значениям — отменять нечего
+            return
+        self._undo.append(JournalEntry(files, when))
+
+    @staticmethod
+    def _mergeable(last: JournalEntry, files: Dict[str, FileDelta]) -> bool:
+        if last.files.keys() != files.keys():
+            return False
+        for ftype, delta in files.items():
+            previous = last.files[ftype]
+            if previous.values.keys() != delta.values.keys() or delta.added \
+                    or delta.count_before != previous.count_after:
+                return False
+        return True
+
+    def pop_undo(self) -> Optional[JournalEntry]:
+        if not self._undo:
+            return None
+        entry = self._undo.pop()
+        self._redo.append(entry)
+        return entry
+
+    def pop_redo(self) -> Optional[JournalEntry]:
+        if not self._redo:
+            return None
+        entry = self._redo.pop()
+        # повтор после слияния не должен приклеиться к записи, которую отменяли
+        entry.time = float("-inf")
+        self._undo.append(entry)
+        return entry
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo_label(self) -> Optional[str]:
+        return self._undo[-1].label if self._undo else None
+
+    def redo_label(self) -> Optional[str]:
+        return self._redo[-1].label if self._redo else None
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+
+    def __len__(self) -> int:
+        return len(self._undo)
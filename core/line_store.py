@@ -0,0 +1,143 @@
+# core/line_store.py
+"""Строки cfg-файла без списка Python-строк.
+
+Исходные байты файла лежат одним буфером, начала строк — в array('q');
+изменённые строки — в словаре поверх буфера, дописанные — в отдельном хвосте.
+Строка декодируется только при обращении к ней (прямо из memoryview, без
+промежуточной копии), а при сохранении неизменённые участки пишутся из
+исходного буфера как есть — файл заново не собирается."""
+from array import array
+from itertools import accumulate, repeat
+from operator import add
+from typing import Dict, Iterator, List, Optional
+
+
+def line_offsets(raw: bytes) -> array:
+    """Смещения начал строк и конец последней: строка i — raw[off[i]:off[i + 1]]."""
+    # длины строк +1 за \n, накопленной суммой — без цикла на Python
+    parts = raw.split(b"\n")
+    offsets = array("q", accumulate(map(add, map(len, parts), repeat(1)), initial=0))
+    offsets.pop()
+    if parts[-1]:
+        # последняя строка без \n на конце
+        offsets.append(len(raw))
+    return offsets
+
+
+def _decode(chunk) -> str:
+    line = str(chunk, "utf-8", "ignore")
+    if line.endswith("\r\n"):
+        line = line[:-2] + "\n"
+    return line
+
+
+class LineStore:
+    """Список строк файла (с \\n на конце, как у readlines) поверх буфера байтов.
+    Поддерживает то, что нужно ConfigManager: len, [i], [i] = ..., append,
+    del [n:], итерацию и потоковую запись."""
+
+    __slots__ = ("_raw", "_view", "_offsets", "_base", "_overlay", "_tail")
+
+    def __init__(self, raw: bytes = b"", offsets: Optional[array] = None):
+        self._raw = raw
+        self._view = memoryview(raw)
+        self._offsets = offsets if offsets is not None else line_offsets(raw)
+        self._base = len(self._offsets) - 1          # строк в буфере
+        self._overlay: Dict[int, str] = {}           # номер -> изменённая строка (только < _base)
+        self._tail: List[str] = []                   # строки, дописанные после буфера
+
+    @property
+    def offsets(self) -> array:
+        return self._offsets
+
+    def __len__(self) -> int:
+        return self._base + len(self._tail)
+
+    def _index(self, i: int) -> int:
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("line index out of range")
+        return i
+
+    def __getitem__(self, i: int) -> str:
+        i = self._index(i)
+        if i >= self._base:
+            return self._tail[i - self._base]
+        line = self._overlay.get(i)
+        if line is not None:
+            return line
+        return _decode(self._view[self._offsets[i]:self._offsets[i + 1]])
+
+    def __setitem__(self, i: int, line: str):
+        i = self._index(i)
+        if i >= self._base:
+            self._tail[i - self._base] = line
+        else:
+            self._overlay[i] = line
+
+    def __delitem__(self, key):
+        # только усечение хвоста: del store[n:]
+        if not isinstance(key, slice) or key.stop is not None or key.step is not None:
+            raise TypeError("LineStore поддерживает только del store[n:]")
+        count = min(key.start or 0, len(self))
+        if count >= self._base:
+            del self._tail[count - self._base:]
+            return
+        del self._tail[:]
+        self._offsets = self._offsets[:count + 1]
+        self._base = count
+        for pos in [p for p in self._overlay if p >= count]:
+            del self._overlay[pos]
+
+    def append(self, line: str):
+        self._tail.append(line)
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def same_line(self, i: int, other: "LineStore", j: int) -> bool:
+        """Строка i равна строке j другого хранилища. Неизменённые строки
+        сравниваются по байтам, без декодирования."""
+        if i < self._base and j < other._base and i not in self._overlay and j not in other._overlay:
+            # срезы bytes сравниваются memcmp — это быстрее, чем сравнение memoryview
+            return self._raw[self._offsets[i]:self._offsets[i + 1]] == \
+                other._raw[other._offsets[j]:other._offsets[j + 1]]
+        return self[i] == other[j]
+
+    def replace_with(self, other: "LineStore"):
+        """Заменить содержимое содержимым другого хранилища (после перечитывания файла)."""
+        self._raw = other._raw
+        self._view = other._view
+        self._offsets = other._offsets
+        self._base = other._base
+        self._overlay = dict(other._overlay)
+        self._tail = list(other._tail)
+
+    def chunks(self, newline: str = "\n") -> Iterator:
+        """Содержимое файла кусками: неизменённые участки — memoryview исходного
+        буфера (с исходными переводами строк), изменённые и новые строки —
+        закодированные с переводом строки newline."""
+        view, offsets, overlay = self._view, self._offsets, self._overlay
+        start = 0
+        for pos in sorted(overlay):
+            if start < pos:
+                yield view[offsets[start]:offsets[pos]]
+            yield self._encode(overlay[pos], newline)
+            start = pos + 1
+        if start < self._base:
+            yield view[offsets[start]:offsets[self._base]]
+        for line in self._tail:
+            yield self._encode(line, newline)
+
+    @staticmethod
+    def _encode(line: str, newline: str) -> bytes:
+        if newline != "\n":
+            line = line.replace("\n", newline)
+        return line.encode("utf-8")
+
+    def to_bytes(self, newline: str = "\n") -> bytes:
+        return b"".join(self.chunks(newline))
+
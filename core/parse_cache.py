@@ -0,0 +1,66 @@
+# core/parse_cache.py
+import hashlib
+import logging
+import marshal
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from core.config_writer import write_atomic
+
+log = logging.getLogger(__name__)
+
+# Поднимать при любом изменении формата записи — старый кэш просто перестанет совпадать
+FORMAT_VERSION = 4
+
+
+def cache_dir() -> str:
+    """Папка кэша разбора: локальная (не роуминговая) папка пользователя."""
+    override = os.environ.get("PYRUSTSETTINGS_CACHE_DIR")
+    if override:
+        return override
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "PyRustSettings", "cache")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "pyrustsettings")
+
+
+def content_hash(raw: bytes) -> bytes:
+    return hashlib.sha1(raw).digest()
+
+
+def _entry_path(path: str) -> str:
+    name = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir(), name + ".bin")
+
+
+def load(path: str, fingerprint: Tuple[int, int], digest: bytes):
+    """Возвращает (newline, offsets, data, index) из кэша, если запись совпадает
+    с файлом по пути, mtime, размеру и хэшу содержимого; иначе None."""
+    try:
+        with open(_entry_path(path), "rb") as f:
+            entry = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(entry, tuple) or len(entry) != 9 or entry[0] != FORMAT_VERSION:
+        return None
+    _, cached_path, mtime_ns, size, cached_digest, newline, offsets, data, index = entry
+    if cached_path != os.path.abspath(path) or (mtime_ns, size) != tuple(fingerprint) \
+            or cached_digest != digest:
+        return None
+    return newline, offsets, data, index
+
+
+def store(path: str, fingerprint: Tuple[int, int], digest: bytes, newline: Optional[str],
+          offsets: bytes, data: Dict[str, str], index: Dict[str, List[int]]):
+    # offsets — таблица начал строк (LineStore.offsets.tobytes()): сами строки
+    # берутся из файла, который всё равно читается ради хэша
+    entry = (FORMAT_VERSION, os.path.abspath(path), fingerprint[0], fingerprint[1],
+             digest, newline, offsets, data, index)
+    try:
+        os.makedirs(cache_dir(), exist_ok=True)
+        write_atomic(_entry_path(path), marshal.dumps(entry))
+    except (OSError, ValueError) as e:
+        # кэш — только ускорение, без него всё работает
+        log.warning("Не удалось записать кэш для %s: %s", path, e)
@@ -0,0 +1,122 @@
+# core/presets.py
+"""Пресеты: файлы строк "convar значение" (client.cfg) и "bind клавиша команды" (keys.cfg).
+
+Файл разбирается один раз в Preset — словарь {(file_type, ключ): значение};
+повторное чтение того же файла берётся из памяти, пока не изменились mtime/размер.
+Несколько пресетов складываются в один (stack_presets): побеждает пресет
+с большим priority, при равном — тот, что позже в списке. Применяется пресет
+одной транзакцией ConfigManager и только для отличающихся значений."""
+import logging
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.config_diff import preset_diff
+from core.config_reader import bind_entry, bind_key, client_entry, iter_cfg_lines
+
+log = logging.getLogger(__name__)
+
+PRESET_EXTENSIONS = (".txt", ".cfg")
+
+# (file_type, ключ, было (None — ключа нет), станет)
+PresetChange = Tuple[str, str, Optional[str], str]
+
+_compiled: Dict[str, Tuple[Tuple[int, int], "Preset"]] = {}
+
+
+def preset_dir() -> str:
+    """Папка пользовательских пресетов."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "PyRustSettings", "presets")
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, "pyrustsettings", "presets")
+
+
+class Preset:
+    __slots__ = ("name", "values", "source", "priority")
+
+    def __init__(self, name: str, values: Dict[Tuple[str, str], str],
+                 source: Optional[str] = None, priority: int = 0):
+        self.name = name
+        self.values = values
+        self.source = source
+        self.priority = priority
+
+    def diff(self, config) -> List[PresetChange]:
+        """Что изменит пресет в загруженном конфиге; совпадающие значения пропускаются."""
+        return [(e.file_type, e.key, e.old, e.new) for e in preset_diff(config, self)]
+
+    def apply(self, config):
+        """Применяет пресет одной транзакцией. Возвращает транзакцию (updated/appended)."""
+        with config.transaction() as tx:
+            for ftype, key, _, value in self.diff(config):
+                tx.set(key, value, ftype)
+        return tx
+
+    def keys(self) -> List[Tuple[str, str]]:
+        return list(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self):
+        return f"Preset({self.name!r}, {len(self.values)} значений)"
+
+
+def parse_preset(source, name: Optional[str] = None, priority: int = 0) -> Preset:
+    """source — путь, bytes или итерация строк (см. iter_cfg_lines)."""
+    label = name or (os.path.splitext(os.path.basename(source))[0] if isinstance(source, str) else "preset")
+    values: Dict[Tuple[str, str], str] = {}
+    for lineno, (_, tokens, _) in enumerate(iter_cfg_lines(source), 1):
+        if not tokens:
+            continue
+        key = bind_key(tokens)
+        if key is not None:
+            entry = bind_entry(tokens)
+            if entry:
+                values[("keys", key)] = entry[1]
+            else:
+                log.warning("%s:%d: бинд %s без команды пропущен", label, lineno, key)
+            continue
+        entry = client_entry(tokens)
+        if entry:
+            values[("client", entry[0])] = entry[1]
+        else:
+            log.warning("%s:%d: у %s нет значения, строка пропущена", label, lineno, tokens[0])
+    return Preset(label, values, source if isinstance(source, str) else None, priority)
+
+
+def load_preset(path: str, name: Optional[str] = None, priority: int = 0) -> Preset:
+    """Разобранный пресет из файла; повторно файл читается, только если изменился."""
+    st = os.stat(path)
+    fingerprint = (st.st_mtime_ns, st.st_size)
+    key = os.path.abspath(path)
+    cached = _compiled.get(key)
+    if cached is None or cached[0] != fingerprint:
+        cached = (fingerprint, parse_preset(path))
+        _compiled[key] = cached
+    preset = cached[1]
+    return Preset(name or preset.name, preset.values, path, priority)
+
+
+def user_presets() -> List[Preset]:
+    folder = preset_dir()
+    if not os.path.isdir(folder):
+        return []
+    presets = []
+    for filename in sorted(os.listdir(folder)):
+        if filename.lower().endswith(PRESET_EXTENSIONS):
+            try:
+                presets.append(load_preset(os.path.join(folder, filename)))
+            except OSError as e:
+                log.warning("Пресет %s не прочитан: %s", filename, e)
+    return presets
+
+
+def stack_presets(presets: Iterable[Preset], name: str = "stack") -> Preset:
+    """Складывает пресеты: больший priority перекрывает меньший, при равном — более поздний."""
+    values: Dict[Tuple[str, str], str] = {}
+    for preset in sorted(presets, key=lambda p: p.priority):
+        values.update(preset.values)
+    return Preset(name, values)
@@ -0,0 +1,57 @@
+# core/rust_graphics.py
+"""Профили графики (FPS-пресеты) и их переключение.
+
+Встроенный профиль — core/graphics.txt, пользовательские — файлы из preset_dir().
+ProfileSwitcher запоминает, какие значения были до профиля: при переключении
+на другой профиль ключи, которых в нём нет, возвращаются к прежним значениям.
+Всё переключение — одна транзакция ConfigManager."""
+import os
+from typing import Dict, List, Optional, Tuple
+
+from core.presets import Preset, load_preset, user_presets
+from core.utils import resource_path
+
+GRAPHICS_PRESET_PATH = os.path.join("core", "graphics.txt")
+BUILTIN_PROFILES = (("Максимум FPS", GRAPHICS_PRESET_PATH),)
+
+
+def available_profiles() -> List[Preset]:
+    profiles = []
+    for name, path in BUILTIN_PROFILES:
+        path = resource_path(path)
+        if os.path.exists(path):
+            profiles.append(load_preset(path, name))
+    return profiles + user_presets()
+
+
+class ProfileSwitcher:
+    def __init__(self, config):
+        self.config = config
+        self.active: Optional[str] = None
+        # (file_type, ключ) -> значение до включения профиля (None — ключа не было)
+        self._restore: Dict[Tuple[str, str], Optional[str]] = {}
+
+    def _current(self, ftype: str, key: str) -> Optional[str]:
+        return self.config.get_value(key, ftype) if self.config.has_value(key, ftype) else None
+
+    def switch(self, profile: Optional[Preset]):
+        """Включает профиль (None — вернуть значения до профиля).
+        Возвращает транзакцию с изменёнными ключами."""
+        target = profile.values if profile is not None else {}
+        values: Dict[Tuple[str, str], str] = {}
+        restore: Dict[Tuple[str, str], Optional[str]] = {}
+        for fkey, old in self._restore.items():
+            if fkey in target:
+                restore[fkey] = old
+            elif old is not None:
+                # строку, которой до профиля не было, удалять не пытаемся — оставляем как есть
+                values[fkey] = old
+        for fkey, value in target.items():
+            if fkey not in restore:
+                restore[fkey] = self._current(*fkey)
+            values[fkey] = value
+
+        tx = Preset(profile.name if profile else "restore", values).apply(self.config)
+        self._restore = restore if profile is not None else {}
+        self.active = profile.name if profile is not None else None
+        return tx
@@ -0,0 +1,237 @@
+# core/search.py
+"""Поиск по convar и твикам без перебора на каждое нажатие.
+
+- convar: префиксное дерево по каждой части имени через точку, так что
+  "impost" и "graphics.imp" находят graphics.impostorshadows;
+- твики: обратный индекс слов из названия и описания; слово запроса
+  совпадает по префиксу, а если ничего не нашлось — по близкому написанию.
+
+Индекс правится по месту: слушатель ConfigManager добавляет/убирает ключи,
+update_catalog() — только изменившиеся твики."""
+import bisect
+import difflib
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+_WORD_RE = re.compile(r"\w+")
+_END = ""   # ключ узла дерева с полными именами, заканчивающимися здесь
+
+
+class SearchHit(NamedTuple):
+    kind: str        # "tweak" или "convar"
+    name: str        # название твика или имя convar
+    file_type: str
+    key: str
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+class PrefixTrie:
+    """Префиксное дерево: узел — dict символ -> узел, в _END — множество полных имён."""
+
+    def __init__(self):
+        self.root: Dict[str, dict] = {}
+        self._size = 0
+
+    @staticmethod
+    def _suffixes(name: str) -> List[str]:
+        # "graphics.impostorshadows" -> ["graphics.impostorshadows", "impostorshadows"]
+        lowered = name.lower()
+        parts = lowered.split(".")
+        return [".".join(parts[i:]) for i in range(len(parts))]
+
+    def add(self, name: str):
+        added = False
+        for suffix in self._suffixes(name):
+            node = self.root
+            for ch in suffix:
+                node = node.setdefault(ch, {})
+            names = node.setdefault(_END, set())
+            if name not in names:
+                names.add(name)
+                added = True
+        # повторный add того же имени размер не меняет
+        if added:
+            self._size += 1
+
+    def remove(self, name: str):
+        removed = False
+        for suffix in self._suffixes(name):
+            path = [self.root]
+            node = self.root
+            for ch in suffix:
+                node = node.get(ch)
+                if node is None:
+                    break
+                path.append(node)
+            else:
+                names = node.get(_END)
+                if names and name in names:
+                    names.discard(name)
+                    removed = True
+                    if not names:
+                        del node[_END]
+                # убираем опустевшие узлы снизу вверх
+                for i in range(len(suffix), 0, -1):
+                    if path[i]:
+                        break
+                    del path[i - 1][suffix[i - 1]]
+        # имени могло и не быть (повторное или устаревшее удаление)
+        if removed:
+            self._size -= 1
+
+    def prefix(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        node = self.root
+        for ch in prefix.lower():
+            node = node.get(ch)
+            if node is None:
+                return []
+        found: List[str] = []
+        seen: Set[str] = set()
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for ch, child in node.items():
+                if ch == _END:
+                    for name in child:
+                        if name not in seen:
+                            seen.add(name)
+                            found.append(name)
+                            if limit is not None and len(found) >= limit:
+                                return found
+                else:
+                    stack.append(child)
+        return found
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class SearchIndex:
+    FUZZY_CUTOFF = 0.75
+
+    def __init__(self, catalog=None, config=None):
+        self.convars = PrefixTrie()
+        self._convar_names: Set[str] = set()
+        self._tweaks: Dict[str, object] = {}           # название -> Tweak
+        self._tweak_words: Dict[str, List[str]] = {}   # название -> его слова
+        self._postings: Dict[str, Set[str]] = {}       # слово -> названия твиков
+        self._vocabulary: List[str] = []               # все слова, отсортированы (префиксы через bisect)
+        self.config = None
+        if catalog is not None:
+            self.update_catalog(catalog)
+        if config is not None:
+            self.set_config(config)
+
+    # ---------------- CONVARS ----------------
+    def set_config(self, config):
+        if self.config is not None:
+            self.config.remove_listener(self.on_config_changed)
+        self.config = config
+        new_names = set(config.client_data) if config is not None else set()
+        for name in self._convar_names - new_names:
+            self.convars.remove(name)
+        for name in new_names - self._convar_names:
+            self.convars.add(name)
+        self._convar_names = new_names
+        if config is not None:
+            config.add_listener(self.on_config_changed)
+
+    def on_config_changed(self, file_type: str, keys: List[str]):
+        if file_type != "client":
+            return
+        for key in keys:
+            present = self.config.has_value(key, "client")
+            if present and key not in self._convar_names:
+                self._convar_names.add(key)
+                self.convars.add(key)
+            elif not present and key in self._convar_names:
+                self._convar_names.discard(key)
+                self.convars.remove(key)
+
+    # ---------------- TWEAKS ----------------
+    def update_catalog(self, catalog):
+        """Переиндексирует только добавленные, удалённые и изменённые твики."""
+        new = {tweak.name: tweak for tweak in catalog}
+        for name in list(self._tweaks):
+            tweak = new.get(name)
+            if tweak is None or tweak.to_record() != self._tweaks[name].to_record():
+                self._remove_tweak(name)
+        for name, tweak in new.items():
+            if name not in self._tweaks:
+                self._add_tweak(tweak)
+
+    def _add_tweak(self, tweak):
+        words = set(_words(tweak.name)) | set(_words(tweak.description or "")) | set(_words(tweak.key))
+        self._tweaks[tweak.name] = tweak
+        self._tweak_words[tweak.name] = list(words)
+        for word in words:
+            names = self._postings.get(word)
+            if names is None:
+                self._postings[word] = {tweak.name}
+                bisect.insort(self._vocabulary, word)
+            else:
+                names.add(tweak.name)
+
+    def _remove_tweak(self, name: str):
+        self._tweaks.pop(name, None)
+        for word in self._tweak_words.pop(name, ()):
+            names = self._postings.get(word)
+            if names is None:
+                continue
+            names.discard(name)
+            if not names:
+                del self._postings[word]
+                i = bisect.bisect_left(self._vocabulary, word)
+                if i < len(self._vocabulary) and self._vocabulary[i] == word:
+                    del self._vocabulary[i]
+
+    def _match_word(self, word: str) -> Set[str]:
+        # слова словаря с этим префиксом, а если таких нет — похожие по написанию
+        names: Set[str] = set()
+        i = bisect.bisect_left(self._vocabulary, word)
+        while i < len(self._vocabulary) and self._vocabulary[i].startswith(word):
+            names |= self._postings[self._vocabulary[i]]
+            i += 1
+        if not names and len(word) >= 3:
+            for close in difflib.get_close_matches(word, self._vocabulary, n=5, cutoff=self.FUZZY_CUTOFF):
+                names |= self._postings[close]
+        return names
+
+    def search_tweaks(self, query: str) -> List[str]:
+        words = _words(query)
+        if not words:
+            return []
+        result: Optional[Set[str]] = None
+        for word in words:
+            names = self._match_word(word)
+            result = names if result is None else result & names
+            if not result:
+                return []
+        lowered = query.strip().lower()
+        # сначала твики, в названии которых запрос встречается целиком
+        return sorted(result, key=lambda n: (lowered not in n.lower(), n))
+
+    # ---------------- QUERY ----------------
+    def search_convars(self, query: str, limit: Optional[int] = None) -> List[str]:
+        query = query.strip()
+        if not query or " " in query:
+            return []
+        return sorted(self.convars.prefix(query, limit))
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[SearchHit]:
+        hits = []
+        for name in self.search_tweaks(query):
+            tweak = self._tweaks[name]
+            hits.append(SearchHit("tweak", name, tweak.file, tweak.key))
+        for name in self.search_convars(query, limit):
+            hits.append(SearchHit("convar", name, "client", name))
+        return hits[:limit] if limit is not None else hits
+
+    def convar_count(self) -> int:
+        return len(self._convar_names)
+
+    def tweak_names(self) -> Iterable[str]:
+        return self._tweaks.keys()
@@ -0,0 +1,39 @@
+# core/tweak_state.py
+from typing import Dict, Iterable
+
+from core.tweaks import TweakCatalog
+
+
+class TweakStateEngine:
+    """Состояние (вкл/выкл) твиков для загруженного конфига.
+    evaluate_all() считает всё за один проход, update_keys() — только твики,
+    зависящие от изменившихся ключей (обратный индекс catalog.by_key),
+    и возвращает лишь те, чьё состояние действительно поменялось."""
+
+    def __init__(self, catalog: TweakCatalog, types: Iterable[str] = ("bool",)):
+        self.catalog = catalog
+        self.types = tuple(types)
+        self.states: Dict[str, bool] = {}
+
+    def reset(self):
+        self.states = {}
+
+    def evaluate_all(self, config) -> Dict[str, bool]:
+        states = {}
+        for type_name in self.types:
+            for tweak in self.catalog.of_type(type_name):
+                states[tweak.name] = tweak.is_enabled(config.get_value(tweak.key, tweak.file))
+        self.states = states
+        return dict(states)
+
+    def update_keys(self, config, file_type: str, keys: Iterable[str]) -> Dict[str, bool]:
+        changed = {}
+        for key in keys:
+            for tweak in self.catalog.for_key(file_type, key):
+                if tweak.type not in self.types:
+                    continue
+                enabled = tweak.is_enabled(config.get_value(tweak.key, tweak.file))
+                if self.states.get(tweak.name) != enabled:
+                    self.states[tweak.name] = enabled
+                    changed[tweak.name] = enabled
+        return changed
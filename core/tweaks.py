@@ -0,0 +1,270 @@
+# core/tweaks.py
+"""Каталог твиков: core/tweaks.json, проверенный и нормализованный один раз.
+
+Рядом с JSON лежит скомпилированный tweaks.catalog (marshal). Загрузчик берёт его,
+если хэш JSON совпадает, иначе компилирует JSON заново. Ошибки в каталоге
+ловятся при сборке, а не при клике:
+
+    python -m core.tweaks build     # проверить tweaks.json и записать tweaks.catalog
+    python -m core.tweaks check     # только проверить
+"""
+import hashlib
+import json
+import marshal
+import os
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.diagnostics import timed
+from core.presets import Preset, load_preset
+from core.utils import resource_path
+from core.values import declared_kind, same_value
+
+FORMAT_VERSION = 1
+JSON_PATH = os.path.join("core", "tweaks.json")
+CATALOG_PATH = os.path.join("core", "tweaks.catalog")
+PRESET_PATH = os.path.join("core", "tweaks.txt")
+
+KNOWN_TYPES = ("bool", "int", "float", "string")
+FILE_TYPES = ("client", "keys")
+
+
+class CatalogError(ValueError):
+    pass
+
+
+def normalize_file_field(raw_file_field) -> Optional[str]:
+    # "client", "client.cfg", "Keys.cfg" -> "client"/"keys"; пусто -> "client"; чужое -> None
+    if not raw_file_field:
+        return "client"
+    f = str(raw_file_field).lower()
+    if f.endswith(".cfg"):
+        f = f[:-4]
+    return f if f in FILE_TYPES else None
+
+
+class Tweak:
+    __slots__ = ("name", "description", "preview", "type", "file", "key",
+                 "true_value", "false_value", "default", "best")
+
+    def __init__(self, name, description, preview, type, file, key,
+                 true_value, false_value, default, best):
+        self.name = name
+        self.description = description
+        self.preview = preview
+        self.type = type
+        self.file = file
+        self.key = key
+        self.true_value = true_value
+        self.false_value = false_value
+        self.default = default
+        self.best = best
+
+    @property
+    def enable_value(self) -> str:
+        # что пишем в cfg при включении твика
+        return self.best if self.best is not None else self.true_value
+
+    @property
+    def disable_value(self) -> str:
+        return self.false_value
+
+    @property
+    def value_kind(self) -> str:
+        # bool / int / float / string — как сравнивать значения ключа (см. core/values.py)
+        return declared_kind(self.type, self.true_value, self.false_value)
+
+    def is_enabled(self, current_value: str) -> bool:
+        cur = (current_value or "").strip()
+        kind = self.value_kind
+        if cur != "":
+            # "1" и "True", "0.10" и "0.1" — одно и то же значение
+            return same_value(cur, self.true_value, kind) or \
+                bool(self.best) and same_value(cur, self.best, kind)
+        # Ключа нет в cfg — игра использует значение по умолчанию
+        return self.default is not None and same_value(self.default, self.true_value, kind)
+
+    def to_record(self) -> tuple:
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def __repr__(self):
+        return f"Tweak({self.name!r}, {self.file}:{self.key})"
+
+
+class TweakCatalog:
+    __slots__ = ("tweaks", "by_key", "by_file", "by_type")
+
+    def __init__(self, tweaks: List[Tweak]):
+        self.tweaks: Dict[str, Tweak] = {}
+        self.by_key: Dict[Tuple[str, str], List[Tweak]] = {}
+        self.by_file: Dict[str, List[Tweak]] = {}
+        self.by_type: Dict[str, List[Tweak]] = {}
+        for tweak in tweaks:
+            self.tweaks[tweak.name] = tweak
+            if tweak.key:
+                self.by_key.setdefault((tweak.file, tweak.key), []).append(tweak)
+            self.by_file.setdefault(tweak.file, []).append(tweak)
+            self.by_type.setdefault(tweak.type, []).append(tweak)
+
+    def get(self, name: str) -> Optional[Tweak]:
+        return self.tweaks.get(name)
+
+    def for_key(self, file_type: str, key: str) -> List[Tweak]:
+        return self.by_key.get((file_type, key), [])
+
+    def of_type(self, type_name: str) -> List[Tweak]:
+        return self.by_type.get(type_name, [])
+
+    def __iter__(self) -> Iterator[Tweak]:
+        return iter(self.tweaks.values())
+
+    def __len__(self) -> int:
+        return len(self.tweaks)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.tweaks
+
+
+# ---------------- COMPILE ----------------
+def _string_field(name: str, data: dict, field: str, default=None, required=False) -> Optional[str]:
+    value = data.get(field, default)
+    if value is None:
+        if required:
+            raise CatalogError(f"{name}: нет поля \"{field}\"")
+        return None
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise CatalogError(f"{name}: поле \"{field}\" должно быть строкой, а не {type(value).__name__}")
+    return str(value).strip()
+
+
+def compile_tweaks(raw) -> List[Tweak]:
+    if not isinstance(raw, dict):
+        raise CatalogError("tweaks.json: ожидается объект {название: описание твика}")
+    tweaks = []
+    for name, data in raw.items():
+        if not isinstance(data, dict):
+            raise CatalogError(f"{name}: описание твика должно быть объектом")
+        tweak_type = _string_field(name, data, "type", "bool")
+        if tweak_type not in KNOWN_TYPES:
+            raise CatalogError(f"{name}: неизвестный тип \"{tweak_type}\" (допустимы: {', '.join(KNOWN_TYPES)})")
+        file_type = normalize_file_field(data.get("file"))
+        if file_type is None:
+            raise CatalogError(f"{name}: поле \"file\" должно быть client или keys, а не \"{data.get('file')}\"")
+        key = _string_field(name, data, "key", required=True)
+        if not key or any(ch.isspace() for ch in key):
+            raise CatalogError(f"{name}: некорректный ключ \"{key}\"")
+
+        true_value = _string_field(name, data, "true_value", "1")
+        false_value = _string_field(name, data, "false_value", "0")
+        if tweak_type == "bool" and true_value == false_value:
+            raise CatalogError(f"{name}: true_value и false_value совпадают (\"{true_value}\")")
+
+        tweaks.append(Tweak(
+            name=name,
+            description=_string_field(name, data, "description", ""),
+            preview=_string_field(name, data, "preview", ""),
+            type=tweak_type,
+            file=file_type,
+            key=key,
+            true_value=true_value,
+            false_value=false_value,
+            default=_string_field(name, data, "default"),
+            best=_string_field(name, data, "best"),
+        ))
+    return tweaks
+
+
+def _source_hash(raw_json: bytes) -> bytes:
+    return hashlib.sha1(raw_json).digest()
+
+
+def build_catalog(json_path: str = JSON_PATH, catalog_path: str = CATALOG_PATH) -> TweakCatalog:
+    with open(json_path, "rb") as f:
+        raw_json = f.read()
+    try:
+        raw = json.loads(raw_json.decode("utf-8"))
+    except ValueError as e:
+        raise CatalogError(f"{json_path}: некорректный JSON: {e}")
+    tweaks = compile_tweaks(raw)
+    records = tuple(t.to_record() for t in tweaks)
+    with open(catalog_path, "wb") as f:
+        marshal.dump((FORMAT_VERSION, _source_hash(raw_json), records), f)
+    return TweakCatalog(tweaks)
+
+
+def _load_compiled(catalog_path: str, digest: bytes) -> Optional[List[Tweak]]:
+    try:
+        with open(catalog_path, "rb") as f:
+            version, source_hash, records = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if version != FORMAT_VERSION or source_hash != digest:
+        return None
+    try:
+        return [Tweak(*record) for record in records]
+    except TypeError:
+        return None
+
+
+@timed("catalog.load")
+def load_catalog(json_path: Optional[str] = None, catalog_path: Optional[str] = None) -> TweakCatalog:
+    """Загружает каталог: скомпилированный, если он свежий, иначе из JSON.
+    Нет tweaks.json — пустой каталог; битый — CatalogError."""
+    json_path = json_path or resource_path(JSON_PATH)
+    catalog_path = catalog_path or resource_path(CATALOG_PATH)
+    try:
+        with open(json_path, "rb") as f:
+            raw_json = f.read()
+    except FileNotFoundError:
+        return TweakCatalog([])
+
+    tweaks = _load_compiled(catalog_path, _source_hash(raw_json))
+    if tweaks is None:
+        try:
+            raw = json.loads(raw_json.decode("utf-8"))
+        except ValueError as e:
+            raise CatalogError(f"{json_path}: некорректный JSON: {e}")
+        tweaks = compile_tweaks(raw)
+    return TweakCatalog(tweaks)
+
+
+# ---------------- PRESETS ----------------
+def best_preset(catalog: TweakCatalog, type_name: str = "bool") -> Preset:
+    """Все твики типа type_name во включённом (лучшем) состоянии."""
+    return Preset("Всё лучшее", {(t.file, t.key): t.enable_value for t in catalog.of_type(type_name)})
+
+
+def load_tweaks_preset(path: Optional[str] = None) -> Preset:
+    """Пресет оптимизации core/tweaks.txt; строки без значения пропускаются с предупреждением в лог."""
+    path = path or resource_path(PRESET_PATH)
+    if not os.path.exists(path):
+        return Preset("Оптимизация", {})
+    return load_preset(path, "Оптимизация")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "build"
+    if command not in ("build", "check"):
+        print("Использование: python -m core.tweaks [build|check]")
+        return 2
+    try:
+        if command == "build":
+            catalog = build_catalog()
+        else:
+            with open(JSON_PATH, "r", encoding="utf-8") as f:
+                catalog = TweakCatalog(compile_tweaks(json.load(f)))
+    except (CatalogError, ValueError) as e:
+        print(f"Ошибка в каталоге твиков: {e}")
+        return 1
+
+    missing = [t.preview for t in catalog
+               if t.preview and not os.path.exists(os.path.join("assets", "graphics", t.preview))]
+    for preview in missing:
+        print(f"Предупреждение: превью {preview} не найдено в assets/graphics")
+    print(f"{len(catalog)} твиков" + (f", записан {CATALOG_PATH}" if command == "build" else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,7 @@ def resource_path(relative_path):
         # PyInstaller создаёт временную папку _MEIPASS при --onefile
         base_path = sys._MEIPASS
     except Exception:
-        # Обычный режим разработки
-        base_path = os.path.abspath(".")
+        # Обычный режим разработки: корень проекта (папка над core/), а не текущая
+        # папка — cli.py и main.py можно запускать откуда угодно
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     return os.path.join(base_path, relative_path)
\ No newline at end of file
@@ -0,0 +1,130 @@
+# core/values.py
+"""Типизированные значения convar поверх строк из cfg.
+
+Тип ключа берётся из каталога твиков (ValueTypes.from_catalog), а для прочих
+ключей — по виду значения: True/False — bool, целое — int, дробное — float,
+*colour/*color — индекс цвета, остальное — string. Разбор строки кэшируется
+(lru_cache по паре (строка, тип)), поэтому сравнения "0.10" == "0.1" и
+"True" == "1" стоят как поиск в словаре и не вызывают лишних перезаписей."""
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+KINDS = ("bool", "int", "float", "colour", "string")
+
+_TRUE = frozenset(("true", "yes", "on"))
+_FALSE = frozenset(("false", "no", "off"))
+_INVALID = object()
+
+
+@lru_cache(maxsize=8192)
+def parse_number(raw: str):
+    """float из строки cfg или None."""
+    try:
+        value = float(raw)
+    except ValueError:
+        return None
+    return value if value == value else None   # NaN значением не считаем
+
+
+def is_number(raw: str) -> bool:
+    return parse_number(raw.strip()) is not None
+
+
+@lru_cache(maxsize=8192)
+def infer_kind(raw: str, key: str = "") -> str:
+    # тип по виду значения (и имени ключа — для индексов цвета)
+    v = raw.strip()
+    lowered = v.lower()
+    if lowered in _TRUE or lowered in _FALSE:
+        return "bool"
+    number = parse_number(v)
+    if number is None:
+        return "string"
+    if key.endswith(("colour", "color")):
+        return "colour"
+    return "int" if number.is_integer() and "." not in v and "e" not in lowered else "float"
+
+
+@lru_cache(maxsize=16384)
+def coerce(raw: str, kind: str):
+    """Типизированное значение строки; _INVALID — строка не подходит под тип."""
+    v = raw.strip()
+    if kind == "string":
+        return v
+    lowered = v.lower()
+    if kind == "bool":
+        if lowered in _TRUE:
+            return True
+        if lowered in _FALSE:
+            return False
+        number = parse_number(v)
+        if number in (0.0, 1.0):
+            return number == 1.0
+        return _INVALID
+    number = parse_number(v)
+    if number is None:
+        if lowered in _TRUE or lowered in _FALSE:
+            return 1.0 if lowered in _TRUE else 0.0
+        return _INVALID
+    return number
+
+
+@lru_cache(maxsize=1024)
+def declared_kind(type_name: str, *samples: Optional[str]) -> str:
+    """Тип значений твика по его типу в каталоге и примерам значений (true/false).
+    bool-твик с числами вроде 1/100 сравнивается как число, со строками — как строка."""
+    if type_name == "string":
+        return "string"
+    samples = [s for s in samples if s]
+    if type_name == "bool" and all(coerce(s, "bool") is not _INVALID for s in samples):
+        return "bool"
+    if all(parse_number(s.strip()) is not None for s in samples):
+        return "int" if type_name == "int" else "float"
+    return "string"
+
+
+def same_value(a: Optional[str], b: Optional[str], kind: str) -> bool:
+    """Равны ли два значения с учётом типа: "0.10" и "0.1", "True" и "1"."""
+    if a is None or b is None:
+        return a is b
+    if a == b:
+        return True
+    ta, tb = coerce(a, kind), coerce(b, kind)
+    if ta is _INVALID or tb is _INVALID:
+        return a.strip() == b.strip()
+    return ta == tb
+
+
+class ValueTypes:
+    """Типы значений по (file_type, ключ): явные — из каталога, остальные — по виду значения."""
+
+    def __init__(self, kinds: Optional[Dict[Tuple[str, str], str]] = None):
+        self.kinds: Dict[Tuple[str, str], str] = dict(kinds or {})
+
+    @classmethod
+    def from_catalog(cls, catalog) -> "ValueTypes":
+        kinds = {}
+        for tweak in catalog:
+            if tweak.key:
+                # у нескольких твиков на одном ключе тип берём от первого
+                kinds.setdefault((tweak.file, tweak.key), tweak.value_kind)
+        return cls(kinds)
+
+    def kind(self, file_type: str, key: str, sample: Optional[str] = None) -> str:
+        kind = self.kinds.get((file_type, key))
+        if kind is not None:
+            return kind
+        if file_type != "client" or sample is None:
+            # бинды — всегда строки команд
+            return "string"
+        return infer_kind(sample, key)
+
+    def same(self, file_type: str, key: str, old: Optional[str], new: Optional[str]) -> bool:
+        if old is None or new is None:
+            return old is new
+        if old == new:
+            return True
+        return same_value(old, new, self.kind(file_type, key, old))
+
+
+DEFAULT_TYPES = ValueTypes()
@@ -0,0 +1,80 @@
+# gui/diagnostics_dialog.py
+import time
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QPlainTextEdit, QPushButton, QCheckBox, QHeaderView
+)
+from PySide6.QtCore import Qt, QTimer
+
+from core import diagnostics
+
+
+class DiagnosticsDialog(QDialog):
+    """Окно диагностики (Ctrl+Shift+D): счётчики времени горячих операций
+    и последние замеры. Пока окно открыто, замеры включены."""
+
+    COLUMNS = ("Операция", "Вызовов", "Среднее, мс", "Максимум, мс", "Последнее, мс")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Диагностика")
+        self.resize(640, 480)
+        self._was_enabled = diagnostics.timing_enabled()
+
+        layout = QVBoxLayout(self)
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        layout.addWidget(self.table, 2)
+
+        self.recent_view = QPlainTextEdit()
+        self.recent_view.setReadOnly(True)
+        layout.addWidget(self.recent_view, 1)
+
+        buttons = QHBoxLayout()
+        self.enabled_box = QCheckBox("Замерять время")
+        self.enabled_box.setChecked(True)
+        self.enabled_box.toggled.connect(diagnostics.enable_timing)
+        buttons.addWidget(self.enabled_box)
+        buttons.addStretch()
+        reset_button = QPushButton("Сбросить")
+        reset_button.clicked.connect(self.reset)
+        buttons.addWidget(reset_button)
+        layout.addLayout(buttons)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(1000)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        diagnostics.enable_timing(self.enabled_box.isChecked())
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        diagnostics.enable_timing(self._was_enabled)
+        super().hideEvent(event)
+
+    def reset(self):
+        diagnostics.reset()
+        self.refresh()
+
+    def refresh(self):
+        stats = sorted(diagnostics.stats().items())
+        self.table.setRowCount(len(stats))
+        for row, (name, (count, avg, mx, last)) in enumerate(stats):
+            cells = (name, str(count), f"{avg:.2f}", f"{mx:.2f}", f"{last:.2f}")
+            for col, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if col:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, col, item)
+
+        lines = [f"{time.strftime('%H:%M:%S', time.localtime(ts))}  {name:<20} {ms:9.2f} мс"
+                 for ts, name, ms in reversed(diagnostics.recent(100))]
+        self.recent_view.setPlainText("\n".join(lines))
@@ -0,0 +1,26 @@
+# gui/diff_dialog.py
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPlainTextEdit, QDialogButtonBox
+
+
+class DiffDialog(QDialog):
+    """Список изменений по ключам (core/config_diff.ConfigDiff) с подтверждением:
+    показывается перед сохранением."""
+
+    def __init__(self, diff, parent=None, title="Что будет записано"):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(640, 420)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(diff.summary().capitalize()))
+
+        self.view = QPlainTextEdit()
+        self.view.setReadOnly(True)
+        self.view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.view.setPlainText("\n".join(diff.format_lines()))
+        layout.addWidget(self.view)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
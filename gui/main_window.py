@@ -1,17 +1,25 @@
 # gui/main_window.py
 from PySide6.QtWidgets import (
     QMainWindow, QTabWidget, QWidget, QVBoxLayout,
-    QPushButton, QFileDialog, QLabel, QHBoxLayout, QFrame,
-    QTextEdit, QCheckBox, QMessageBox
+    QPushButton, QFileDialog, QLabel, QHBoxLayout,
+    QCheckBox, QMessageBox, QLineEdit, QProgressBar, QDialog
 )
-from PySide6.QtMultimedia import QMediaPlayer
-from PySide6.QtMultimediaWidgets import QVideoWidget
-from PySide6.QtCore import Qt, QObject, QEvent, QUrl
-from PySide6.QtGui import QMovie
+from PySide6.QtCore import QObject, QEvent, QFileSystemWatcher, QTimer, Signal, QThreadPool
+from PySide6.QtGui import QKeySequence, QShortcut
+import logging
 import os
-import json
+from core.backups import BackupStore
+from core.config_diff import disk_diff
 from core.config_manager import ConfigManager
-from core.utils import resource_path
+from core.search import SearchIndex
+from core.tweak_state import TweakStateEngine
+from core.tweaks import CatalogError, TweakCatalog, load_catalog
+from core.values import ValueTypes
+from gui.preview_panel import PreviewPanel
+from gui.workers import Worker
+
+log = logging.getLogger(__name__)
+
 
 class HoverFilter(QObject):
     def __init__(self, parent, name):
@@ -21,11 +29,23 @@ class HoverFilter(QObject):
 
     def eventFilter(self, obj, event):
         if event.type() == QEvent.Enter:
-            self.parent.show_tweak_info(self.name)
+            self.parent.schedule_tweak_info(self.name)
+        elif event.type() == QEvent.Leave:
+            self.parent.cancel_tweak_info(self.name)
         return False
 
 
 class MainWindow(QMainWindow):
+    # загружена новая папка cfg (аргумент — ConfigManager)
+    config_loaded = Signal(object)
+    # поиск: (запрос, [SearchHit]); пустой запрос — фильтр снят
+    search_changed = Signal(str, list)
+    # изменения значений из ConfigManager (может прийти из фонового потока)
+    config_changed = Signal(object, str, list)
+
+    # сколько курсор должен задержаться на твике, прежде чем грузить превью
+    HOVER_DELAY_MS = 150
+
     def __init__(self):
         super().__init__()
         self.checkboxes = {}  # убедись, что есть
@@ -33,29 +53,121 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("PyRustSettings")
         self.setGeometry(200, 200, 1000, 600)
 
-        self.tweaks_info = self.load_tweaks_json()
+        self.catalog = self.load_catalog()
+        self.tweak_states = TweakStateEngine(self.catalog)
+        # типы значений ключей из каталога: "1" и "True" для bool-твика — одно значение
+        self.value_types = ValueTypes.from_catalog(self.catalog)
+        # снимки cfg до и после каждого сохранения (python cli.py list-backups / restore)
+        self.backup_store = BackupStore()
+        # индекс поиска: твики — сразу, convar — при загрузке папки (и дальше по изменениям)
+        self.search_index = SearchIndex(self.catalog)
+        self.config_loaded.connect(self.search_index.set_config)
         self.cfg_folder = None
         self.config_manager = None
 
+        # Чтение, разбор и запись cfg — в фоне. Один поток: операции над файлами
+        # идут строго по очереди, а окно не замирает на медленном диске
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        self._workers = []
+        self.config_changed.connect(self._deliver_config_change)
+
+        # Игра переписывает cfg сама — следим за файлами и подхватываем изменения.
+        # Таймер склеивает серию событий от одной записи в одно перечитывание.
+        self.file_watcher = QFileSystemWatcher(self)
+        self.file_watcher.fileChanged.connect(self._on_cfg_file_changed)
+        self.file_watcher.directoryChanged.connect(self._on_cfg_file_changed)
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(300)
+        self.reload_timer.timeout.connect(self.reload_changed_configs)
+
+        # При проведении мышью по списку превью грузится только для твика,
+        # на котором курсор остановился
+        self._pending_tweak = None
+        self._shown_tweak = None
+        self.hover_timer = QTimer(self)
+        self.hover_timer.setSingleShot(True)
+        self.hover_timer.setInterval(self.HOVER_DELAY_MS)
+        self.hover_timer.timeout.connect(self._show_pending_tweak)
+
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
         layout = QHBoxLayout(central_widget)
+        left_layout = QVBoxLayout()
+
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Поиск: convar или твик")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.textChanged.connect(self.apply_search)
+        left_layout.addWidget(self.search_box)
 
+        # Вкладки, кроме первой, строятся при первом открытии
+        self._lazy_tabs = {}
         self.tabs = QTabWidget()
         self.tabs.setTabPosition(QTabWidget.North)
+        self.tabs.currentChanged.connect(self._build_lazy_tab)
         self.tabs.addTab(self.create_home_tab(), "Главное")
-        self.tabs.addTab(self.create_tweaks_tab(), "Твики")
-
-        self.preview_panel = self.create_preview_panel()
-        layout.addWidget(self.tabs, 3)
+        self.add_lazy_tab(self.create_tweaks_tab, "Твики")
+        self.add_lazy_tab(self.create_graphics_tab, "Графика")
+        self.add_lazy_tab(self.create_optimize_tab, "Оптимизация")
+        self.add_lazy_tab(self.create_other_tab, "Все настройки")
+
+        self.preview_panel = PreviewPanel()
+        left_layout.addWidget(self.tabs)
+        layout.addLayout(left_layout, 3)
         layout.addWidget(self.preview_panel, 2)
 
-    def load_tweaks_json(self):
-        json_path = resource_path(os.path.join("core", "tweaks.json"))
-        if os.path.exists(json_path):
-            with open(json_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return {}
+        # Окно диагностики с замерами времени — по горячей клавише
+        self.diagnostics_dialog = None
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.show_diagnostics)
+
+        # Отмена и повтор правок (журнал ConfigManager); в поле поиска работают его собственные
+        QShortcut(QKeySequence("Ctrl+Z"), self, self.undo_edit)
+        QShortcut(QKeySequence("Ctrl+Y"), self, self.redo_edit)
+        QShortcut(QKeySequence("Ctrl+Shift+Z"), self, self.redo_edit)
+
+    def show_diagnostics(self):
+        if self.diagnostics_dialog is None:
+            from gui.diagnostics_dialog import DiagnosticsDialog
+            self.diagnostics_dialog = DiagnosticsDialog(self)
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
+
+    def undo_edit(self):
+        if not self.config_manager:
+            return
+        # чекбоксы и таблица обновятся через слушателей config_changed
+        label = self.config_manager.undo()
+        self.statusBar().showMessage(f"Отменено: {label}" if label else "Нечего отменять", 3000)
+
+    def redo_edit(self):
+        if not self.config_manager:
+            return
+        label = self.config_manager.redo()
+        self.statusBar().showMessage(f"Повторено: {label}" if label else "Нечего повторять", 3000)
+
+    def add_lazy_tab(self, builder, title):
+        container = QWidget()
+        container_layout = QVBoxLayout(container)
+        container_layout.setContentsMargins(0, 0, 0, 0)
+        index = self.tabs.addTab(container, title)
+        self._lazy_tabs[index] = (container, builder)
+        return index
+
+    def _build_lazy_tab(self, index):
+        entry = self._lazy_tabs.pop(index, None)
+        if entry is None:
+            return
+        container, builder = entry
+        container.layout().addWidget(builder())
+
+    def load_catalog(self):
+        try:
+            return load_catalog()
+        except CatalogError as e:
+            QMessageBox.critical(self, "Ошибка", f"Каталог твиков повреждён:\n{e}")
+            return TweakCatalog([])
 
     def create_home_tab(self):
         tab = QWidget()
@@ -73,6 +185,17 @@ class MainWindow(QMainWindow):
         self.save_button.setEnabled(False)
         layout.addWidget(self.save_button)
 
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.hide()
+        progress_layout.addWidget(self.progress_bar)
+        self.cancel_button = QPushButton("Отмена")
+        self.cancel_button.clicked.connect(self.cancel_workers)
+        self.cancel_button.hide()
+        progress_layout.addWidget(self.cancel_button)
+        layout.addLayout(progress_layout)
+
         layout.addStretch()
         return tab
 
@@ -81,191 +204,262 @@ class MainWindow(QMainWindow):
         layout = QVBoxLayout(tab)
         self.checkboxes = {}
 
-        for tweak_name, data in self.tweaks_info.items():
-            if data.get("type") == "bool":
-                cb = QCheckBox(tweak_name)
-                cb.installEventFilter(HoverFilter(self, tweak_name))
-                cb.clicked.connect(
-                    lambda checked, t=tweak_name: self.on_tweak_changed(t, checked)
-                )
-                layout.addWidget(cb)
-                self.checkboxes[tweak_name] = cb
+        self.apply_best_button = QPushButton("Включить всё лучшее")
+        self.apply_best_button.clicked.connect(self.apply_all_best)
+        layout.addWidget(self.apply_best_button)
+
+        for tweak in self.catalog.of_type("bool"):
+            cb = QCheckBox(tweak.name)
+            cb.installEventFilter(HoverFilter(self, tweak.name))
+            cb.clicked.connect(
+                lambda checked, t=tweak.name: self.on_tweak_changed(t, checked)
+            )
+            layout.addWidget(cb)
+            self.checkboxes[tweak.name] = cb
 
         layout.addStretch()
+        self.apply_tweak_states(self.tweak_states.states)
+        if self.search_box.text().strip():
+            self.apply_search(self.search_box.text())
         return tab
 
-    def create_preview_panel(self):
-        frame = QFrame()
-        frame.setFrameShape(QFrame.StyledPanel)
-        layout = QVBoxLayout(frame)
-
-        self.media_container = QWidget()
-        self.media_layout = QVBoxLayout(self.media_container)
-        self.media_layout.setContentsMargins(0, 0, 0, 0)
-
-        self.preview_gif_label = QLabel()
-        self.preview_gif_label.setAlignment(Qt.AlignCenter)
-        self.preview_gif_label.setFixedSize(300, 300)
-        self.preview_gif_label.hide()
-
-        self.video_widget = QVideoWidget()
-        self.video_widget.setFixedSize(360, 220)
-        self.video_widget.hide()
-
-        self.media_layout.addWidget(self.preview_gif_label)
-        self.media_layout.addWidget(self.video_widget)
-
-        self.preview_text = QTextEdit()
-        self.preview_text.setReadOnly(True)
-        self.preview_text.setPlaceholderText("Описание выбранной настройки")
-
-        layout.addWidget(self.media_container)
-        layout.addWidget(self.preview_text)
-
-        self.media_player = QMediaPlayer()
-        self.media_player.setVideoOutput(self.video_widget)
+    def create_graphics_tab(self):
+        from gui.tabs.graphics_tab import GraphicsTab
+        return GraphicsTab(self)
+
+    def create_optimize_tab(self):
+        from gui.tabs.optimize_tab import OptimizeTab
+        return OptimizeTab(self)
+
+    def create_other_tab(self):
+        from gui.tabs.other_tab import OtherTab
+        return OtherTab(self)
+
+    # сколько convar показывать в результатах поиска
+    SEARCH_LIMIT = 1000
+
+    def apply_search(self, text):
+        query = text.strip()
+        hits = self.search_index.search(query, self.SEARCH_LIMIT) if query else []
+        tweak_names = {hit.name for hit in hits if hit.kind == "tweak"}
+        for name, cb in self.checkboxes.items():
+            cb.setVisible(not query or name in tweak_names)
+        self.search_changed.emit(query, hits)
+
+    def set_hover_delay(self, ms):
+        self.hover_timer.setInterval(ms)
+
+    def schedule_tweak_info(self, tweak_name):
+        self._pending_tweak = tweak_name
+        self.hover_timer.start()
+
+    def cancel_tweak_info(self, tweak_name):
+        if self._pending_tweak == tweak_name:
+            self._pending_tweak = None
+            self.hover_timer.stop()
+
+    def _show_pending_tweak(self):
+        tweak_name, self._pending_tweak = self._pending_tweak, None
+        # тот же твик уже показан — не перезапускаем воспроизведение
+        if tweak_name is None or tweak_name == self._shown_tweak:
+            return
+        self.show_tweak_info(tweak_name)
 
-        return frame
+    # сколько соседних твиков в списке подгружать заранее
+    PREFETCH_NEIGHBOURS = 2
 
     def show_tweak_info(self, tweak_name):
-        tweak_data = self.tweaks_info.get(tweak_name, {})
-        description = tweak_data.get("description", "Описание отсутствует.")
-        media_file = tweak_data.get("preview", "")
-
-        self.preview_text.setPlainText(description)
-
-        if hasattr(self, '_current_movie') and self._current_movie:
-            self._current_movie.stop()
-            self._current_movie = None
-
-        self.media_player.stop()
-        self.preview_gif_label.hide()
-        self.video_widget.hide()
-
-        if not media_file:
-            self.preview_gif_label.setText("Превью недоступно")
-            self.preview_gif_label.show()
-            return
-
-        media_path = resource_path(os.path.join("assets", "graphics", media_file))
-        if not os.path.exists(media_path):
-            self.preview_gif_label.setText(f"[Файл не найден:\n{media_path}]")
-            self.preview_gif_label.show()
+        tweak = self.catalog.get(tweak_name)
+        if tweak is None:
             return
-
-        ext = os.path.splitext(media_file)[1].lower()
-
-        if ext in ('.gif', '.apng'):
-            movie = QMovie(media_path)
-
-            def on_first_frame():
-                rect = movie.frameRect()
-                if rect.isValid() and not rect.isEmpty():
-                    size = rect.size()
-                    max_size = 300
-                    if size.width() > max_size or size.height() > max_size:
-                        size.scale(max_size, max_size, Qt.KeepAspectRatio)
-                    self.preview_gif_label.setFixedSize(size)
-                movie.frameChanged.disconnect(on_first_frame)
-
-            movie.frameChanged.connect(on_first_frame)
-            self.preview_gif_label.setMovie(movie)
-            self.preview_gif_label.show()
-            movie.start()
-            self._current_movie = movie
-
-        elif ext in ('.mp4', '.webm', '.avi', '.mov'):
-            url = QUrl.fromLocalFile(os.path.abspath(media_path))
-            self.media_player.setSource(url)
-            self.media_player.setLoops(QMediaPlayer.Loops.Infinite)
-            self.video_widget.show()
-            self.media_player.play()
-
-        else:
-            self.preview_gif_label.setText("Неподдерживаемый формат")
-            self.preview_gif_label.show()
-
-    def _normalize_file_field(self, raw_file_field):
-        if not raw_file_field:
-            return "client"
-        f = raw_file_field.lower()
-        if f.endswith(".cfg"):
-            f = f[:-4]
-        if f not in ("client", "keys"):
-            return "client"
-        return f
-
+        description = tweak.description or "Описание отсутствует."
+        self.preview_panel.show_preview(description, tweak.preview)
+        self._shown_tweak = tweak_name
+
+        names = list(self.checkboxes)
+        if tweak_name in names:
+            i = names.index(tweak_name)
+            n = self.PREFETCH_NEIGHBOURS
+            neighbours = names[max(0, i - n):i] + names[i + 1:i + 1 + n]
+            self.preview_panel.prefetch(self.catalog.get(name).preview for name in neighbours)
+
+    # ---------------- BACKGROUND WORK ----------------
+    def start_worker(self, fn, *args, quiet=False):
+        """Запускает fn(report, *args) в фоне. quiet — без полосы прогресса
+        и без блокировки кнопок (перечитывание по событию от файловой системы)."""
+        worker = Worker(fn, *args)
+        self._workers.append(worker)
+        done = lambda *_: self._worker_done(worker)
+        worker.signals.finished.connect(done)
+        worker.signals.failed.connect(done)
+        worker.signals.cancelled.connect(done)
+        if not quiet:
+            worker.signals.progress.connect(self._on_worker_progress)
+            self.progress_bar.setValue(0)
+            self.progress_bar.show()
+            self.cancel_button.show()
+            self.load_button.setEnabled(False)
+            self.save_button.setEnabled(False)
+        # запуск — на следующем проходе цикла событий: вызывающий код успеет
+        # подключиться к сигналам, даже если fn завершится мгновенно
+        QTimer.singleShot(0, lambda: self.thread_pool.start(worker))
+        return worker
+
+    def _on_worker_progress(self, percent, text):
+        self.progress_bar.setValue(percent)
+        self.progress_bar.setFormat(f"{text} %p%" if text else "%p%")
+
+    def _worker_done(self, worker):
+        if worker in self._workers:
+            self._workers.remove(worker)
+        if not self._workers:
+            self.progress_bar.hide()
+            self.cancel_button.hide()
+            self.load_button.setEnabled(True)
+            self.save_button.setEnabled(self.config_manager is not None)
+
+    def cancel_workers(self):
+        for worker in self._workers:
+            worker.cancel()
+
+    def closeEvent(self, event):
+        # запись атомарная, но дождёмся её, чтобы не оставлять временные файлы
+        self.cancel_workers()
+        self.thread_pool.waitForDone(5000)
+        self.preview_panel.shutdown()
+        super().closeEvent(event)
+
+    def _deliver_config_change(self, manager, file_type, keys):
+        # уже в GUI-потоке; уведомления от сменённого менеджера не нужны
+        if manager is self.config_manager:
+            manager.notify_listeners(file_type, keys)
+
+    # ---------------- LOAD/SAVE ----------------
     def load_cfg_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Выберите папку Rust")
-        if folder:
-            cfg_path = os.path.join(folder, "cfg")
-            if os.path.exists(cfg_path):
-                self.cfg_folder = cfg_path
-                self.path_label.setText(f"Найдена папка cfg: {cfg_path}")
-                self.config_manager = ConfigManager(cfg_path)
-                self.sync_checkboxes_with_config()
-                self.save_button.setEnabled(True)
-            else:
-                self.path_label.setText("В папке Rust не найдено cfg")
-        else:
-            print("Папка не выбрана")
-
-    def sync_checkboxes_with_config(self):
-        for tweak_name, cb in self.checkboxes.items():
-            tweak_data = self.tweaks_info.get(tweak_name, {})
-            if tweak_data.get("type") != "bool":
-                continue
-
-            key = tweak_data.get("key")
-            file_field = self._normalize_file_field(tweak_data.get("file"))
-            current_value = self.config_manager.get_value(key, file_field)
+        if not folder:
+            log.info("Папка не выбрана")
+            return
+        cfg_path = os.path.join(folder, "cfg")
+        if not os.path.exists(cfg_path):
+            self.path_label.setText("В папке Rust не найдено cfg")
+            return
 
-            true_val = tweak_data.get("true_value", "1")
-            best_val = tweak_data.get("best")
-            default_val = tweak_data.get("default")
+        self.path_label.setText(f"Читаю {cfg_path}...")
+        value_types, backups = self.value_types, self.backup_store
+        worker = self.start_worker(
+            lambda report: ConfigManager(cfg_path, progress=report, value_types=value_types, backups=backups))
+        worker.signals.finished.connect(lambda manager: self._on_config_loaded(cfg_path, manager))
+        worker.signals.cancelled.connect(lambda: self.path_label.setText("Загрузка отменена"))
+        worker.signals.failed.connect(lambda e: self.path_label.setText(f"Ошибка загрузки: {e}"))
+
+    def _on_config_loaded(self, cfg_path, manager):
+        self.cfg_folder = cfg_path
+        self.path_label.setText(f"Найдена папка cfg: {cfg_path}")
+        if self.config_manager:
+            self.config_manager.remove_listener(self.on_config_values_changed)
+            self.config_manager.set_notifier(None)
+        self.config_manager = manager
+        manager.set_notifier(lambda file_type, keys: self.config_changed.emit(manager, file_type, keys))
+        manager.add_listener(self.on_config_values_changed)
+        self._watch_cfg_folder()
+        self.sync_checkboxes_with_config()
+        self.save_button.setEnabled(True)
+        self.config_loaded.emit(manager)
+
+    def _watch_cfg_folder(self):
+        watched = self.file_watcher.files() + self.file_watcher.directories()
+        if watched:
+            self.file_watcher.removePaths(watched)
+        self.file_watcher.addPath(self.cfg_folder)
+        self._watch_cfg_files()
+
+    def _watch_cfg_files(self):
+        # После атомарной замены файла (rename) наблюдение за ним пропадает — добавляем заново
+        watched = set(self.file_watcher.files())
+        for path in (self.config_manager.client_path, self.config_manager.keys_path):
+            if os.path.exists(path) and path not in watched:
+                self.file_watcher.addPath(path)
+
+    def _on_cfg_file_changed(self, _path):
+        if self.config_manager:
+            self.reload_timer.start()
+
+    def reload_changed_configs(self):
+        if not self.config_manager:
+            return
+        # изменённые ключи придут в on_config_values_changed (через config_changed, в GUI-потоке)
+        manager = self.config_manager
+        worker = self.start_worker(lambda report: manager.reload_if_changed(), quiet=True)
+        worker.signals.finished.connect(lambda _: self._watch_cfg_files())
 
-            # compare raw strings, but normalize whitespace/case a bit
-            cur = (current_value or "").strip()
-            tv = (true_val or "").strip()
-            bv = (best_val or "").strip()
+    def on_config_values_changed(self, file_type, keys):
+        # пересчитываются только твики, зависящие от этих ключей
+        changed = self.tweak_states.update_keys(self.config_manager, file_type, keys)
+        self.apply_tweak_states(changed)
 
-            is_enabled = False
-            if cur != "":
-                if cur == tv or (bv and cur == bv):
-                    is_enabled = True
-            else:
-                # If not present, fallback to default
-                if default_val is not None and str(default_val).strip() == tv:
-                    is_enabled = True
+    def sync_checkboxes_with_config(self):
+        if not self.config_manager:
+            return
+        self.apply_tweak_states(self.tweak_states.evaluate_all(self.config_manager))
 
+    def apply_tweak_states(self, states):
+        for tweak_name, enabled in states.items():
+            cb = self.checkboxes.get(tweak_name)
+            if cb is None or cb.isChecked() == enabled:
+                continue
             cb.blockSignals(True)
-            cb.setChecked(is_enabled)
+            cb.setChecked(enabled)
             cb.blockSignals(False)
 
     def on_tweak_changed(self, tweak_name: str, checked: bool):
         if not self.config_manager:
             return
 
-        tweak_data = self.tweaks_info.get(tweak_name)
-        if not tweak_data or tweak_data.get("type") != "bool":
+        tweak = self.catalog.get(tweak_name)
+        if tweak is None or tweak.type != "bool":
             return
 
-        key = tweak_data["key"]
-        file_field = self._normalize_file_field(tweak_data.get("file"))
+        new_value = tweak.enable_value if checked else tweak.disable_value
+        self.config_manager.set_values({tweak.key: new_value}, tweak.file)
 
-        if checked:
-            new_value = tweak_data.get("best", tweak_data.get("true_value", "1"))
-        else:
-            new_value = tweak_data.get("false_value", "0")
+    def apply_all_best(self):
+        if not self.config_manager:
+            return
 
-        self.config_manager.set_value(key, new_value, file_field)
+        # Все твики — одной транзакцией: либо применились все, либо ни один
+        with self.config_manager.transaction() as tx:
+            for tweak in self.catalog.of_type("bool"):
+                tx.set(tweak.key, tweak.enable_value, tweak.file)
+        # чекбоксы обновит on_config_values_changed после commit
 
     def save_configs(self):
         if not self.config_manager:
             return
-        try:
-            self.config_manager.save()
-            # не перечитываем файл, оставляем данные в памяти
-            QMessageBox.information(self, "Успех", "Конфигурация успешно сохранена!")
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить:\n{str(e)}")
+        # сначала показываем, что именно изменится в файлах (они читаются в фоне)
+        manager = self.config_manager
+        worker = self.start_worker(lambda report: disk_diff(manager))
+        worker.signals.finished.connect(lambda diff: self._confirm_save(manager, diff))
+        worker.signals.failed.connect(
+            lambda e: QMessageBox.critical(self, "Ошибка", f"Не удалось сравнить с файлами:\n{e}"))
+
+    def _confirm_save(self, manager, diff):
+        if manager is not self.config_manager:
+            return
+        if diff:
+            from gui.diff_dialog import DiffDialog
+            if DiffDialog(diff, self).exec() != QDialog.Accepted:
+                self.path_label.setText("Сохранение отменено")
+                return
+        worker = self.start_worker(manager.save)
+        worker.signals.finished.connect(self._on_config_saved)
+        worker.signals.failed.connect(
+            lambda e: QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить:\n{e}"))
+        worker.signals.cancelled.connect(lambda: self.path_label.setText("Сохранение отменено"))
+
+    def _on_config_saved(self, ok):
+        if not ok:
+            QMessageBox.critical(self, "Ошибка", "Не удалось сохранить:\nчасть файлов не записана, подробности в логе")
+            return
+        # не перечитываем файл, оставляем данные в памяти
+        QMessageBox.information(self, "Успех", "Конфигурация успешно сохранена!")
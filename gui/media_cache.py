@@ -0,0 +1,106 @@
+# gui/media_cache.py
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+
+DEFAULT_BUDGET_BYTES = 32 * 1024 * 1024
+
+
+class MediaCache:
+    """LRU-кэш содержимого превью (байты файла) с лимитом памяти.
+    prefetch() подгружает файлы в фоновом потоке, get() отдаёт из кэша,
+    дожидается уже начатой подгрузки или читает сам.
+    loader(name) -> bytes | None (None — файла нет)."""
+
+    def __init__(self, loader: Callable[[str], Optional[bytes]],
+                 budget_bytes: int = DEFAULT_BUDGET_BYTES, workers: int = 1):
+        self._loader = loader
+        self.budget_bytes = budget_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._missing = set()
+        self._pending: Dict[str, Future] = {}
+        # растёт при clear(): подгрузки, начатые раньше, в кэш уже не кладутся
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="preview-prefetch")
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._entries
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(name)
+            if data is not None:
+                self._entries.move_to_end(name)
+                return data
+            if name in self._missing:
+                return None
+            future = self._pending.get(name)
+            generation = self._generation
+        if future is not None:
+            try:
+                return future.result()
+            except CancelledError:
+                pass
+        return self._load(name, generation)
+
+    def prefetch(self, names: Iterable[str]):
+        with self._lock:
+            for name in names:
+                if not name or name in self._entries or name in self._pending or name in self._missing:
+                    continue
+                self._pending[name] = self._executor.submit(self._load, name, self._generation)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._missing.clear()
+            self._size = 0
+            self._forget_pending()
+
+    def shutdown(self):
+        # не начатые подгрузки отменяются, текущую дожидаемся — чтобы поток
+        # не читал файл во время завершения интерпретатора
+        with self._lock:
+            self._forget_pending()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _forget_pending(self):
+        # вызывается под self._lock
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._generation += 1
+
+    def _load(self, name: str, generation: int) -> Optional[bytes]:
+        try:
+            data = self._loader(name)
+        except OSError:
+            data = None
+        with self._lock:
+            if generation != self._generation:
+                # кэш очищен, пока файл читался
+                return data
+            self._pending.pop(name, None)
+            if data is None:
+                self._missing.add(name)
+            else:
+                self._put(name, data)
+        return data
+
+    def _put(self, name: str, data: bytes):
+        # вызывается под self._lock
+        if len(data) > self.budget_bytes or name in self._entries:
+            return
+        self._entries[name] = data
+        self._size += len(data)
+        while self._size > self.budget_bytes:
+            _, old = self._entries.popitem(last=False)
+            self._size -= len(old)
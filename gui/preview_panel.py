@@ -0,0 +1,211 @@
+# gui/preview_panel.py
+import logging
+import os
+
+from PySide6.QtWidgets import QFrame, QWidget, QVBoxLayout, QLabel, QTextEdit
+from PySide6.QtCore import Qt, QUrl, QIODevice
+from PySide6.QtGui import QMovie
+
+from core.asset_pack import DEFAULT_PACK, AssetPack, AssetPackError
+from core.diagnostics import timed
+from core.utils import resource_path
+from gui.media_cache import MediaCache
+
+GIF_EXTENSIONS = ('.gif', '.apng')
+VIDEO_EXTENSIONS = ('.mp4', '.webm', '.avi', '.mov')
+
+log = logging.getLogger(__name__)
+
+
+class MemoryDevice(QIODevice):
+    """Только-для-чтения QIODevice поверх bytes/memoryview: QMovie и QMediaPlayer
+    читают превью прямо из памяти (в том числе из mmap пакета), без копии целиком."""
+
+    def __init__(self, data, parent=None):
+        super().__init__(parent)
+        self._data = memoryview(data)
+
+    def isSequential(self):
+        return False
+
+    def size(self):
+        return len(self._data)
+
+    def bytesAvailable(self):
+        return len(self._data) - self.pos() + super().bytesAvailable()
+
+    def readData(self, maxlen):
+        pos = self.pos()
+        return self._data[pos:pos + maxlen].tobytes()
+
+    def writeData(self, data):
+        return -1
+
+
+class PreviewPanel(QFrame):
+    """Правая панель: описание настройки и GIF/видео-превью.
+    QtMultimedia подгружается только при первом показе видео — это самая
+    тяжёлая часть старта, а до выбора папки с cfg она не нужна."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFrameShape(QFrame.StyledPanel)
+        layout = QVBoxLayout(self)
+
+        self.media_container = QWidget()
+        self.media_layout = QVBoxLayout(self.media_container)
+        self.media_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.preview_gif_label = QLabel()
+        self.preview_gif_label.setAlignment(Qt.AlignCenter)
+        self.preview_gif_label.setFixedSize(300, 300)
+        self.preview_gif_label.hide()
+        self.media_layout.addWidget(self.preview_gif_label)
+
+        # создаются в _ensure_video()
+        self.video_widget = None
+        self.media_player = None
+        # причина, по которой видео не поднялось (нет бэкенда, библиотек) — второй раз не пробуем
+        self._video_error = None
+        self._current_movie = None
+        self._current_buffer = None
+
+        # Превью берутся из пакета assets/graphics.pack (mmap), а без него — из
+        # отдельных файлов: читаются с диска один раз, соседние — заранее в фоне
+        self.asset_pack = self._open_asset_pack()
+        self.media_cache = MediaCache(self._read_media_file)
+
+        self.preview_text = QTextEdit()
+        self.preview_text.setReadOnly(True)
+        self.preview_text.setPlaceholderText("Описание выбранной настройки")
+
+        layout.addWidget(self.media_container)
+        layout.addWidget(self.preview_text)
+
+    def _ensure_video(self) -> bool:
+        # False — видео недоступно; вызывается из слота, поэтому ошибки не выпускаем
+        if self.media_player is not None:
+            return True
+        if self._video_error is not None:
+            return False
+        try:
+            from PySide6.QtMultimedia import QMediaPlayer
+            from PySide6.QtMultimediaWidgets import QVideoWidget
+
+            video_widget = QVideoWidget()
+            video_widget.setFixedSize(360, 220)
+            video_widget.hide()
+            media_player = QMediaPlayer(self)
+            media_player.setVideoOutput(video_widget)
+        except Exception as e:
+            log.warning("QtMultimedia не загружен, видео-превью отключены: %s", e)
+            self._video_error = e
+            return False
+
+        self.media_layout.addWidget(video_widget)
+        self.video_widget = video_widget
+        self.media_player = media_player
+        self._loops_infinite = QMediaPlayer.Loops.Infinite
+        return True
+
+    @staticmethod
+    def _open_asset_pack():
+        pack_path = resource_path(DEFAULT_PACK)
+        if not os.path.exists(pack_path):
+            return None
+        try:
+            return AssetPack(pack_path)
+        except (OSError, AssetPackError) as e:
+            log.warning("Пакет превью не открыт, берём отдельные файлы: %s", e)
+            return None
+
+    @timed("preview.read")
+    def _read_media_file(self, media_file):
+        # выполняется и в фоновом потоке — только чтение байтов, без Qt
+        if self.asset_pack is not None and media_file in self.asset_pack:
+            return self.asset_pack.get(media_file)
+        media_path = resource_path(os.path.join("assets", "graphics", media_file))
+        try:
+            with open(media_path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def prefetch(self, media_files):
+        self.media_cache.prefetch(f for f in media_files if f)
+
+    def stop(self):
+        if self._current_movie:
+            self._current_movie.stop()
+            self._current_movie = None
+        if self.media_player is not None:
+            self.media_player.stop()
+            self.video_widget.hide()
+        if self._current_buffer is not None:
+            self._current_buffer.close()
+            self._current_buffer.deleteLater()
+            self._current_buffer = None
+        self.preview_gif_label.hide()
+
+    def shutdown(self):
+        # при закрытии окна: остановить воспроизведение и фоновую подгрузку превью
+        self.stop()
+        self.media_cache.shutdown()
+
+    def _open_buffer(self, data):
+        buffer = MemoryDevice(data, self)
+        buffer.open(QIODevice.ReadOnly)
+        self._current_buffer = buffer
+        return buffer
+
+    def show_message(self, text):
+        self.preview_gif_label.setText(text)
+        self.preview_gif_label.show()
+
+    @timed("preview.show")
+    def show_preview(self, description, media_file):
+        self.preview_text.setPlainText(description)
+        self.stop()
+
+        if not media_file:
+            self.show_message("Превью недоступно")
+            return
+
+        ext = os.path.splitext(media_file)[1].lower()
+        if ext not in GIF_EXTENSIONS and ext not in VIDEO_EXTENSIONS:
+            self.show_message("Неподдерживаемый формат")
+            return
+
+        data = self.media_cache.get(media_file)
+        if data is None:
+            media_path = resource_path(os.path.join("assets", "graphics", media_file))
+            self.show_message(f"[Файл не найден:\n{media_path}]")
+            return
+
+        if ext in GIF_EXTENSIONS:
+            self._play_movie(QMovie(self._open_buffer(data)))
+        elif not self._ensure_video():
+            self.show_message("Видео недоступно")
+        else:
+            # имя файла в URL подсказывает бэкенду контейнер
+            self.media_player.setSourceDevice(self._open_buffer(data), QUrl(media_file))
+            self.media_player.setLoops(self._loops_infinite)
+            self.video_widget.show()
+            self.media_player.play()
+
+    def _play_movie(self, movie):
+        def on_first_frame():
+            rect = movie.frameRect()
+            if rect.isValid() and not rect.isEmpty():
+                size = rect.size()
+                max_size = 300
+                if size.width() > max_size or size.height() > max_size:
+                    size.scale(max_size, max_size, Qt.KeepAspectRatio)
+                self.preview_gif_label.setFixedSize(size)
+            movie.frameChanged.disconnect(on_first_frame)
+
+        movie.frameChanged.connect(on_first_frame)
+        self.preview_gif_label.setMovie(movie)
+        self.preview_gif_label.show()
+        movie.start()
+        self._current_movie = movie
@@ -0,0 +1,61 @@
+# gui/tabs/graphics_tab.py
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QRadioButton, QButtonGroup, QMessageBox
+
+from core.rust_graphics import ProfileSwitcher, available_profiles
+
+
+class GraphicsTab(QWidget):
+    """Профили графики: выбор профиля сразу переписывает значения в памяти
+    (одной транзакцией), сохранение — кнопкой на главной вкладке."""
+
+    def __init__(self, window):
+        super().__init__()
+        self.window = window
+        self.profiles = available_profiles()
+        self.switcher = None
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Профиль графики:"))
+        self.group = QButtonGroup(self)
+        self.none_button = QRadioButton("Без профиля (как было)")
+        self.none_button.setChecked(True)
+        self.group.addButton(self.none_button, 0)
+        layout.addWidget(self.none_button)
+        for i, profile in enumerate(self.profiles, 1):
+            button = QRadioButton(f"{profile.name} ({len(profile)} настроек)")
+            button.setToolTip("\n".join(f"{key} {value}" for (_, key), value in profile.values.items()))
+            self.group.addButton(button, i)
+            layout.addWidget(button)
+        self.group.idClicked.connect(self.switch_profile)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+        layout.addStretch()
+
+        window.config_loaded.connect(self.set_config)
+
+    def set_config(self, config):
+        # новая папка: выбранный раньше профиль к ней не применён
+        self.switcher = ProfileSwitcher(config)
+        self.none_button.setChecked(True)
+        self.status_label.setText("")
+
+    def _switcher(self):
+        config = self.window.config_manager
+        if config is None:
+            return None
+        # папку перезагрузили — старый профиль к новому конфигу не относится
+        if self.switcher is None or self.switcher.config is not config:
+            self.switcher = ProfileSwitcher(config)
+        return self.switcher
+
+    def switch_profile(self, profile_id):
+        switcher = self._switcher()
+        if switcher is None:
+            QMessageBox.warning(self, "Ошибка", "Сначала выберите папку с cfg")
+            self.none_button.setChecked(True)
+            return
+        profile = self.profiles[profile_id - 1] if profile_id else None
+        tx = switcher.switch(profile)
+        changed = len(tx.updated) + len(tx.appended)
+        self.status_label.setText(f"Изменено настроек: {changed}. Не забудьте сохранить.")
@@ -0,0 +1,78 @@
+# gui/tabs/optimize_tab.py
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem,
+    QPushButton, QTextEdit, QMessageBox
+)
+from PySide6.QtCore import Qt
+
+from core.config_diff import preset_diff
+from core.presets import stack_presets
+from core.rust_graphics import available_profiles
+from core.tweaks import best_preset, load_tweaks_preset
+
+
+class OptimizeTab(QWidget):
+    """Набор пресетов, применяемых вместе. Порядок в списке — приоритет:
+    нижний пресет перекрывает верхние."""
+
+    def __init__(self, window):
+        super().__init__()
+        self.window = window
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Пресеты (нижние перекрывают верхние):"))
+        self.preset_list = QListWidget()
+        self.preset_list.setDragDropMode(QListWidget.InternalMove)
+        layout.addWidget(self.preset_list)
+
+        buttons = QHBoxLayout()
+        self.diff_button = QPushButton("Показать изменения")
+        self.diff_button.clicked.connect(self.show_diff)
+        buttons.addWidget(self.diff_button)
+        self.apply_button = QPushButton("Применить выбранные")
+        self.apply_button.clicked.connect(self.apply_selected)
+        buttons.addWidget(self.apply_button)
+        layout.addLayout(buttons)
+
+        self.diff_view = QTextEdit()
+        self.diff_view.setReadOnly(True)
+        layout.addWidget(self.diff_view)
+
+        presets = [best_preset(window.catalog), load_tweaks_preset()] + available_profiles()
+        for preset in presets:
+            item = QListWidgetItem(f"{preset.name} ({len(preset)})")
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Unchecked)
+            item.setData(Qt.UserRole, preset)
+            self.preset_list.addItem(item)
+
+    def selected_preset(self):
+        presets = []
+        for row in range(self.preset_list.count()):
+            item = self.preset_list.item(row)
+            if item.checkState() == Qt.Checked:
+                presets.append(item.data(Qt.UserRole))
+        return stack_presets(presets, "Выбранные пресеты") if presets else None
+
+    def _config(self):
+        if self.window.config_manager is None:
+            QMessageBox.warning(self, "Ошибка", "Сначала выберите папку с cfg")
+        return self.window.config_manager
+
+    def show_diff(self):
+        config = self._config()
+        preset = self.selected_preset()
+        if config is None or preset is None:
+            self.diff_view.setPlainText("" if config is None else "Ничего не выбрано")
+            return
+        diff = preset_diff(config, preset)
+        self.diff_view.setPlainText("\n".join(diff.format_lines()) or "Всё уже применено")
+
+    def apply_selected(self):
+        config = self._config()
+        preset = self.selected_preset()
+        if config is None or preset is None:
+            return
+        tx = preset.apply(config)
+        self.diff_view.setPlainText(
+            f"Изменено: {len(tx.updated)}, добавлено: {len(tx.appended)}. Не забудьте сохранить.")
@@ -0,0 +1,249 @@
+# gui/tabs/other_tab.py
+from typing import Dict, List, Optional
+
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QTableView, QHeaderView, QStyledItemDelegate,
+    QComboBox, QLineEdit, QAbstractItemView
+)
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QLocale
+from PySide6.QtGui import QIntValidator, QDoubleValidator
+
+from core.values import infer_kind
+
+KIND_ROLE = Qt.UserRole + 1
+KEY_ROLE = Qt.UserRole + 2
+
+
+class ConvarTableModel(QAbstractTableModel):
+    """Все convar из client.cfg прямо из ConfigManager: модель хранит только
+    список ключей, значения берутся при отрисовке видимых строк."""
+
+    COLUMNS = ("Переменная", "Значение", "Твик")
+
+    def __init__(self, catalog, parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.config = None
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._kinds: Dict[str, str] = {}
+        self._filter: Optional[List[str]] = None   # ключи результатов поиска; None — показывать все
+
+    def set_config(self, config):
+        if self.config is not None:
+            self.config.remove_listener(self.on_values_changed)
+        self.config = config
+        self._kinds = {}
+        if config is not None:
+            config.add_listener(self.on_values_changed)
+        self._reset_rows()
+
+    def set_filter(self, keys: Optional[List[str]]):
+        self._filter = keys
+        self._reset_rows()
+
+    def _reset_rows(self):
+        self.beginResetModel()
+        if self.config is None:
+            self._keys = []
+        elif self._filter is None:
+            self._keys = list(self.config.client_data)
+        else:
+            self._keys = [key for key in self._filter if self.config.has_value(key, "client")]
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+        self.endResetModel()
+
+    def kind(self, key: str) -> str:
+        # тип редактора определяется один раз — по виду значения на момент первого показа
+        kind = self._kinds.get(key)
+        if kind is None:
+            kind = self._kinds[key] = infer_kind(self.config.get_value(key), key)
+        return kind
+
+    # ---------------- QAbstractTableModel ----------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._keys)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        key = self._keys[index.row()]
+        column = index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if column == 0:
+                return key
+            if column == 1:
+                return self.config.get_value(key)
+            return ", ".join(t.name for t in self.catalog.for_key("client", key))
+        if role == Qt.ToolTipRole and column == 2:
+            return "\n\n".join(t.description for t in self.catalog.for_key("client", key) if t.description) or None
+        if role == KIND_ROLE:
+            return self.kind(key)
+        if role == KEY_ROLE:
+            return key
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() == 1:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or index.column() != 1 or self.config is None:
+            return False
+        key = self._keys[index.row()]
+        value = str(value).strip()
+        if self.config.has_same_value(key, value, "client"):
+            return False
+        # dataChanged придёт через on_values_changed
+        self.config.set_value(key, value, "client")
+        return True
+
+    # ---------------- CONFIG LISTENER ----------------
+    def on_values_changed(self, file_type, keys):
+        if file_type != "client":
+            return
+        # ключи, пропавшие из файла (перечитан с диска, отменена дописанная строка)
+        gone = sorted(self._rows[key] for key in keys
+                      if key in self._rows and not self.config.has_value(key, "client"))
+        if gone:
+            self._remove_rows(gone)
+        rows = []
+        new_keys = []
+        for key in keys:
+            row = self._rows.get(key)
+            if row is not None:
+                rows.append(row)
+            elif self._filter is None and self.config.has_value(key, "client"):
+                new_keys.append(key)
+        if rows:
+            self.dataChanged.emit(self.index(min(rows), 1), self.index(max(rows), 1))
+        if new_keys:
+            first = len(self._keys)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_keys) - 1)
+            for key in new_keys:
+                self._rows[key] = len(self._keys)
+                self._keys.append(key)
+            self.endInsertRows()
+
+    def _remove_rows(self, rows: List[int]):
+        # rows отсортированы; удаляем сплошными отрезками с конца, чтобы номера не съезжали
+        runs = []
+        for row in rows:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        for first, last in reversed(runs):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._keys[first:last + 1]
+            self.endRemoveRows()
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+
+
+class ConvarDelegate(QStyledItemDelegate):
+    """Редактор по типу значения: True/False — список, числа — поле с проверкой."""
+
+    def createEditor(self, parent, option, index):
+        kind = index.data(KIND_ROLE)
+        if kind == "bool":
+            editor = QComboBox(parent)
+            current = index.data(Qt.EditRole) or ""
+            # сохраняем написание из файла: True/False или true/false
+            editor.addItems(["true", "false"] if current.islower() else ["True", "False"])
+            return editor
+        editor = QLineEdit(parent)
+        if kind in ("int", "colour"):
+            editor.setValidator(QIntValidator(editor))
+        elif kind == "float":
+            validator = QDoubleValidator(editor)
+            # в cfg дробная часть всегда через точку, независимо от локали системы
+            validator.setLocale(QLocale.c())
+            validator.setNotation(QDoubleValidator.StandardNotation)
+            editor.setValidator(validator)
+        return editor
+
+    def setEditorData(self, editor, index):
+        value = index.data(Qt.EditRole) or ""
+        if isinstance(editor, QComboBox):
+            i = editor.findText(value, Qt.MatchFixedString)
+            editor.setCurrentIndex(max(i, 0))
+        else:
+            editor.setText(value)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QComboBox):
+            model.setData(index, editor.currentText(), Qt.EditRole)
+        elif editor.hasAcceptableInput() or editor.validator() is None:
+            model.setData(index, editor.text(), Qt.EditRole)
+
+
+class OtherTab(QWidget):
+    """Все переменные client.cfg одной таблицей. QTableView рисует только
+    видимые строки, высота строк фиксированная — 300 или 30 000 переменных
+    стоят одинаково."""
+
+    def __init__(self, window):
+        super().__init__()
+        self.window = window
+        layout = QVBoxLayout(self)
+
+        self.info_label = QLabel("Сначала выберите папку с cfg")
+        layout.addWidget(self.info_label)
+
+        self.model = ConvarTableModel(window.catalog, self)
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setItemDelegateForColumn(1, ConvarDelegate(self.view))
+        self.view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.view.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed
+                                  | QAbstractItemView.SelectedClicked)
+        self.view.setWordWrap(False)
+        vertical = self.view.verticalHeader()
+        vertical.setSectionResizeMode(QHeaderView.Fixed)
+        vertical.setDefaultSectionSize(self.view.fontMetrics().height() + 6)
+        vertical.hide()
+        horizontal = self.view.horizontalHeader()
+        horizontal.setSectionResizeMode(0, QHeaderView.Interactive)
+        horizontal.setSectionResizeMode(1, QHeaderView.Interactive)
+        horizontal.setStretchLastSection(True)
+        self.view.setColumnWidth(0, 280)
+        self.view.setColumnWidth(1, 140)
+        layout.addWidget(self.view)
+
+        window.config_loaded.connect(self.set_config)
+        window.search_changed.connect(self.apply_search)
+        self.set_config(window.config_manager)
+        if window.search_box.text().strip():
+            window.apply_search(window.search_box.text())
+
+    def set_config(self, config):
+        self.model.set_config(config)
+        self._update_info()
+
+    def apply_search(self, query, hits):
+        if not query:
+            self.model.set_filter(None)
+        else:
+            # convar из результатов и ключи client.cfg найденных твиков
+            keys = [hit.key for hit in hits if hit.file_type == "client"]
+            self.model.set_filter(list(dict.fromkeys(keys)))
+        self._update_info()
+
+    def _update_info(self):
+        config = self.model.config
+        if config is None:
+            return
+        total = len(config.client_data)
+        shown = self.model.rowCount()
+        self.info_label.setText(f"Переменных в client.cfg: {total}" if shown == total
+                                else f"Найдено: {shown} из {total}")
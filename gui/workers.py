@@ -0,0 +1,53 @@
+# gui/workers.py
+import logging
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from core.config_manager import OperationCancelled
+
+log = logging.getLogger(__name__)
+
+
+class WorkerSignals(QObject):
+    # создаётся в GUI-потоке, поэтому слоты получают сигналы уже в нём
+    progress = Signal(int, str)      # проценты, текст
+    finished = Signal(object)        # результат fn
+    failed = Signal(str)
+    cancelled = Signal()
+
+
+class Worker(QRunnable):
+    """fn(report, *args) в QThreadPool. report(доля, текст) шлёт прогресс
+    и бросает OperationCancelled, если вызван cancel()."""
+
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = WorkerSignals()
+        self._cancel = threading.Event()
+        # объект держит MainWindow, пока не придёт один из итоговых сигналов
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        self._cancel.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def report(self, fraction: float, text: str = ""):
+        if self._cancel.is_set():
+            raise OperationCancelled()
+        self.signals.progress.emit(int(fraction * 100), text)
+
+    def run(self):
+        try:
+            result = self.fn(self.report, *self.args)
+        except OperationCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            log.exception("Ошибка в фоновой задаче")
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
@@ -1,11 +1,49 @@
+import time
+_START = time.perf_counter()
+
+from core import diagnostics
 from gui.main_window import MainWindow
 from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QTimer
 import sys
 
+
+def _option(name):
+    # --name -> "", --name=значение -> "значение", нет флага -> None
+    for arg in sys.argv[1:]:
+        if arg == name:
+            return ""
+        if arg.startswith(name + "="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def _report_startup(app, target):
+    line = f"startup_ms {(time.perf_counter() - _START) * 1000:.1f}\n"
+    if target:
+        with open(target, "a", encoding="utf-8") as f:
+            f.write(line)
+    elif sys.stdout:
+        sys.stdout.write(line)
+    app.quit()
+
+
 def main():
+    # --log-level=DEBUG, --log-file=путь; --trace — сразу включить замеры времени
+    diagnostics.setup_logging(_option("--log-level"), _option("--log-file"))
+    if _option("--trace") is not None:
+        diagnostics.enable_timing()
+
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+
+    # --measure-startup[=файл]: замер холодного старта (в собранном exe нет stdout — пишем в файл)
+    target = _option("--measure-startup")
+    if target is not None:
+        # сработает, когда окно показано и цикл событий впервые свободен
+        QTimer.singleShot(0, lambda: _report_startup(app, target))
+
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -0,0 +1,48 @@
+# tests/test_asset_pack.py
+import pytest
+
+from core.asset_pack import AssetPack, AssetPackError, write_pack
+
+
+@pytest.fixture
+def pack_bytes(tmp_path):
+    files = {}
+    for i in range(3):
+        src = tmp_path / f"f{i}.gif"
+        src.write_bytes(bytes([i]) * (10 + i))
+        files[f"f{i}.gif"] = str(src)
+    out = tmp_path / "assets.pack"
+    write_pack(str(out), files)
+    return out.read_bytes()
+
+
+def test_round_trip(tmp_path, pack_bytes):
+    path = tmp_path / "ok.pack"
+    path.write_bytes(pack_bytes)
+    pack = AssetPack(str(path))
+    try:
+        assert sorted(pack.names()) == ["f0.gif", "f1.gif", "f2.gif"]
+        assert bytes(pack.get("f2.gif")) == b"\x02" * 12
+        assert pack.get("missing.gif") is None
+    finally:
+        pack.close()
+
+
+def test_truncated_pack_raises_pack_error(tmp_path, pack_bytes):
+    # любой обрезок — AssetPackError (или целый пакет), но не struct.error
+    path = tmp_path / "cut.pack"
+    for cut in range(len(pack_bytes)):
+        path.write_bytes(pack_bytes[:cut])
+        try:
+            AssetPack(str(path)).close()
+        except AssetPackError:
+            pass
+
+
+def test_corrupt_name_length(tmp_path, pack_bytes):
+    raw = bytearray(pack_bytes)
+    raw[16:18] = b"\xff\xff"     # длина имени первой записи за пределами индекса
+    path = tmp_path / "bad.pack"
+    path.write_bytes(bytes(raw))
+    with pytest.raises(AssetPackError):
+        AssetPack(str(path))
@@ -0,0 +1,135 @@
+# tests/test_backups.py
+import json
+import os
+import random
+
+import pytest
+
+from core import backups
+from core.backups import BackupError, BackupStore, split_chunks
+
+
+def _cfg(seed: int, lines: int = 2000) -> bytes:
+    rnd = random.Random(seed)
+    return "".join(f"key.{i} {rnd.randint(0, 9)}\n" for i in range(lines)).encode()
+
+
+@pytest.fixture
+def folder(tmp_path):
+    path = tmp_path / "cfg"
+    path.mkdir()
+    (path / "client.cfg").write_bytes(_cfg(1))
+    (path / "keys.cfg").write_bytes(b'bind q "kill"\n')
+    return path
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # без перечитывания по mtime файлы, записанные в тесте подряд, не различить
+    monkeypatch.setattr(backups, "RACY_NS", 1 << 62)
+    return BackupStore(str(tmp_path / "backups"))
+
+
+@pytest.mark.parametrize("raw", [b"", b"a 1", b"a 1\nb 2\n", b"a\r\nb\r\n", _cfg(3)])
+def test_split_chunks_round_trip(raw):
+    assert b"".join(split_chunks(raw)) == raw
+
+
+def test_split_chunks_local_edit():
+    raw = _cfg(4)
+    edited = raw.replace(b"key.1000 ", b"key.1000 x", 1)
+    before, after = split_chunks(raw), split_chunks(edited)
+    # правка одной строки меняет один кусок
+    assert len(set(after) - set(before)) == 1
+
+
+def test_snapshot_and_restore(folder, store):
+    first = store.snapshot(str(folder), "первый")
+    assert first is not None
+    assert store.snapshot(str(folder), "тот же") is None
+
+    (folder / "client.cfg").write_bytes(_cfg(2))
+    second = store.snapshot(str(folder), "второй")
+    assert [s.id for s in store.snapshots(str(folder))] == [second.id, first.id]
+    assert store.read(second, "client.cfg") == _cfg(2)
+
+    restored = store.restore(str(folder), first.id)
+    assert sorted(os.path.basename(p) for p in restored) == ["client.cfg", "keys.cfg"]
+    assert (folder / "client.cfg").read_bytes() == _cfg(1)
+    # состояние перед восстановлением совпало со вторым снимком — нового не появилось
+    assert store.latest(str(folder)).id == second.id
+
+    (folder / "keys.cfg").write_bytes(b'bind e "+use"\n')
+    store.restore(str(folder), second.id, names=["client.cfg"])
+    latest = store.latest(str(folder))
+    assert latest.label == "перед восстановлением"
+    assert store.read(latest, "keys.cfg") == b'bind e "+use"\n'
+    assert (folder / "client.cfg").read_bytes() == _cfg(2)
+    assert (folder / "keys.cfg").read_bytes() == b'bind e "+use"\n'
+
+
+def test_restore_unknown_snapshot(folder, store):
+    store.snapshot(str(folder))
+    with pytest.raises(BackupError):
+        store.restore(str(folder), "nope")
+
+
+def test_corrupt_chunk_detected(folder, store):
+    snapshot = store.snapshot(str(folder))
+    digest = snapshot.files["client.cfg"]["chunks"][0]
+    with open(store._chunk_path(digest), "wb") as f:
+        f.write(b"garbage")
+    with pytest.raises(BackupError):
+        store.read(snapshot, "client.cfg")
+
+
+def _chunk_count(store):
+    return sum(len(names) for _, _, names in os.walk(os.path.join(store.root, "chunks")))
+
+
+def test_prune_and_garbage_collection(folder, store, monkeypatch):
+    monkeypatch.setattr(backups, "GC_GRACE_SECONDS", -1)
+    monkeypatch.setattr(backups, "GC_EVERY", 1)
+    store.keep = 2
+    for seed in range(5):
+        (folder / "client.cfg").write_bytes(_cfg(10 + seed))
+        store.snapshot(str(folder), str(seed))
+    kept = store.snapshots(str(folder))
+    assert [s.label for s in kept] == ["4", "3"]
+
+    used = {d for s in kept for f in s.files.values() for d in f["chunks"]}
+    on_disk = {name[:-2] for _, _, names in os.walk(os.path.join(store.root, "chunks")) for name in names}
+    assert on_disk == used
+    for snapshot in kept:
+        assert store.read(snapshot, "client.cfg") == _cfg(10 + int(snapshot.label))
+
+
+def test_manifest_is_json(folder, store):
+    snapshot = store.snapshot(str(folder), "метка")
+    path = os.path.join(store._manifest_dir(str(folder)), snapshot.id + ".json")
+    with open(path, encoding="utf-8") as f:
+        record = json.load(f)
+    assert record["label"] == "метка" and set(record["files"]) == {"client.cfg", "keys.cfg"}
+
+
+def test_garbage_collection_is_batched(folder, store, monkeypatch):
+    # снимок не должен перечитывать всё хранилище: чистка — раз в GC_EVERY удалённых снимков
+    monkeypatch.setattr(backups, "GC_GRACE_SECONDS", -1)
+    monkeypatch.setattr(backups, "GC_EVERY", 3)
+    calls = []
+    collect = store.collect_garbage
+    monkeypatch.setattr(store, "collect_garbage", lambda: calls.append(1) or collect())
+    store.keep = 1
+    for seed in range(7):
+        (folder / "client.cfg").write_bytes(_cfg(20 + seed))
+        store.snapshot(str(folder), str(seed))
+    # удалено 6 снимков — две чистки
+    assert len(calls) == 2
+    assert [s.label for s in store.snapshots(str(folder))] == ["6"]
+
+    (folder / "client.cfg").write_bytes(_cfg(30))
+    store.snapshot(str(folder), "7")
+    before = _chunk_count(store)
+    assert store.collect_garbage() > 0
+    assert _chunk_count(store) < before
+    assert store.read(store.latest(str(folder)), "client.cfg") == _cfg(30)
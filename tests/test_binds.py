@@ -0,0 +1,53 @@
+# tests/test_binds.py
+import pytest
+
+from core.binds import BindMap, join_commands, split_commands
+from core.config_manager import ConfigManager
+
+
+def _manager(tmp_path, keys: bytes) -> ConfigManager:
+    (tmp_path / "client.cfg").write_bytes(b"")
+    (tmp_path / "keys.cfg").write_bytes(keys)
+    return ConfigManager(str(tmp_path), use_cache=False)
+
+
+def test_split_and_join():
+    assert split_commands("+map; +focusmap;;") == ["+map", "+focusmap"]
+    assert join_commands(["+map", "+focusmap"]) == "+map; +focusmap"
+
+
+def test_duplicates_and_conflicts(tmp_path):
+    binds = BindMap(_manager(tmp_path, b'bind g "+map; +focusmap"\nbind G "+map;+focusmap"\n'
+                                       b'bind q kill\nbind Q "+jump"\n'))
+    assert binds.duplicates == {"g": [0, 1]}
+    assert list(binds.conflicts) == ["q"]
+    assert binds.commands_for("q") == ["+jump"]
+    assert sorted(binds.keys_for("+MAP")) == ["g"]
+
+
+@pytest.mark.parametrize("edit", [
+    lambda b: b.remove_command("g", "+map"),
+    lambda b: b.set_commands("G", ["+focusmap"]),
+    lambda b: b.apply_presets({"g": ["+focusmap"]}),
+])
+def test_edit_writes_every_case_variant(tmp_path, edit):
+    manager = _manager(tmp_path, b'bind g "+map; +focusmap"\nbind G "+map;+focusmap"\n')
+    binds = BindMap(manager)
+    edit(binds)
+    assert binds.commands_for("g") == ["+focusmap"]
+    # правка не должна превращать дубликат в конфликт
+    assert not binds.conflicts
+    assert BindMap(manager).conflicts == {}
+    assert list(manager.keys_lines) == ['bind g "+focusmap"\n', 'bind G "+focusmap"\n']
+    # одна правка — одна запись в истории
+    assert len(manager.journal) == 1
+    manager.undo()
+    assert BindMap(manager).duplicates == {"g": [0, 1]}
+
+
+def test_add_command_to_new_key(tmp_path):
+    manager = _manager(tmp_path, b"bind q kill\n")
+    binds = BindMap(manager)
+    binds.add_command("f1", "consoletoggle")
+    assert binds.commands_for("F1") == ["consoletoggle"]
+    assert manager.keys_lines[-1] == 'bind f1 "consoletoggle"\n'
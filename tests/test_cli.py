@@ -0,0 +1,37 @@
+# tests/test_cli.py
+import json
+
+import pytest
+
+import cli
+
+
+@pytest.fixture
+def rust_folder(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYRUSTSETTINGS_BACKUP_DIR", str(tmp_path / "backups"))
+    cfg = tmp_path / "rust" / "cfg"
+    cfg.mkdir(parents=True)
+    (cfg / "client.cfg").write_bytes(b"inventory.quickcraftdelay 1\n")
+    return tmp_path / "rust"
+
+
+def test_catalog_does_not_depend_on_cwd(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert cli.main(["list-tweaks", "--json"]) == 0
+    assert json.loads(capsys.readouterr().out)
+
+
+def test_apply_from_other_cwd(tmp_path, monkeypatch, rust_folder, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert cli.main(["apply", str(rust_folder), "--tweak", "Мгновенный крафт", "--json", "--jobs", "1"]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["changed_keys"] == 1
+    assert (rust_folder / "cfg" / "client.cfg").read_bytes() == b"inventory.quickcraftdelay 0\n"
+
+
+def test_missing_catalog_is_an_error(tmp_path, monkeypatch, rust_folder, capsys):
+    monkeypatch.setattr(cli, "resource_path", lambda relative: str(tmp_path / "nowhere" / relative))
+    assert cli.main(["list-tweaks"]) == 1
+    assert cli.main(["apply", str(rust_folder), "--all-best", "--jobs", "1"]) == 1
+    assert "файл каталога не найден" in capsys.readouterr().err
+    assert (rust_folder / "cfg" / "client.cfg").read_bytes() == b"inventory.quickcraftdelay 1\n"
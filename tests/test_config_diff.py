@@ -0,0 +1,79 @@
+# tests/test_config_diff.py
+import pytest
+
+from core.config_diff import (ADDED, CHANGED, REMOVED, ConfigDiff, DiffEntry, diff_values,
+                              disk_diff, folder_diff, parse_values, preset_diff)
+from core.config_manager import ConfigManager
+from core.presets import Preset
+from core.values import ValueTypes
+
+
+def _changes(entries):
+    return {(e.key, e.change, e.old, e.new) for e in entries}
+
+
+def test_diff_values_basic():
+    old = {"a": "1", "b": "2", "c": "3"}
+    new = {"b": "2", "c": "4", "d": "5"}
+    assert _changes(diff_values(old, new)) == {
+        ("a", REMOVED, "1", None), ("c", CHANGED, "3", "4"), ("d", ADDED, None, "5")}
+
+
+def test_diff_values_partial_ignores_missing():
+    assert diff_values({"a": "1", "b": "2"}, {"b": "3"}, partial=True) == [
+        DiffEntry("client", "b", CHANGED, "2", "3")]
+
+
+def test_diff_values_typed():
+    types = ValueTypes()
+    assert diff_values({"a": "0.10", "b": "True"}, {"a": "0.1", "b": "1"}, value_types=types) == []
+    assert len(diff_values({"a": "0.10"}, {"a": "0.1"})) == 1
+
+
+def test_parse_values_last_wins_and_order_ignored():
+    raw = b'a 1\nb "x y" // note\na 2\n'
+    assert parse_values(raw) == {"a": "2", "b": "x y"}
+    moved = b'// comment\nb "x y"\na 2\n'
+    assert diff_values(parse_values(raw), parse_values(moved)) == []
+
+
+def test_parse_values_keys():
+    assert parse_values(b'bind q "kill"\nbind e +use\n// x\n', "keys") == {"q": "kill", "e": "+use"}
+
+
+def test_config_diff_summary_and_format():
+    diff = ConfigDiff([DiffEntry("client", "a", CHANGED, "1", "2"),
+                       DiffEntry("keys", "q", ADDED, None, "kill")])
+    assert diff.summary() == "изменено: 1, добавлено: 1, удалено: 0"
+    assert diff.format_lines() == ["~ client.cfg  a: 1 -> 2", "+ keys.cfg  q: — -> kill"]
+    assert diff.keys("keys") == ["q"] and len(diff) == 2 and bool(diff)
+    assert not ConfigDiff()
+
+
+@pytest.fixture
+def manager(tmp_path):
+    (tmp_path / "client.cfg").write_bytes(b"a 1\nb 2\n")
+    (tmp_path / "keys.cfg").write_bytes(b'bind q "kill"\n')
+    return ConfigManager(str(tmp_path), use_cache=False)
+
+
+def test_disk_diff_only_dirty_files(manager):
+    assert not disk_diff(manager)
+    manager.set_value("a", "5")
+    manager.set_value("c", "7")
+    assert _changes(disk_diff(manager)) == {("a", CHANGED, "1", "5"), ("c", ADDED, None, "7")}
+    manager.save()
+    assert not disk_diff(manager)
+
+
+def test_folder_diff(manager, tmp_path):
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "client.cfg").write_bytes(b"a 1.0\nb 3\n")
+    diff = folder_diff(manager, str(other))
+    assert _changes(diff) == {("b", CHANGED, "2", "3"), ("q", REMOVED, "kill", None)}
+
+
+def test_preset_diff(manager):
+    preset = Preset("p", {("client", "a"): "1.0", ("client", "b"): "9", ("keys", "e"): "+use"})
+    assert _changes(preset_diff(manager, preset)) == {("b", CHANGED, "2", "9"), ("e", ADDED, None, "+use")}
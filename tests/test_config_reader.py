@@ -0,0 +1,44 @@
+# tests/test_config_reader.py
+import pytest
+
+from core.config_reader import bind_entry, bind_key, client_entry, detect_newline, iter_cfg_lines, tokenize_line
+
+
+@pytest.mark.parametrize("line, tokens, comment", [
+    ('fps.limit 144\n', ["fps.limit", "144"], None),
+    ('graphics.quality "5" // max\n', ["graphics.quality", "5"], " max"),
+    ('x "a//b" // c\r\n', ["x", "a//b"], " c"),
+    ('x "a\\"b"\n', ["x", 'a"b'], None),
+    ('x "a\\\\"\n', ["x", "a\\"], None),
+    ('x ""\n', ["x", ""], None),
+    ('a/b c\n', ["a/b", "c"], None),
+    ('// only comment\n', [], " only comment"),
+    ('   \n', [], None),
+])
+def test_tokenize_line(line, tokens, comment):
+    assert tokenize_line(line) == (tokens, comment)
+
+
+@pytest.mark.parametrize("line", ['x "unterminated\n', 'x "unterminated\r\n', 'x "unterminated'])
+def test_unterminated_quote_stops_at_line_end(line):
+    # перевод строки не должен попасть в значение (а оттуда — в client_data и запись)
+    assert tokenize_line(line) == (["x", "unterminated"], None)
+
+
+def test_unterminated_quote_value_in_parsed_file():
+    values = dict(client_entry(cfg.tokens) for cfg in iter_cfg_lines(b'a "open\nb 2\n'))
+    assert values == {"a": "open", "b": "2"}
+
+
+def test_bind_helpers():
+    tokens, _ = tokenize_line('input.bind f "+attack;+duck"\n')
+    assert bind_key(tokens) == "f"
+    assert bind_entry(tokens) == ("f", "+attack;+duck")
+    assert bind_key(["bind"]) is None
+    assert bind_entry(tokenize_line("bind g\n")[0]) is None
+
+
+def test_detect_newline():
+    assert detect_newline(b"a\r\nb") == "\r\n"
+    assert detect_newline(b"a\nb") == "\n"
+    assert detect_newline(b"a") is None
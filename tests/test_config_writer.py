@@ -0,0 +1,22 @@
+# tests/test_config_writer.py
+import os
+import stat
+
+from core import config_writer
+from core.config_writer import write_atomic
+
+
+def test_keeps_existing_mode(tmp_path):
+    path = tmp_path / "client.cfg"
+    path.write_bytes(b"a 1\n")
+    os.chmod(path, 0o644)
+    write_atomic(str(path), b"a 2\n")
+    assert path.read_bytes() == b"a 2\n"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+
+
+def test_new_file_uses_umask(tmp_path):
+    path = tmp_path / "new.cfg"
+    write_atomic(str(path), b"x\n")
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~config_writer._UMASK
+    assert not [p for p in os.listdir(tmp_path) if p != "new.cfg"]
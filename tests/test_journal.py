@@ -0,0 +1,170 @@
+# tests/test_journal.py
+import os
+import random
+import threading
+import time
+
+import pytest
+
+from core.config_manager import ConfigManager
+from core.journal import FileDelta, Journal
+
+CLIENT = b'a 1\nb "x y" // note\nc 0.5\nd True\n'
+KEYS = b'bind q "kill"\nbind e +use\n'
+
+
+@pytest.fixture
+def manager(tmp_path):
+    (tmp_path / "client.cfg").write_bytes(CLIENT)
+    (tmp_path / "keys.cfg").write_bytes(KEYS)
+    return ConfigManager(str(tmp_path), use_cache=False)
+
+
+def _state(m):
+    return (list(m.client_lines), dict(m.client_data), list(m.keys_lines), dict(m.keys_data),
+            {k: list(v) for k, v in m._client_index.items()}, {k: list(v) for k, v in m._keys_index.items()})
+
+
+def _delta(count, lines=None, added=None, values=None):
+    return FileDelta(count, dict(lines or {}), list(added or []), dict(values or {}))
+
+
+def test_undo_redo_single_value(manager):
+    before = _state(manager)
+    manager.set_value("a", "7")
+    after = _state(manager)
+    assert manager.undo() == "a"
+    assert _state(manager) == before
+    assert manager.redo() == "a"
+    assert _state(manager) == after
+    assert manager.redo() is None
+
+
+def test_undo_appended_line(manager):
+    before = _state(manager)
+    manager.set_value("new.key", "1")
+    assert manager.client_lines[-1] == "new.key 1\n"
+    manager.undo()
+    assert _state(manager) == before
+    assert "new.key" not in manager._client_index
+
+
+def test_transaction_is_one_entry(manager):
+    with manager.transaction() as tx:
+        tx.set("a", "2")
+        tx.set("q", "jump", "keys")
+        tx.set("z", "3")
+    assert len(manager.journal) == 1
+    assert manager.journal.undo_label() == "3 настроек"
+    manager.undo()
+    assert manager.client_data["a"] == "1" and "z" not in manager.client_data
+    assert manager.keys_data["q"] == "kill"
+
+
+def test_rolled_back_transaction_not_recorded(manager):
+    with pytest.raises(RuntimeError):
+        with manager.transaction() as tx:
+            tx.set("a", "2")
+            raise RuntimeError
+    assert not manager.journal.can_undo()
+
+
+def test_merge_and_noop_drop():
+    journal = Journal(merge_window=1.0)
+    journal.record({"client": _delta(3, {0: ("a 1\n", "a 2\n")}, values={"a": ("1", "2")})}, when=0.0)
+    journal.record({"client": _delta(3, {0: ("a 2\n", "a 3\n")}, values={"a": ("2", "3")})}, when=0.5)
+    assert len(journal) == 1
+    delta = journal.pop_undo().files["client"]
+    assert delta.lines == {0: ("a 1\n", "a 3\n")} and delta.values == {"a": ("1", "3")}
+
+    journal = Journal(merge_window=1.0)
+    journal.record({"client": _delta(3, {0: ("a 1\n", "a 0\n")}, values={"a": ("1", "0")})}, when=0.0)
+    journal.record({"client": _delta(3, {0: ("a 0\n", "a 1\n")}, values={"a": ("0", "1")})}, when=0.5)
+    assert len(journal) == 0
+
+
+def test_no_merge_outside_window_or_other_keys():
+    journal = Journal(merge_window=1.0)
+    journal.record({"client": _delta(3, values={"a": ("1", "2")})}, when=0.0)
+    journal.record({"client": _delta(3, values={"a": ("2", "3")})}, when=5.0)
+    journal.record({"client": _delta(3, values={"b": ("2", "3")})}, when=5.1)
+    assert len(journal) == 3
+
+
+def test_depth_limit():
+    journal = Journal(depth=3, merge_window=0)
+    for i in range(5):
+        journal.record({"client": _delta(1, values={"a": (str(i), str(i + 1))})}, when=float(i))
+    assert len(journal) == 3
+    assert journal.pop_undo().files["client"].values["a"] == ("4", "5")
+
+
+def test_new_edit_clears_redo(manager):
+    manager.set_value("a", "2")
+    manager.undo()
+    assert manager.journal.can_redo()
+    manager.set_value("b", "3")
+    assert not manager.journal.can_redo()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_edits_round_trip(manager, seed):
+    # каждое состояние после правки должно восстанавливаться отменой, а повтор — возвращать конечное
+    rnd = random.Random(seed)
+    manager.journal = Journal(depth=1000, merge_window=-1)
+    keys = ["a", "b", "c", "d", "e", "f"]
+    states = [_state(manager)]
+    for _ in range(120):
+        if rnd.random() < 0.3:
+            with manager.transaction() as tx:
+                for _ in range(rnd.randint(1, 4)):
+                    ftype = rnd.choice(("client", "keys"))
+                    key = rnd.choice(keys if ftype == "client" else ["q", "e", "r"])
+                    tx.set(key, rnd.choice(["0", "1", "x y", "2.5"]), ftype)
+        else:
+            manager.set_value(rnd.choice(keys), rnd.choice(["0", "1", "x y", "2.5"]))
+        if manager.journal.can_undo() and _state(manager) != states[-1]:
+            states.append(_state(manager))
+    assert len(manager.journal) == len(states) - 1
+    for expected in reversed(states[:-1]):
+        manager.undo()
+        assert _state(manager) == expected
+    for expected in states[1:]:
+        manager.redo()
+        assert _state(manager) == expected
+
+
+def test_reload_waits_for_transaction(manager, tmp_path):
+    # перечитывание из фонового потока не должно вклиниться между set() одной транзакции
+    path = tmp_path / "client.cfg"
+    done = threading.Event()
+    worker = threading.Thread(target=lambda: (manager.reload_if_changed(), done.set()))
+    with manager.transaction() as tx:
+        tx.set("a", "2")
+        path.write_bytes(b"x 0\n" + CLIENT)
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+        worker.start()
+        assert not done.wait(0.2)
+        tx.set("b", "3")
+        assert manager.client_lines[0] == "a 2\n"
+    worker.join(5)
+    assert done.is_set()
+    # перечитан новый файл, правки транзакции наложены поверх, история сброшена
+    assert list(manager.client_lines)[:2] == ["x 0\n", "a 2\n"]
+    assert manager.client_data["b"] == "3" and manager.client_data["x"] == "0"
+    assert not manager.journal.can_undo()
+
+
+def test_transaction_releases_lock(manager):
+    with pytest.raises(RuntimeError):
+        with manager.transaction() as tx:
+            tx.set("a", "2")
+            raise RuntimeError
+    with manager.transaction() as tx:
+        tx.set("a", "3")
+    # другой поток может взять блокировку — транзакции её не держат
+    got = []
+    worker = threading.Thread(target=lambda: got.append(manager._lock.acquire(timeout=1)) or manager._lock.release())
+    worker.start()
+    worker.join(5)
+    assert got == [True]
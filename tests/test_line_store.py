@@ -0,0 +1,94 @@
+# tests/test_line_store.py
+import random
+
+import pytest
+
+from core.line_store import LineStore, line_offsets
+
+
+def _lines(raw: bytes):
+    # то же, что readlines() по декодированному тексту с \r\n -> \n
+    return raw.decode("utf-8").replace("\r\n", "\n").splitlines(keepends=True)
+
+
+@pytest.mark.parametrize("raw", [b"", b"a 1\n", b"a 1\nb 2", b"a 1\r\nb 2\r\n", b"\n\n", b"x"])
+def test_reads_like_readlines(raw):
+    store = LineStore(raw)
+    assert list(store) == _lines(raw)
+    assert len(store) == len(_lines(raw))
+    assert store.to_bytes() == raw
+
+
+def test_offsets_cover_buffer():
+    raw = b"a\nbb\n\nccc"
+    offsets = line_offsets(raw)
+    assert list(offsets) == [0, 2, 5, 6, 9]
+
+
+def test_overlay_and_tail():
+    store = LineStore(b"a 1\nb 2\nc 3\n")
+    store[1] = "b 9\n"
+    store.append("d 4\n")
+    store[-1] = "d 5\n"
+    assert list(store) == ["a 1\n", "b 9\n", "c 3\n", "d 5\n"]
+    assert store.to_bytes() == b"a 1\nb 9\nc 3\nd 5\n"
+    with pytest.raises(IndexError):
+        store[4]
+
+
+def test_truncate_tail_and_buffer():
+    store = LineStore(b"a\nb\nc\n")
+    store[2] = "C\n"
+    store.append("d\n")
+    del store[3:]
+    assert list(store) == ["a\n", "b\n", "C\n"]
+    del store[1:]
+    assert list(store) == ["a\n"]
+    # правка, попавшая под усечение, не должна вернуться
+    store.append("x\n")
+    assert list(store) == ["a\n", "x\n"]
+    with pytest.raises(TypeError):
+        del store[0]
+
+
+def test_chunks_keep_untouched_bytes_and_newline():
+    raw = b"a 1\r\nb 2\r\nc 3\r\n"
+    store = LineStore(raw)
+    store[1] = "b 7\n"
+    store.append("d 4\n")
+    chunks = list(store.chunks("\r\n"))
+    # неизменённые участки — срезы исходного буфера
+    assert isinstance(chunks[0], memoryview) and bytes(chunks[0]) == b"a 1\r\n"
+    assert store.to_bytes("\r\n") == b"a 1\r\nb 7\r\nc 3\r\nd 4\r\n"
+
+
+def test_same_line_and_replace_with():
+    old = LineStore(b"a\nb\nc\n")
+    new = LineStore(b"a\nB\nc\n")
+    assert old.same_line(0, new, 0)
+    assert not old.same_line(1, new, 1)
+    old[0] = "z\n"
+    assert not old.same_line(0, new, 0)
+    old.replace_with(new)
+    assert list(old) == ["a\n", "B\n", "c\n"]
+
+
+def test_random_edits_match_list():
+    rnd = random.Random(21)
+    raw = "".join(f"k{i} {i}\n" for i in range(50)).encode()
+    store, model = LineStore(raw), _lines(raw)
+    for _ in range(500):
+        op = rnd.random()
+        if op < 0.6 and model:
+            i = rnd.randrange(len(model))
+            store[i] = model[i] = f"e{rnd.random()}\n"
+        elif op < 0.85:
+            line = f"n{rnd.random()}\n"
+            store.append(line)
+            model.append(line)
+        else:
+            n = rnd.randrange(len(model) + 1)
+            del store[n:]
+            del model[n:]
+    assert list(store) == model
+    assert store.to_bytes() == "".join(model).encode()
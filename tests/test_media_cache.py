@@ -0,0 +1,65 @@
+# tests/test_media_cache.py
+import threading
+
+from gui.media_cache import MediaCache
+
+
+def _blocking_loader(release: threading.Event, started: threading.Event):
+    def loader(name):
+        started.set()
+        release.wait(5)
+        return name.encode()
+    return loader
+
+
+def test_get_and_missing():
+    cache = MediaCache(lambda name: None if name == "gone" else b"x" * 10)
+    try:
+        assert cache.get("a") == b"x" * 10 and "a" in cache
+        assert cache.get("gone") is None
+        assert cache.size == 10
+    finally:
+        cache.shutdown()
+
+
+def test_budget_evicts_oldest():
+    cache = MediaCache(lambda name: b"x" * 10, budget_bytes=25)
+    try:
+        for name in "abc":
+            cache.get(name)
+        assert "a" not in cache and "b" in cache and "c" in cache
+        assert cache.size == 20
+    finally:
+        cache.shutdown()
+
+
+def test_clear_drops_running_prefetch():
+    release, started = threading.Event(), threading.Event()
+    cache = MediaCache(_blocking_loader(release, started))
+    try:
+        cache.prefetch(["a", "b"])
+        assert started.wait(5)
+        cache.clear()
+        release.set()
+        cache.shutdown()
+        # подгрузка "a" закончилась после clear(), "b" отменена — кэш пуст
+        assert "a" not in cache and "b" not in cache
+        assert cache.size == 0
+    finally:
+        release.set()
+        cache.shutdown()
+
+
+def test_get_after_clear_loads_again():
+    release, started = threading.Event(), threading.Event()
+    cache = MediaCache(_blocking_loader(release, started))
+    try:
+        cache.prefetch(["a", "b"])
+        assert started.wait(5)
+        cache.clear()
+        release.set()
+        assert cache.get("b") == b"b"
+        assert "b" in cache
+    finally:
+        release.set()
+        cache.shutdown()
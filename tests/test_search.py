@@ -0,0 +1,32 @@
+# tests/test_search.py
+from core.search import PrefixTrie
+
+
+def test_prefix_by_any_part():
+    trie = PrefixTrie()
+    for name in ("graphics.impostorshadows", "graphics.shadows", "fps.limit"):
+        trie.add(name)
+    assert trie.prefix("impost") == ["graphics.impostorshadows"]
+    assert sorted(trie.prefix("graphics.")) == ["graphics.impostorshadows", "graphics.shadows"]
+    assert trie.prefix("Limit") == ["fps.limit"]
+    assert trie.prefix("nope") == []
+
+
+def test_size_ignores_repeated_and_stale_calls():
+    trie = PrefixTrie()
+    trie.add("fps.limit")
+    trie.add("fps.limit")
+    assert len(trie) == 1
+    trie.remove("fps.limit")
+    trie.remove("fps.limit")
+    trie.remove("never.added")
+    assert len(trie) == 0
+    assert trie.root == {}
+
+
+def test_remove_keeps_shared_nodes():
+    trie = PrefixTrie()
+    trie.add("a.limit")
+    trie.add("b.limit")
+    trie.remove("a.limit")
+    assert trie.prefix("limit") == ["b.limit"] and len(trie) == 1